@@ -0,0 +1,69 @@
+"""
+Encode and verify throughput of JWT engines for our token payload shape.
+
+Compares python-jose with a string secret (key rebuilt per call), python-jose
+with a prebuilt key object and the HS256 codec used by DomainJWTService.
+
+    python -m benchmarks.jwt_codec --tokens 1000 --rounds 20
+"""
+
+import argparse
+import time
+from typing import Callable, List
+
+from jose import jwk, jwt
+
+from src.app.domain.auth.services.jwt_codec import HS256Codec
+
+SECRET = "benchmark-secret-key"
+ALGORITHM = "HS256"
+
+
+def build_payloads(tokens: int) -> List[dict]:
+    exp = int(time.time()) + 3600
+    return [
+        {"user": {"uuid": f"user-{i}", "sid": f"sid{i:03d}"}, "type": "access", "exp": exp} for i in range(tokens)
+    ]
+
+
+def measure(func: Callable, items: list, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for item in items:
+            func(item)
+    return round(len(items) * rounds / (time.perf_counter() - started), 1)
+
+
+def main(tokens: int, rounds: int) -> None:
+    payloads = build_payloads(tokens)
+    key = jwk.construct(SECRET, ALGORITHM)
+    codec = HS256Codec(SECRET)
+    engines = {
+        "jose": (
+            lambda payload: jwt.encode(payload, SECRET, algorithm=ALGORITHM),
+            lambda token: jwt.decode(token, SECRET, algorithms=[ALGORITHM]),
+        ),
+        "jose_key": (
+            lambda payload: jwt.encode(payload, key, algorithm=ALGORITHM),
+            lambda token: jwt.decode(token, key, algorithms=[ALGORITHM]),
+        ),
+        "hs256_codec": (codec.encode, codec.decode),
+    }
+
+    tokens_ = [codec.encode(payload) for payload in payloads]
+    for name, (encode, decode) in engines.items():
+        print(
+            {
+                "engine": name,
+                "encode_ops/s": measure(encode, payloads, rounds),
+                "verify_ops/s": measure(decode, tokens_, rounds),
+            }
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=1000, help="distinct tokens per round")
+    parser.add_argument("--rounds", type=int, default=20, help="passes over the tokens per engine")
+    args = parser.parse_args()
+    main(tokens=args.tokens, rounds=args.rounds)
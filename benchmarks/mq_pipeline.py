@@ -0,0 +1,126 @@
+"""
+End-to-end throughput and latency of the consume pipeline on the in-memory broker.
+
+Messages go produce -> MQClientProxy.consume -> queue_processing_aggregator
+(or queue_batch_processing_aggregator) -> handler without network services.
+Handlers only record latency, so the numbers are the pipeline overhead:
+JSON, dispatch, batching and worker scheduling. "celery" scenarios dispatch
+through a Celery-like `apply_async` stand-in, "async" ones run a coroutine
+handler in the consumer. Log sinks are removed so terminal output is not
+measured.
+
+    python -m benchmarks.mq_pipeline --messages 20000 --chunk 500
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Callable, Dict, List
+
+from loguru import logger
+
+from src.app.infrastructure.messaging.mq_client import MQClientProxy
+from src.app.interfaces.cli.consume import queue_batch_processing_aggregator, queue_processing_aggregator
+
+EVENT = "benchmark"
+
+# name -> (workers, batch_size, is_in_process)
+SCENARIOS: Dict[str, tuple] = {
+    "celery_sequential": (1, 1, False),
+    "celery_workers_10": (10, 1, False),
+    "async_sequential": (1, 1, True),
+    "async_workers_10": (10, 1, True),
+    "batch_100": (1, 100, True),
+}
+
+
+class RecordingTask:
+    """Stands in for a Celery task, `apply_async` is what the aggregator calls"""
+
+    __name__ = "recording_task"
+
+    def __init__(self, record: Callable[[dict], None]) -> None:
+        self.record = record
+
+    def apply_async(self, queue: str, kwargs: dict) -> None:
+        self.record(kwargs)
+
+
+def percentile(values: List[float], rank: float) -> float:
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * rank))] * 1000, 3)
+
+
+async def run_scenario(
+    name: str, messages: int, chunk: int, workers: int, batch_size: int, is_in_process: bool
+) -> dict:
+    broker_url = f"memory://benchmark-{name}"
+    producer = MQClientProxy(message_broker_type="inmemory", message_broker_url=broker_url)
+    consumer = MQClientProxy(message_broker_type="inmemory", message_broker_url=broker_url)
+    latencies: List[float] = []
+    done = asyncio.Event()
+
+    def record(data: dict) -> None:
+        latencies.append(time.perf_counter() - data["sent_at"])
+        if len(latencies) >= messages:
+            done.set()
+
+    async def handler(**data: Any) -> None:
+        record(data)
+
+    async def batch_handler(items: List[dict]) -> None:
+        for data in items:
+            record(data)
+
+    handler_info: Dict[str, Any] = {"handler": handler, "batch_handler": batch_handler}
+    if not is_in_process:
+        handler_info.update({"handler": RecordingTask(record), "celery_queue": "benchmark"})
+    handlers_by_event = {EVENT: handler_info}
+    consume_task = asyncio.create_task(
+        consumer.consume(
+            queues=["queue"],
+            exchanger_name="exchanger",
+            aggregator=queue_processing_aggregator,
+            handlers_by_event=handlers_by_event,
+            batch_aggregator=queue_batch_processing_aggregator,
+            batch_size=batch_size,
+            batch_timeout_ms=50,
+            workers=workers,
+        )
+    )
+
+    started = time.perf_counter()
+    for i in range(0, messages, chunk):
+        sent_at = time.perf_counter()
+        items = [{"event": EVENT, "data": {"sent_at": sent_at}} for _ in range(min(chunk, messages - i))]
+        await producer.produce_messages(exchanger_name="exchanger", queue_name="queue", messages=items)
+        await asyncio.sleep(0)
+    await done.wait()
+    elapsed = time.perf_counter() - started
+
+    consume_task.cancel()
+    await asyncio.gather(consume_task, return_exceptions=True)
+    return {
+        "scenario": name,
+        "messages/s": round(messages / elapsed, 1),
+        "latency_p50_ms": percentile(latencies, 0.5),
+        "latency_p99_ms": percentile(latencies, 0.99),
+    }
+
+
+async def main(messages: int, chunk: int) -> None:
+    logger.remove()
+    for name, (workers, batch_size, is_in_process) in SCENARIOS.items():
+        print(
+            await run_scenario(
+                name, messages, chunk, workers=workers, batch_size=batch_size, is_in_process=is_in_process
+            )
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20000, help="messages per scenario")
+    parser.add_argument("--chunk", type=int, default=500, help="messages per produce call")
+    args = parser.parse_args()
+    asyncio.run(main(messages=args.messages, chunk=args.chunk))
@@ -0,0 +1,96 @@
+"""
+Latency of an unrelated endpoint during a login storm.
+
+Compares password verification on the event loop (sync) with the hashing pool
+(async). Runs in-process against a minimal ASGI app, no infrastructure required.
+
+    python -m benchmarks.password_hashing --logins 32 --duration 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+from fastapi import FastAPI
+
+from src.app.domain.auth.services.auth_service import DomainAuthService
+
+PASSWORD = "Benchmark#Passw0rd"
+
+
+def build_app(hashed_password: str) -> FastAPI:
+    bench_app = FastAPI()
+
+    @bench_app.post("/login/sync/")
+    async def login_sync() -> dict:
+        return {"ok": DomainAuthService.verify_password(PASSWORD, hashed_password)}
+
+    @bench_app.post("/login/async/")
+    async def login_async() -> dict:
+        return {"ok": await DomainAuthService.verify_password_async(PASSWORD, hashed_password)}
+
+    @bench_app.get("/ping/")
+    async def ping() -> dict:
+        return {"ok": True}
+
+    return bench_app
+
+
+def percentile(values: List[float], q: float) -> float:
+    values_ = sorted(values)
+    index = min(len(values_) - 1, int(round(q / 100 * (len(values_) - 1))))
+    return values_[index]
+
+
+async def run_scenario(client: httpx.AsyncClient, mode: str, logins: int, duration: float) -> dict:
+    deadline = time.perf_counter() + duration
+    logins_done = 0
+    rejected = 0
+    latencies: List[float] = []
+
+    async def login_worker() -> None:
+        nonlocal logins_done, rejected
+        while time.perf_counter() < deadline:
+            resp = await client.post(f"/login/{mode}/")
+            if resp.status_code == 200:
+                logins_done += 1
+            else:
+                rejected += 1
+
+    async def ping_worker() -> None:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            await client.get("/ping/")
+            latencies.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.005)
+
+    await asyncio.gather(ping_worker(), *[login_worker() for _ in range(logins)], return_exceptions=True)
+    return {
+        "mode": mode,
+        "logins/s": round(logins_done / duration, 1),
+        "rejected": rejected,
+        "ping_count": len(latencies),
+        "ping_p50_ms": round(statistics.median(latencies), 2) if latencies else None,
+        "ping_p99_ms": round(percentile(latencies, 99), 2) if latencies else None,
+        "ping_max_ms": round(max(latencies), 2) if latencies else None,
+    }
+
+
+async def main(logins: int, duration: float) -> None:
+    hashed_password = DomainAuthService.get_password_hashed(PASSWORD)
+    transport = httpx.ASGITransport(app=build_app(hashed_password), raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for mode in ("sync", "async"):
+            print(await run_scenario(client, mode=mode, logins=logins, duration=duration))
+    DomainAuthService.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=32, help="concurrent login clients")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per scenario")
+    args = parser.parse_args()
+    asyncio.run(main(logins=args.logins, duration=args.duration))
@@ -23,5 +23,23 @@ class ApplicationServicesContainer:
 
         return AppCommonService
 
+    @property
+    def rate_limit_service(self) -> Type["src.app.application.services.rate_limit_service.AppRateLimitService"]:
+        from src.app.application.services.rate_limit_service import AppRateLimitService
+
+        return AppRateLimitService
+
+    @property
+    def session_service(self) -> Type["src.app.application.services.session_service.AppSessionService"]:
+        from src.app.application.services.session_service import AppSessionService
+
+        return AppSessionService
+
+    @property
+    def outbox_service(self) -> Type["src.app.application.services.outbox_service.AppOutboxService"]:
+        from src.app.application.services.outbox_service import AppOutboxService
+
+        return AppOutboxService
+
 
 container = ApplicationServicesContainer()
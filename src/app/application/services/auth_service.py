@@ -1,15 +1,20 @@
-from typing import Any
+import asyncio
+from typing import Any, List, Optional, Set
 
+from loguru import logger
 from pydantic import validate_email
 
 from src.app.application.common.services.base import AbstractBaseApplicationService
 from src.app.application.container import container as app_services_container, ApplicationServicesContainer
 from src.app.application.dto.auth import DecodedTokenDTO, TokenPairDTO
 from src.app.application.dto.user import UserShortDTO
+from src.app.config.settings import settings
 from src.app.domain.auth.container import container as domain_auth_svc_container, DomainAuthServiceContainer
+from src.app.domain.auth.value_objects import DecodedToken, TokenType
 from src.app.domain.common.exceptions import ValidationError
 from src.app.domain.common.utils.common import mask_string
 from src.app.domain.users.container import container as domain_users_svc_container, DomainUsersServiceContainer
+from src.app.infrastructure.repositories.container import container as repo_container
 
 
 class AppAuthService(AbstractBaseApplicationService):
@@ -20,6 +25,13 @@ class AppAuthService(AbstractBaseApplicationService):
     dom_users_svc_container: DomainUsersServiceContainer = domain_users_svc_container
     dom_auth_svc_container: DomainAuthServiceContainer = domain_auth_svc_container
 
+    # Keeps fire-and-forget tasks referenced until done
+    _background_tasks: Set[asyncio.Task] = set()
+
+    # Calibrated bcrypt cost shared by all processes, by calibration settings; calibrated again when expired
+    PASSWORD_HASHING_ROUNDS_KEY = "auth:password_hashing:rounds"
+    PASSWORD_HASHING_ROUNDS_TTL_SECONDS = 60 * 60 * 24
+
     @classmethod
     async def get_auth_user_by_email_password(cls, email: str, password: str) -> Any:
         try:
@@ -31,7 +43,7 @@ class AppAuthService(AbstractBaseApplicationService):
             )
 
         user = await cls.app_svc_container.users_service.get_first(filter_data={"email": email_validated})
-        is_password_verified = cls.dom_auth_svc_container.auth_service.verify_password(
+        is_password_verified = await cls.dom_auth_svc_container.auth_service.verify_password_async(
             password, getattr(user, "password_hashed")
         )
         if not user or not is_password_verified:
@@ -42,12 +54,59 @@ class AppAuthService(AbstractBaseApplicationService):
                     {"key": "password", "value": mask_string(password, keep_start=1, keep_end=2)},
                 ],
             )
+
+        if cls.dom_auth_svc_container.auth_service.needs_rehash(user.password_hashed):
+            task = asyncio.create_task(
+                cls._rehash_password(user_id=user.id, password=password, hashed_password=user.password_hashed)
+            )
+            cls._background_tasks.add(task)
+            task.add_done_callback(cls._background_tasks.discard)
         return user
 
     @classmethod
-    def verify_access_token(cls, token: str) -> DecodedTokenDTO:
-        """Verify an access token and return decoded data."""
-        decoded_vo = cls.dom_auth_svc_container.jwt_service.verify_access_token(token)
+    async def _rehash_password(cls, user_id: int, password: str, hashed_password: str) -> None:
+        """Re-hash password with the current cost, skipped if the password changed meanwhile."""
+        try:
+            new_hashed_password = await cls.dom_auth_svc_container.auth_service.get_password_hashed_async(password)
+            await cls.app_svc_container.users_service.update(
+                filter_data={"id": user_id, "password_hashed": hashed_password},
+                data={"password_hashed": new_hashed_password},
+            )
+        except Exception as ex:
+            logger.warning(f"Password rehash failed for user #{user_id}. Reason: {ex}")
+
+    @classmethod
+    def get_password_hashing_rounds_key(cls) -> str:
+        return (
+            f"{cls.PASSWORD_HASHING_ROUNDS_KEY}:{settings.PASSWORD_HASHING_TARGET_MS}"
+            f":{settings.PASSWORD_HASHING_MIN_ROUNDS}:{settings.PASSWORD_HASHING_MAX_ROUNDS}"
+        )
+
+    @classmethod
+    async def calibrate_password_hashing(cls) -> int:
+        """
+        Tune password hashing cost, see DomainAuthService.calibrate. The first
+        process to calibrate shares its cost through Redis and the others adopt
+        it, so workers don't rehash passwords back and forth between their costs.
+        The shared cost is kept per calibration settings, changed ones apply at once.
+        """
+        auth_service = cls.dom_auth_svc_container.auth_service
+        rounds = await asyncio.to_thread(auth_service.calibrate)
+        if settings.PASSWORD_HASHING_TARGET_MS <= 0:  # configured cost, nothing to share
+            return rounds
+        try:
+            shared_rounds = await repo_container.common_redis_repository.set_if_absent(
+                key=cls.get_password_hashing_rounds_key(),
+                value=str(rounds),
+                expire_in_seconds=cls.PASSWORD_HASHING_ROUNDS_TTL_SECONDS,
+            )
+            auth_service.rounds = int(shared_rounds)
+        except Exception as ex:
+            logger.warning(f"Shared password hashing cost is not available, using {rounds}. Reason: {ex}")
+        return auth_service.rounds
+
+    @classmethod
+    def _to_decoded_token_dto(cls, decoded_vo: DecodedToken) -> DecodedTokenDTO:
         return DecodedTokenDTO(
             uuid=decoded_vo.uuid,
             sid=decoded_vo.sid,
@@ -55,21 +114,89 @@ class AppAuthService(AbstractBaseApplicationService):
             exp=decoded_vo.exp,
         )
 
+    @classmethod
+    async def verify_access_token(cls, token: str) -> DecodedTokenDTO:
+        """Verify an access token and its session, return decoded data."""
+        decoded_vo = cls.dom_auth_svc_container.jwt_service.verify_access_token(token)
+        await cls.app_svc_container.session_service.check_not_revoked(uuid=decoded_vo.uuid, sid=decoded_vo.sid)
+        return cls._to_decoded_token_dto(decoded_vo)
+
     @classmethod
     def verify_refresh_token(cls, token: str) -> DecodedTokenDTO:
         """Verify a refresh token and return decoded data."""
         decoded_vo = cls.dom_auth_svc_container.jwt_service.verify_refresh_token(token)
-        return DecodedTokenDTO(
-            uuid=decoded_vo.uuid,
-            sid=decoded_vo.sid,
-            token_type=decoded_vo.token_type.value,
-            exp=decoded_vo.exp,
+        return cls._to_decoded_token_dto(decoded_vo)
+
+    @classmethod
+    def _validate_batch_size(cls, items: list, key: str) -> None:
+        if len(items) > settings.AUTH_BATCH_MAX_SIZE:
+            raise ValidationError(
+                message="Too many items",
+                details=[{"key": key, "value": f"{len(items)} > {settings.AUTH_BATCH_MAX_SIZE}"}],
+            )
+
+    @classmethod
+    async def create_tokens_batch(cls, uuids: List[str]) -> List[TokenPairDTO]:
+        """Create token pairs for many users, their sessions are registered in one round trip."""
+        cls._validate_batch_size(uuids, key="uuids")
+        token_pairs_vo = cls.dom_auth_svc_container.jwt_service.create_token_pairs(uuids)
+        await cls.app_svc_container.session_service.create_many(
+            items=[(uuid, vo.sid, vo.refresh_sid) for uuid, vo in zip(uuids, token_pairs_vo)]
+        )
+        return [
+            TokenPairDTO(access_token=vo.access_token, refresh_token=vo.refresh_token) for vo in token_pairs_vo
+        ]
+
+    @classmethod
+    async def verify_tokens_batch(
+        cls, tokens: List[str], token_type: str = TokenType.ACCESS.value
+    ) -> List[Optional[DecodedTokenDTO]]:
+        """Verify many tokens of one type, invalid or revoked ones are returned as None in place."""
+        cls._validate_batch_size(tokens, key="tokens")
+        try:
+            token_type_ = TokenType(token_type)
+        except ValueError:
+            raise ValidationError(message="Invalid value", details=[{"key": "token_type", "value": token_type}])
+
+        jwt_service = cls.dom_auth_svc_container.jwt_service
+        session_service = cls.app_svc_container.session_service
+        decoded_vos = jwt_service.verify_tokens(tokens, token_type=token_type_)
+        if token_type_ == TokenType.REFRESH:
+            return await cls._check_refresh_sessions(decoded_vos)
+
+        members = [
+            session_service.get_member(vo.uuid, jwt_service.get_session_sid(vo)) if vo else None
+            for vo in decoded_vos
+        ]
+        revoked = await session_service.get_revoked_members([i for i in set(members) if i])
+        return [
+            cls._to_decoded_token_dto(vo) if vo and member not in revoked else None
+            for vo, member in zip(decoded_vos, members)
+        ]
+
+    @classmethod
+    async def _check_refresh_sessions(
+        cls, decoded_vos: List[Optional[DecodedToken]]
+    ) -> List[Optional[DecodedTokenDTO]]:
+        """
+        Refresh tokens are valid only while their session allows their refresh sid,
+        rotated and revoked ones are not: revocation drops the session.
+        """
+        jwt_service = cls.dom_auth_svc_container.jwt_service
+        decoded_vos_ = [vo for vo in decoded_vos if vo]
+        flags = await cls.app_svc_container.session_service.get_current_refresh_flags(
+            items=[(vo.uuid, jwt_service.get_session_sid(vo), vo.sid) for vo in decoded_vos_]
         )
+        flags_iter = iter(flags)  # in order of the decoded tokens
+        return [cls._to_decoded_token_dto(vo) if vo and next(flags_iter) else None for vo in decoded_vos]
 
     @classmethod
-    def create_tokens_for_user(cls, uuid: str) -> TokenPairDTO:
-        """Create access and refresh tokens for a user."""
+    async def create_tokens_for_user(cls, uuid: str) -> TokenPairDTO:
+        """Create access and refresh tokens for a user, starting a new session."""
         token_pair_vo = cls.dom_auth_svc_container.jwt_service.create_token_pair(uuid)
+        await cls.app_svc_container.session_service.create(
+            uuid=uuid, sid=token_pair_vo.sid, refresh_sid=token_pair_vo.refresh_sid
+        )
         return TokenPairDTO(
             access_token=token_pair_vo.access_token,
             refresh_token=token_pair_vo.refresh_token,
@@ -77,11 +204,37 @@ class AppAuthService(AbstractBaseApplicationService):
 
     @classmethod
     async def refresh_tokens(cls, refresh_token: str) -> tuple[UserShortDTO, TokenPairDTO]:
-        """Verify refresh token, get user, and create new token pair."""
-        decoded = cls.verify_refresh_token(refresh_token)
+        """Verify refresh token, get user, and rotate the session's token pair."""
+        jwt_service = cls.dom_auth_svc_container.jwt_service
+        decoded_vo = jwt_service.verify_refresh_token(refresh_token)
+        sid = jwt_service.get_session_sid(decoded_vo)
+
+        # Same session, new refresh sid: the presented refresh token can't be used again
+        token_pair_vo = jwt_service.create_token_pair(decoded_vo.uuid, sid=sid)
+        await cls.app_svc_container.session_service.rotate(
+            uuid=decoded_vo.uuid, sid=sid, refresh_sid=decoded_vo.sid, new_refresh_sid=token_pair_vo.refresh_sid
+        )
+
         user = await cls.app_svc_container.users_service.get_first(
-            filter_data={"uuid": decoded.uuid}, out_dataclass=UserShortDTO
+            filter_data={"uuid": decoded_vo.uuid}, out_dataclass=UserShortDTO
         )
         assert user is not None
-        new_tokens = cls.create_tokens_for_user(str(user.uuid))
+        new_tokens = TokenPairDTO(
+            access_token=token_pair_vo.access_token,
+            refresh_token=token_pair_vo.refresh_token,
+        )
         return user, new_tokens
+
+    @classmethod
+    async def logout(cls, access_token: str, is_all_sessions: bool = False) -> None:
+        """Revoke the session of the access token, or every session of its user."""
+        decoded = await cls.verify_access_token(access_token)
+        if is_all_sessions:
+            await cls.app_svc_container.session_service.revoke_all(uuid=decoded.uuid)
+        else:
+            await cls.app_svc_container.session_service.revoke(uuid=decoded.uuid, sid=decoded.sid)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Release password hashing workers."""
+        cls.dom_auth_svc_container.auth_service.shutdown()
@@ -1,3 +1,8 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from src.app.config.settings import settings
 from src.app.infrastructure.messaging.mq_client import mq_client
 from src.app.infrastructure.repositories.container import container as repo_container
 from src.app.application.common.services.base import AbstractBaseApplicationService
@@ -5,19 +10,84 @@ from loguru import logger
 
 
 class AppCommonService(AbstractBaseApplicationService):
+    """
+    Health of the app in tiers. Liveness takes no I/O. Readiness checks the
+    dependencies concurrently, each within HEALTH_CHECK_TIMEOUT_SECONDS. Probes
+    read the readiness refreshed in the background every
+    HEALTH_CHECK_REFRESH_SECONDS and check it themselves only when it is older
+    than HEALTH_CHECK_STALENESS_SECONDS.
+    """
+
+    status: Optional[Tuple[float, bool]] = None  # checked at, is healthy
+    _refresh_task: Optional[asyncio.Task] = None
 
     @classmethod
-    async def is_healthy(cls) -> bool:
-        """Checks if app infrastructure is up and healthy."""
-        try:
-            is_psql_healthy = await repo_container.common_psql_repository.is_healthy()
+    def is_alive(cls) -> bool:
+        """Liveness: the process serves requests, dependencies are not checked"""
+        return True
+
+    @classmethod
+    def get_dependency_checks(cls) -> Dict[str, Callable[[], Awaitable[bool]]]:
+        return {
+            "psql": repo_container.common_psql_repository.is_healthy,
+            "redis": repo_container.common_redis_repository.is_healthy,
+            "message_broker": mq_client.is_healthy,
+        }
 
-            is_redis_healthy = await repo_container.common_redis_repository.is_healthy()
+    @classmethod
+    async def _check(cls, name: str, check: Callable[[], Awaitable[bool]]) -> bool:
+        try:
+            async with asyncio.timeout(settings.HEALTH_CHECK_TIMEOUT_SECONDS):
+                return bool(await check())
+        except Exception as ex:
+            logger.error(f"Dependency {name} is not healthy. Reason: {type(ex).__name__}: {ex}")
+            return False
 
-            is_message_broker_healthy = await mq_client.is_healthy()
+    @classmethod
+    async def check_dependencies(cls) -> Dict[str, bool]:
+        """Health by dependency, checked concurrently"""
+        checks = cls.get_dependency_checks()
+        results = await asyncio.gather(*[cls._check(name, check) for name, check in checks.items()])
+        return dict(zip(checks, results))
 
+    @classmethod
+    async def is_healthy(cls) -> bool:
+        """Checks if app infrastructure is up and healthy, the result becomes the cached status"""
+        try:
+            is_healthy = all((await cls.check_dependencies()).values())
         except Exception as ex:
             logger.error(f"Application is not healthy. Reason: {ex}")
-            return False
+            is_healthy = False
+        cls.status = (time.monotonic(), is_healthy)
+        return is_healthy
 
-        return all([is_psql_healthy, is_redis_healthy, is_message_broker_healthy])
+    @classmethod
+    async def get_status(cls) -> bool:
+        """Readiness for probes, the cached status unless it is stale"""
+        status = cls.status
+        if status is not None and time.monotonic() - status[0] <= settings.HEALTH_CHECK_STALENESS_SECONDS:
+            return status[1]
+        return await cls.is_healthy()
+
+    @classmethod
+    async def _refresh_loop(cls) -> None:
+        while True:
+            await cls.is_healthy()
+            await asyncio.sleep(settings.HEALTH_CHECK_REFRESH_SECONDS)
+
+    @classmethod
+    async def start(cls) -> None:
+        if cls._refresh_task is not None:
+            return None
+        cls._refresh_task = asyncio.create_task(cls._refresh_loop())
+
+    @classmethod
+    async def stop(cls) -> None:
+        task, cls._refresh_task = cls._refresh_task, None
+        if task is None:
+            return None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,141 @@
+import asyncio
+import datetime as dt
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from src.app.application.common.services.base import AbstractBaseApplicationService
+from src.app.config.settings import settings
+from src.app.domain.common.aggregates.base import BaseAggregate
+from src.app.domain.common.events.base import DomainEvent
+from src.app.infrastructure.messaging.mq_client import mq_client
+from src.app.infrastructure.repositories.container import container as repo_container
+
+
+class AppOutboxService(AbstractBaseApplicationService):
+    """
+    Transactional outbox: messages are stored in the transaction of the change
+    they describe and published by the relay afterwards, at least once.
+
+    Relays claim batches with FOR UPDATE SKIP LOCKED, any number of them can
+    run side by side without publishing the same batch twice.
+    """
+
+    # Repositories
+    repository = repo_container.outbox_repository
+
+    @classmethod
+    async def add(
+        cls,
+        session: Any,
+        event: str,
+        data: dict,
+        exchanger_name: Optional[str] = None,
+        queue_name: Optional[str] = None,
+    ) -> None:
+        """Store a message within the caller's transaction, see `repository.transaction()`"""
+        await cls.add_many(session, items=[(event, data)], exchanger_name=exchanger_name, queue_name=queue_name)
+
+    @classmethod
+    async def add_many(
+        cls,
+        session: Any,
+        items: List[Tuple[str, dict]],
+        exchanger_name: Optional[str] = None,
+        queue_name: Optional[str] = None,
+    ) -> None:
+        if not items:
+            return None
+        rows = [
+            {
+                "exchanger_name": exchanger_name or settings.DEFAULT_EXCHANGER,
+                "queue_name": str(queue_name or settings.DEFAULT_QUEUE),
+                "event": event,
+                "data": data,
+            }
+            for event, data in items
+        ]
+        await cls.repository.create_bulk(items=rows, session=session)
+
+    @classmethod
+    async def add_events(cls, session: Any, events: List[DomainEvent]) -> None:
+        await cls.add_many(session, items=[(i.event, i.payload) for i in events])
+
+    @classmethod
+    async def add_aggregate_events(cls, session: Any, aggregate: BaseAggregate) -> None:
+        """Store events collected by the aggregate and clear them"""
+        await cls.add_events(session, aggregate.get_events())
+        aggregate.events_clear()
+
+    @classmethod
+    async def relay_batch(cls, limit: Optional[int] = None) -> int:
+        """
+        Publish one batch of pending messages, returns the number of published messages.
+
+        Every destination is marked sent as soon as it's published. A destination the
+        broker rejects while it is healthy counts a failed attempt, its messages are
+        parked with `failed_at` after OUTBOX_RELAY_MAX_ATTEMPTS and stop blocking the
+        outbox. If the broker is down the rest of the batch is released as is.
+        """
+        async with cls.repository.claim(limit=limit or settings.OUTBOX_RELAY_BATCH_SIZE) as claimed:
+            messages_by_destination: Dict[Tuple[str, str], List[dict]] = {}
+            for i in claimed.messages:
+                messages_by_destination.setdefault((i["exchanger_name"], i["queue_name"]), []).append(i)
+            published = 0
+            for (exchanger_name, queue_name), messages in messages_by_destination.items():
+                ids = [i["id"] for i in messages]
+                try:
+                    await cls._publish(exchanger_name, queue_name, messages)
+                except Exception as ex:
+                    if not await mq_client.is_healthy():
+                        logger.warning(f"Outbox relay stopped, broker is not available. Reason: {ex}")
+                        break
+                    parked = await cls.repository.mark_failed(
+                        claimed.session, ids=ids, max_attempts=settings.OUTBOX_RELAY_MAX_ATTEMPTS
+                    )
+                    logger.warning(
+                        f"Outbox messages to {exchanger_name}/{queue_name} failed, {parked} parked. Reason: {ex}"
+                    )
+                    continue
+                await cls.repository.mark_sent(claimed.session, ids=ids)
+                published += len(ids)
+        return published
+
+    @classmethod
+    async def _publish(cls, exchanger_name: str, queue_name: str, messages: List[dict]) -> None:
+        await mq_client.produce_messages(
+            exchanger_name=exchanger_name,
+            # Kafka partitions are stored as digits
+            queue_name=int(queue_name) if queue_name.isdigit() else queue_name,
+            # Stable ID, messages republished after a failed relay are deduplicated by consumers
+            messages=[{"event": i["event"], "data": i["data"], "message_id": i["uuid"]} for i in messages],
+        )
+
+    @classmethod
+    async def purge_sent(cls) -> None:
+        """Drop messages sent more than OUTBOX_RETENTION_HOURS ago"""
+        sent_before = dt.datetime.now(dt.UTC).replace(tzinfo=None) - dt.timedelta(
+            hours=settings.OUTBOX_RETENTION_HOURS
+        )
+        await cls.repository.remove(filter_data={"sent_at__lt": sent_before})
+
+    @classmethod
+    async def run_relay(cls) -> None:
+        """Relay loop: publishes full batches back to back, polls when the outbox runs dry"""
+        purge_interval = 60 * 60
+        loop = asyncio.get_running_loop()
+        purged_at = loop.time()
+        while True:
+            try:
+                published = await cls.relay_batch()
+            except Exception as ex:
+                logger.warning(f"Outbox relay failed, batch is released. Reason: {ex}")
+                published = 0
+            if loop.time() - purged_at >= purge_interval:
+                purged_at = loop.time()
+                try:
+                    await cls.purge_sent()
+                except Exception as ex:
+                    logger.warning(f"Outbox purge failed. Reason: {ex}")
+            if published < settings.OUTBOX_RELAY_BATCH_SIZE:
+                await asyncio.sleep(settings.OUTBOX_RELAY_POLL_INTERVAL_MS / 1000)
@@ -0,0 +1,67 @@
+import math
+import uuid
+from enum import Enum
+
+from loguru import logger
+
+from src.app.application.common.services.base import AbstractBaseApplicationService
+from src.app.domain.common.exceptions import TooManyRequestsError
+from src.app.infrastructure.repositories.container import container as repo_container
+
+
+class RateLimitAlgorithm(str, Enum):
+    TOKEN_BUCKET = "token_bucket"
+    SLIDING_WINDOW = "sliding_window"
+
+
+class AppRateLimitService(AbstractBaseApplicationService):
+
+    # Repositories
+    repository = repo_container.rate_limit_repository
+
+    @classmethod
+    async def load_scripts(cls) -> None:
+        try:
+            await cls.repository.load_scripts()
+        except Exception as ex:
+            logger.warning(f"Rate limit scripts are not preloaded. Reason: {ex}")
+
+    @classmethod
+    async def hit(
+        cls,
+        scope: str,
+        identity: str,
+        limit: int,
+        period_seconds: int,
+        algorithm: RateLimitAlgorithm = RateLimitAlgorithm.TOKEN_BUCKET,
+    ) -> None:
+        """Consumes one request from the identity quota, raises TooManyRequestsError if exhausted."""
+        try:
+            if algorithm == RateLimitAlgorithm.SLIDING_WINDOW:
+                result = await cls.repository.hit_sliding_window(
+                    scope=scope,
+                    identity=identity,
+                    limit=limit,
+                    window_seconds=period_seconds,
+                    request_id=uuid.uuid4().hex,
+                )
+            else:
+                result = await cls.repository.hit_token_bucket(
+                    scope=scope,
+                    identity=identity,
+                    capacity=limit,
+                    refill_per_second=limit / period_seconds,
+                )
+        except Exception as ex:
+            # Fail open: limiter outage must not take the protected endpoints down
+            logger.warning(f"Rate limiter is not available. Reason: {ex}")
+            return None
+
+        if not result.is_allowed:
+            retry_after = max(1, math.ceil(result.retry_after_ms / 1000))
+            raise TooManyRequestsError(
+                message="Too many requests",
+                details=[{"key": "scope", "value": scope}],
+                extra={"headers": {"Retry-After": str(retry_after)}},
+            )
+        return None
@@ -0,0 +1,174 @@
+import asyncio
+import time
+from typing import List, Optional, Set, Tuple
+
+from loguru import logger
+
+from src.app.application.common.services.base import AbstractBaseApplicationService
+from src.app.config.settings import settings
+from src.app.domain.common.exceptions import AuthenticationError
+from src.app.domain.common.utils.bloom import BloomFilter
+from src.app.infrastructure.repositories.container import container as repo_container
+
+
+class AppSessionService(AbstractBaseApplicationService):
+    """
+    Auth sessions: registry, refresh token rotation and revocation.
+
+    Each worker mirrors the revocation list in a Bloom filter refreshed every
+    AUTH_REVOCATION_REFRESH_SECONDS. Access token checks are a local membership
+    test; Redis is consulted only on a probable hit. Revocations made by other
+    workers take effect after their next refresh.
+    """
+
+    # Repositories
+    repository = repo_container.sessions_repository
+
+    MIN_FILTER_CAPACITY = 1024
+
+    revocation_filter: Optional[BloomFilter] = None
+    revocation_version: Optional[int] = None
+    _refresh_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def get_member(cls, uuid: str, sid: str) -> str:
+        return f"{uuid}:{sid}"
+
+    @classmethod
+    def _get_auth_exception(cls) -> AuthenticationError:
+        return AuthenticationError(
+            message="Session is revoked",
+            details=[],
+            extra={"headers": {"WWW-Authenticate": "Bearer"}},
+        )
+
+    @classmethod
+    async def create(cls, uuid: str, sid: str, refresh_sid: str) -> None:
+        await cls.create_many(items=[(uuid, sid, refresh_sid)])
+
+    @classmethod
+    async def create_many(cls, items: List[Tuple[str, str, str]]) -> None:
+        """Register `(uuid, sid, refresh_sid)` sessions"""
+        if not settings.AUTH_SESSIONS_ENABLED:
+            return None
+        await cls.repository.create_sessions(
+            items=items, expire_in_seconds=settings.REFRESH_TOKEN_EXPIRES_DAYS * 24 * 60 * 60
+        )
+
+    @classmethod
+    async def rotate(cls, uuid: str, sid: str, refresh_sid: str, new_refresh_sid: str) -> None:
+        """Allow `new_refresh_sid` instead of the presented one, a reused refresh token revokes the session."""
+        if not settings.AUTH_SESSIONS_ENABLED:
+            return None
+        result = await cls.repository.rotate_session(
+            uuid=uuid,
+            sid=sid,
+            refresh_sid=refresh_sid,
+            new_refresh_sid=new_refresh_sid,
+            expire_in_seconds=settings.REFRESH_TOKEN_EXPIRES_DAYS * 24 * 60 * 60,
+        )
+        if result == -1:
+            logger.warning(f"Refresh token reuse detected, revoking session {sid} of user {uuid}")
+            await cls.revoke(uuid=uuid, sid=sid)
+        if result != 1:
+            raise cls._get_auth_exception()
+
+    @classmethod
+    async def get_current_refresh_flags(cls, items: List[Tuple[str, str, str]]) -> List[bool]:
+        """Whether each `(uuid, sid, refresh_sid)` is the refresh sid its session currently allows."""
+        if not settings.AUTH_SESSIONS_ENABLED:
+            return [True] * len(items)
+        refresh_sids = await cls.repository.get_refresh_sids(items=[(uuid, sid) for uuid, sid, _ in items])
+        return [current == refresh_sid for (_, _, refresh_sid), current in zip(items, refresh_sids)]
+
+    @classmethod
+    async def revoke(cls, uuid: str, sid: str) -> None:
+        await cls._revoke_sids(uuid=uuid, sids=[sid])
+
+    @classmethod
+    async def revoke_all(cls, uuid: str) -> None:
+        sids = await cls.repository.get_user_sessions(uuid)
+        await cls._revoke_sids(uuid=uuid, sids=sids)
+
+    @classmethod
+    async def _revoke_sids(cls, uuid: str, sids: list) -> None:
+        if not settings.AUTH_SESSIONS_ENABLED or not sids:
+            return None
+        # Access tokens of the session stay valid by signature until they expire
+        revoked_until = time.time() + settings.ACCESS_TOKEN_EXPIRES_MINUTES * 60
+        await cls.repository.revoke_sessions(uuid=uuid, sids=sids, revoked_until=revoked_until)
+        if cls.revocation_filter is not None:
+            for sid in sids:
+                cls.revocation_filter.add(cls.get_member(uuid, sid))
+
+    @classmethod
+    async def is_revoked(cls, uuid: str, sid: str) -> bool:
+        member = cls.get_member(uuid, sid)
+        return member in await cls.get_revoked_members([member])
+
+    @classmethod
+    async def get_revoked_members(cls, members: List[str]) -> Set[str]:
+        """Revoked ones among `uuid:sid` members, only probable hits of the local filter reach Redis."""
+        if not settings.AUTH_SESSIONS_ENABLED:
+            return set()
+        candidates = members
+        if cls.revocation_filter is not None:
+            candidates = [i for i in members if i in cls.revocation_filter]
+            if not candidates:
+                return set()
+        try:
+            return await cls.repository.get_revoked_members(candidates)
+        except Exception as ex:
+            if cls.revocation_filter is None:
+                # No local copy yet, the outage must not log everybody out
+                logger.warning(f"Revocation list is not available. Reason: {ex}")
+                return set()
+            logger.warning(f"Revocation check failed for listed sessions, rejecting. Reason: {ex}")
+            return set(candidates)
+
+    @classmethod
+    async def check_not_revoked(cls, uuid: str, sid: str) -> None:
+        if await cls.is_revoked(uuid=uuid, sid=sid):
+            raise cls._get_auth_exception()
+
+    @classmethod
+    async def refresh_revocation_filter(cls) -> None:
+        """Rebuild the local Bloom filter if the revocation list changed"""
+        version = await cls.repository.get_revoked_version()
+        if version == cls.revocation_version and cls.revocation_filter is not None:
+            return None
+        version, members = await cls.repository.get_revoked()
+        cls.revocation_filter = BloomFilter.from_items(
+            members,
+            capacity=max(cls.MIN_FILTER_CAPACITY, len(members) * 2),
+            error_rate=settings.AUTH_REVOCATION_FILTER_ERROR_RATE,
+        )
+        cls.revocation_version = version
+
+    @classmethod
+    async def _refresh_loop(cls) -> None:
+        while True:
+            try:
+                await cls.refresh_revocation_filter()
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logger.warning(f"Revocation filter refresh failed. Reason: {ex}")
+            await asyncio.sleep(settings.AUTH_REVOCATION_REFRESH_SECONDS)
+
+    @classmethod
+    async def start(cls) -> None:
+        if not settings.AUTH_SESSIONS_ENABLED or cls._refresh_task is not None:
+            return None
+        cls._refresh_task = asyncio.create_task(cls._refresh_loop())
+
+    @classmethod
+    async def stop(cls) -> None:
+        task, cls._refresh_task = cls._refresh_task, None
+        if task is None:
+            return None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
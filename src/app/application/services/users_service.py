@@ -1,9 +1,11 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
+from loguru import logger
 from pydantic import validate_email
 
 from src.app.application.common.services.base import BaseApplicationService
 from src.app.application.container import container as app_services_container, ApplicationServicesContainer
+from src.app.config.settings import settings
 from src.app.application.dto.user import CreateUserByEmailDTO, CreateUserByPhoneDTO, UserShortDTO
 from src.app.domain.auth.container import container as domain_auth_svc_container, DomainAuthServiceContainer
 from src.app.domain.common.exceptions import AlreadyExistsError
@@ -24,6 +26,122 @@ class AppUserService(BaseApplicationService):
 
     # Repositories
     repository = repo_container.users_repository
+    profile_repository = repo_container.users_profile_repository
+
+    # Fields of the cached profile snapshot, see `get_profile`
+    PROFILE_FIELDS = ("uuid", "first_name", "last_name", "email")
+
+    @classmethod
+    async def get_profile(cls, uuid: str) -> Optional[dict]:
+        """Profile projection of a user, served from the versioned snapshot while it's current."""
+        ttl = settings.USERS_PROFILE_CACHE_TTL_SECONDS
+        if ttl <= 0:
+            return await cls._load_profile(uuid)
+
+        try:
+            data, version = await cls.profile_repository.get_snapshot(uuid)
+        except Exception as e:
+            logger.warning(f"Failed to read profile snapshot: {e}")
+            return await cls._load_profile(uuid)
+        if data is not None:
+            return data
+
+        data = await cls._load_profile(uuid)
+        if data is not None:
+            try:
+                await cls.profile_repository.set_snapshot(uuid, version=version, data=data, expire_in_seconds=ttl)
+            except Exception as e:
+                logger.warning(f"Failed to store profile snapshot: {e}")
+        return data
+
+    @classmethod
+    async def _load_profile(cls, uuid: str) -> Optional[dict]:
+        items = await cls.repository.get_values(
+            filter_data={"uuid": uuid, "limit": 1}, columns=cls.PROFILE_FIELDS, order_data=None
+        )
+        if not items:
+            return None
+        data = items[0]
+        data["uuid"] = str(data["uuid"])
+        return data
+
+    @classmethod
+    def _is_profile_changed(cls, data: Dict[str, Any]) -> bool:
+        return any(field in data for field in cls.PROFILE_FIELDS)
+
+    @classmethod
+    async def _get_profile_uuids(cls, filter_data: dict) -> List[str]:
+        """uuids of users matched by a write, read before it's applied"""
+        if settings.USERS_PROFILE_CACHE_TTL_SECONDS <= 0:
+            return []
+        if list(filter_data.keys()) == ["uuid"]:
+            return [str(filter_data["uuid"])]
+        items = await cls.repository.get_values(filter_data=filter_data, columns=("uuid",))
+        return [str(i["uuid"]) for i in items]
+
+    @classmethod
+    async def _bump_profile_versions(cls, uuids: List[str]) -> None:
+        if not uuids:
+            return
+        try:
+            await cls.profile_repository.bump_versions(
+                uuids, expire_in_seconds=settings.USERS_PROFILE_CACHE_TTL_SECONDS
+            )
+        except Exception as e:
+            # Snapshots of these users stay stale until their TTL
+            logger.warning(f"Failed to bump profile versions: {e}")
+
+    @classmethod
+    async def update(
+        cls,
+        filter_data: dict,
+        data: Dict[str, Any],
+        is_return_require: bool = False,
+        out_dataclass: Optional[Any] = None,
+    ) -> Any:
+        # writes that touch no profile field leave the snapshots current
+        uuids = await cls._get_profile_uuids(filter_data) if cls._is_profile_changed(data) else []
+        item = await super().update(
+            filter_data=filter_data, data=data, is_return_require=is_return_require, out_dataclass=out_dataclass
+        )
+        await cls._bump_profile_versions(uuids)
+        return item
+
+    @classmethod
+    async def update_bulk(
+        cls,
+        items: List[dict],
+        is_return_require: bool = False,
+        out_dataclass: Optional[Any] = None,
+    ) -> Any:
+        ids = [i["id"] for i in items if "id" in i and cls._is_profile_changed(i)]
+        uuids = await cls._get_profile_uuids({"id__in": ids}) if ids else []
+        result = await super().update_bulk(
+            items=items, is_return_require=is_return_require, out_dataclass=out_dataclass
+        )
+        await cls._bump_profile_versions(uuids)
+        return result
+
+    @classmethod
+    async def update_or_create(
+        cls,
+        filter_data: dict,
+        data: Dict[str, Any],
+        is_return_require: bool = False,
+        out_dataclass: Optional[Any] = None,
+    ) -> Any:
+        uuids = await cls._get_profile_uuids(filter_data) if cls._is_profile_changed(data) else []
+        item = await super().update_or_create(
+            filter_data=filter_data, data=data, is_return_require=is_return_require, out_dataclass=out_dataclass
+        )
+        await cls._bump_profile_versions(uuids)
+        return item
+
+    @classmethod
+    async def remove(cls, filter_data: dict) -> None:
+        uuids = await cls._get_profile_uuids(filter_data)
+        await super().remove(filter_data=filter_data)
+        await cls._bump_profile_versions(uuids)
 
     @classmethod
     async def create_user_by_email(cls, email: str, password: str) -> Optional[UserShortDTO]:
@@ -33,7 +151,9 @@ class AppUserService(BaseApplicationService):
         email_password_vo = EmailPasswordPair(email=input_dto.email, password=input_dto.password)
 
         # Use domain service for password hashing
-        password_hashed = domain_auth_svc_container.auth_service.get_password_hashed(password=input_dto.password)
+        password_hashed = await domain_auth_svc_container.auth_service.get_password_hashed_async(
+            password=input_dto.password
+        )
 
         # Check business rule: email uniqueness
         is_email_exists = await cls.app_svc_container.users_service.is_exists(
@@ -52,6 +52,30 @@ class SettingsBase(PydanticSettings):
     ALGORITHM = "HS256"
     ACCESS_TOKEN_EXPIRES_MINUTES = env.int("ACCESS_TOKEN_EXPIRES_MINUTES", 30)
     REFRESH_TOKEN_EXPIRES_DAYS = env.int("REFRESH_TOKEN_EXPIRES_DAYS", 7)
+    ACCESS_TOKEN_CACHE_MAX_SIZE: int = env.int("ACCESS_TOKEN_CACHE_MAX_SIZE", 10000)  # 0 - disabled
+    PASSWORD_HASHING_EXECUTOR: str = env.str("PASSWORD_HASHING_EXECUTOR", "thread")  # thread | process
+    PASSWORD_HASHING_POOL_SIZE: int = env.int("PASSWORD_HASHING_POOL_SIZE", os.cpu_count() or 1)
+    PASSWORD_HASHING_QUEUE_SIZE: int = env.int("PASSWORD_HASHING_QUEUE_SIZE", 64)
+    PASSWORD_HASHING_ROUNDS: int = env.int("PASSWORD_HASHING_ROUNDS", 12)  # used if no target time set
+    PASSWORD_HASHING_TARGET_MS: int = env.int("PASSWORD_HASHING_TARGET_MS", 0)  # 0 - no calibration
+    PASSWORD_HASHING_MIN_ROUNDS: int = env.int("PASSWORD_HASHING_MIN_ROUNDS", 10)
+    PASSWORD_HASHING_MAX_ROUNDS: int = env.int("PASSWORD_HASHING_MAX_ROUNDS", 16)
+    AUTH_SESSIONS_ENABLED: bool = env.bool("AUTH_SESSIONS_ENABLED", True)
+    AUTH_REVOCATION_REFRESH_SECONDS: float = env.float("AUTH_REVOCATION_REFRESH_SECONDS", 5)
+    AUTH_REVOCATION_FILTER_ERROR_RATE: float = env.float("AUTH_REVOCATION_FILTER_ERROR_RATE", 0.001)
+    AUTH_SERVICE_API_KEY: str = env.str(
+        "AUTH_SERVICE_API_KEY", ""
+    )  # service-to-service batch API, empty - disabled
+    AUTH_BATCH_MAX_SIZE: int = env.int("AUTH_BATCH_MAX_SIZE", 1000)
+
+    # Rate limit settings
+    # --------------------------------------------------------------------------
+    RATE_LIMIT_ENABLED: bool = env.bool("RATE_LIMIT_ENABLED", True)
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = env.bool("RATE_LIMIT_TRUST_FORWARDED_FOR", False)
+    RATE_LIMIT_AUTH_REQUESTS: int = env.int("RATE_LIMIT_AUTH_REQUESTS", 10)  # per IP
+    RATE_LIMIT_AUTH_PERIOD_SECONDS: int = env.int("RATE_LIMIT_AUTH_PERIOD_SECONDS", 60)
+    RATE_LIMIT_AUTH_EMAIL_REQUESTS: int = env.int("RATE_LIMIT_AUTH_EMAIL_REQUESTS", 5)  # per account
+    RATE_LIMIT_AUTH_EMAIL_PERIOD_SECONDS: int = env.int("RATE_LIMIT_AUTH_EMAIL_PERIOD_SECONDS", 300)
 
     # Database Settings
     # --------------------------------------------------------------------------
@@ -70,15 +94,74 @@ class SettingsBase(PydanticSettings):
     CONNECTIONS_POOL_RECYCLE: int = env.int("CONNECTIONS_POOL_RECYCLE", 3600)  # 1 hour in seconds
     CONNECTIONS_POOL_TIMEOUT: int = env.int("CONNECTIONS_POOL_TIMEOUT", 30)  # seconds
 
+    # Health Checks
+    # --------------------------------------------------------------------------
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = env.float("HEALTH_CHECK_TIMEOUT_SECONDS", 2)  # per dependency
+    HEALTH_CHECK_REFRESH_SECONDS: float = env.float("HEALTH_CHECK_REFRESH_SECONDS", 5)  # background refresh
+    HEALTH_CHECK_STALENESS_SECONDS: float = env.float("HEALTH_CHECK_STALENESS_SECONDS", 15)  # then probes check
+
     # Redis Settings
     # --------------------------------------------------------------------------
     REDIS_URL = env.str("REDIS_URL", "")
+    REDIS_CLIENT_CACHE_ENABLED: bool = env.bool("REDIS_CLIENT_CACHE_ENABLED", False)
+    REDIS_CLIENT_CACHE_MAX_SIZE: int = env.int("REDIS_CLIENT_CACHE_MAX_SIZE", 10000)
+    REDIS_CLIENT_CACHE_TTL_SECONDS: int = env.int("REDIS_CLIENT_CACHE_TTL_SECONDS", 300)  # safety net, 0 - no TTL
+    USERS_PROFILE_CACHE_TTL_SECONDS: int = env.int("USERS_PROFILE_CACHE_TTL_SECONDS", 600)  # 0 - disabled
 
     # Message Broker Settings
     # --------------------------------------------------------------------------
     MESSAGE_BROKER_URL: str = env.str("MESSAGE_BROKER_URL") or ""
     DEFAULT_EXCHANGER: str = env.str("DEFAULT_EXCHANGER", "default_exchanger")
     DEFAULT_QUEUE: str = env.str("DEFAULT_QUEUE", "default_queue")
+    MESSAGE_BROKER_HEALTH_CHECK_CACHE_SECONDS: float = env.float(
+        "MESSAGE_BROKER_HEALTH_CHECK_CACHE_SECONDS", 5
+    )  # probes within it get the last result, 0 - check every time
+    MESSAGE_BROKER_HEALTH_CHECK_TIMEOUT_SECONDS: float = env.float(
+        "MESSAGE_BROKER_HEALTH_CHECK_TIMEOUT_SECONDS", 3
+    )
+    CONSUMER_BATCH_SIZE: int = env.int("CONSUMER_BATCH_SIZE", 1)  # 1 - message by message
+    CONSUMER_BATCH_TIMEOUT_MS: int = env.int("CONSUMER_BATCH_TIMEOUT_MS", 200)
+    CONSUMER_HANDLER_MAX_CONCURRENCY: int = env.int(
+        "CONSUMER_HANDLER_MAX_CONCURRENCY", 100
+    )  # per in-process handler
+    CONSUMER_HANDLER_TIMEOUT_SECONDS: float = env.float("CONSUMER_HANDLER_TIMEOUT_SECONDS", 30)
+    CONSUMER_SUPERVISOR_WORKERS: int = env.int("CONSUMER_SUPERVISOR_WORKERS", 0)  # 0 - CPU count
+    CONSUMER_SUPERVISOR_REPORT_INTERVAL_SECONDS: int = env.int("CONSUMER_SUPERVISOR_REPORT_INTERVAL_SECONDS", 30)
+    CONSUMER_METRICS_PORT: int = env.int("CONSUMER_METRICS_PORT", 0)  # 0 - disabled, supervisor workers add index
+    CONSUMER_BACKLOG_SAMPLE_INTERVAL_SECONDS: int = env.int("CONSUMER_BACKLOG_SAMPLE_INTERVAL_SECONDS", 15)
+    CONSUMER_DEDUPLICATION: str = env.str("CONSUMER_DEDUPLICATION", "redis")  # redis, postgres, "" - disabled
+    CONSUMER_DEDUPLICATION_TTL_SECONDS: int = env.int("CONSUMER_DEDUPLICATION_TTL_SECONDS", 60 * 60 * 24)
+    CONSUMER_DEDUPLICATION_PROCESSING_TTL_SECONDS: int = env.int(
+        "CONSUMER_DEDUPLICATION_PROCESSING_TTL_SECONDS", 60
+    )  # claim while handled, above CONSUMER_HANDLER_TIMEOUT_SECONDS; 0 - claimed for the TTL in one round trip
+    CONSUMER_RETRY_ENABLED: bool = env.bool("CONSUMER_RETRY_ENABLED", True)  # False - failed messages are dropped
+    CONSUMER_RETRY_MAX_ATTEMPTS: int = env.int("CONSUMER_RETRY_MAX_ATTEMPTS", 5)  # then dead-lettered
+    CONSUMER_RETRY_INITIAL_DELAY_MS: int = env.int("CONSUMER_RETRY_INITIAL_DELAY_MS", 1000)
+    CONSUMER_RETRY_BACKOFF_MULTIPLIER: float = env.float("CONSUMER_RETRY_BACKOFF_MULTIPLIER", 2.0)
+    CONSUMER_RETRY_MAX_DELAY_MS: int = env.int("CONSUMER_RETRY_MAX_DELAY_MS", 1000 * 60 * 5)
+    RABBITMQ_PREFETCH_COUNT: int = env.int("RABBITMQ_PREFETCH_COUNT", 20)
+    RABBITMQ_CONSUMER_WORKERS: int = env.int("RABBITMQ_CONSUMER_WORKERS", 10)  # concurrent handlers per queue
+    RABBITMQ_CONSUMER_ORDERING: str = env.str("RABBITMQ_CONSUMER_ORDERING", "none")  # none, routing_key
+    RABBITMQ_CONSUMER_DRAIN_TIMEOUT_SECONDS: int = env.int("RABBITMQ_CONSUMER_DRAIN_TIMEOUT_SECONDS", 30)
+    OUTBOX_RELAY_BATCH_SIZE: int = env.int("OUTBOX_RELAY_BATCH_SIZE", 500)
+    OUTBOX_RELAY_POLL_INTERVAL_MS: int = env.int("OUTBOX_RELAY_POLL_INTERVAL_MS", 500)
+    OUTBOX_RELAY_MAX_ATTEMPTS: int = env.int(
+        "OUTBOX_RELAY_MAX_ATTEMPTS", 5
+    )  # failed with a healthy broker, parked
+    OUTBOX_RETENTION_HOURS: int = env.int("OUTBOX_RETENTION_HOURS", 72)  # sent messages are purged after
+    KAFKA_PRODUCER_LINGER_MS: int = env.int("KAFKA_PRODUCER_LINGER_MS", 5)
+    KAFKA_PRODUCER_MAX_BATCH_SIZE: int = env.int(
+        "KAFKA_PRODUCER_MAX_BATCH_SIZE", 65536
+    )  # bytes per partition batch
+    KAFKA_PRODUCER_COMPRESSION_TYPE: str = env.str("KAFKA_PRODUCER_COMPRESSION_TYPE", "")  # gzip, lz4, zstd
+    KAFKA_CONSUMER_MAX_IN_FLIGHT: int = env.int("KAFKA_CONSUMER_MAX_IN_FLIGHT", 100)
+    KAFKA_CONSUMER_ORDERING: str = env.str("KAFKA_CONSUMER_ORDERING", "partition")  # partition, key
+    KAFKA_CONSUMER_COMMIT_INTERVAL_MS: int = env.int("KAFKA_CONSUMER_COMMIT_INTERVAL_MS", 1000)
+    # Redis Streams broker, MESSAGE_BROKER_URL is then a redis:// URL
+    REDIS_STREAMS_MAXLEN: int = env.int("REDIS_STREAMS_MAXLEN", 100000)  # approximate, trimmed on XADD
+    REDIS_STREAMS_READ_COUNT: int = env.int("REDIS_STREAMS_READ_COUNT", 100)  # entries per XREADGROUP
+    REDIS_STREAMS_BLOCK_MS: int = env.int("REDIS_STREAMS_BLOCK_MS", 1000)
+    REDIS_STREAMS_CLAIM_IDLE_MS: int = env.int("REDIS_STREAMS_CLAIM_IDLE_MS", 1000 * 60)  # then XAUTOCLAIM
 
 
 class SettingsLocal(SettingsBase):
@@ -1,7 +1,21 @@
+import time
+from typing import Optional
+
 import bcrypt
+from loguru import logger
 from passlib.context import CryptContext
 
+from src.app.config.settings import settings
 from src.app.domain.common.services.base import AbstractBaseDomainService
+from src.app.domain.common.utils.executors import BoundedExecutor
+
+
+def _check_password(password: bytes, hashed_password: bytes) -> bool:
+    return bcrypt.checkpw(password=password, hashed_password=hashed_password)
+
+
+def _hash_password(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password=password, salt=bcrypt.gensalt(rounds=rounds))
 
 
 class DomainAuthService(AbstractBaseDomainService):
@@ -9,15 +23,88 @@ class DomainAuthService(AbstractBaseDomainService):
 
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+    # bcrypt cost for new hashes, see `calibrate`
+    rounds: int = settings.PASSWORD_HASHING_ROUNDS
+    CALIBRATION_SAMPLES = 3
+
+    # bcrypt releases the GIL, so threads are enough unless hashing competes with request handling
+    hashing_executor = BoundedExecutor(
+        name="password_hashing",
+        max_workers=settings.PASSWORD_HASHING_POOL_SIZE,
+        queue_size=settings.PASSWORD_HASHING_QUEUE_SIZE,
+        use_processes=settings.PASSWORD_HASHING_EXECUTOR == "process",
+    )
+
+    @classmethod
+    def calibrate(cls) -> int:
+        """
+        Pick the highest bcrypt cost whose hashing time fits PASSWORD_HASHING_TARGET_MS.
+
+        Measures the minimal cost a few times (best sample wins to filter out noise)
+        and extrapolates, each extra round doubles the hashing time. Keeps
+        PASSWORD_HASHING_ROUNDS when no target is configured.
+        """
+        target_ms = settings.PASSWORD_HASHING_TARGET_MS
+        if target_ms <= 0:
+            return cls.rounds
+
+        min_rounds, max_rounds = settings.PASSWORD_HASHING_MIN_ROUNDS, settings.PASSWORD_HASHING_MAX_ROUNDS
+        sample_ms = float("inf")
+        for _ in range(cls.CALIBRATION_SAMPLES):
+            started = time.perf_counter()
+            _hash_password(password=b"calibration", rounds=min_rounds)
+            sample_ms = min(sample_ms, (time.perf_counter() - started) * 1000)
+
+        rounds = min_rounds
+        while rounds < max_rounds and sample_ms * 2 ** (rounds + 1 - min_rounds) <= target_ms:
+            rounds += 1
+
+        cls.rounds = rounds
+        logger.info(f"Password hashing cost {rounds} (~{sample_ms * 2 ** (rounds - min_rounds):.0f}ms)")
+        return rounds
+
+    @classmethod
+    def get_hash_rounds(cls, hashed_password: str) -> Optional[int]:
+        """Cost factor of a bcrypt hash: $2b$<rounds>$<salt+checksum>"""
+        parts = hashed_password.split("$")
+        if len(parts) < 4 or not parts[2].isdigit():
+            return None
+        return int(parts[2])
+
+    @classmethod
+    def needs_rehash(cls, hashed_password: str) -> bool:
+        """Hashes of another cost are rehashed, the cost moves up or down without a migration"""
+        rounds = cls.get_hash_rounds(hashed_password)
+        return rounds is not None and rounds != cls.rounds
+
     @classmethod
     def verify_password(cls, plain_password: str, hashed_password: str) -> bool:
         password_byte_enc = plain_password.encode("utf-8")
         hashed_password_enc = hashed_password.encode("utf-8")
-        return bcrypt.checkpw(password=password_byte_enc, hashed_password=hashed_password_enc)
+        return _check_password(password=password_byte_enc, hashed_password=hashed_password_enc)
 
     @classmethod
     def get_password_hashed(cls, password: str) -> str:
         pwd_bytes = password.encode("utf-8")
-        salt = bcrypt.gensalt()
-        hashed_password = bcrypt.hashpw(password=pwd_bytes, salt=salt)
+        hashed_password = _hash_password(password=pwd_bytes, rounds=cls.rounds)
         return hashed_password.decode("utf-8")
+
+    @classmethod
+    async def verify_password_async(cls, plain_password: str, hashed_password: str) -> bool:
+        """Same as verify_password, runs on the hashing pool instead of the event loop."""
+        password_byte_enc = plain_password.encode("utf-8")
+        hashed_password_enc = hashed_password.encode("utf-8")
+        return await cls.hashing_executor.run(
+            _check_password, password=password_byte_enc, hashed_password=hashed_password_enc
+        )
+
+    @classmethod
+    async def get_password_hashed_async(cls, password: str) -> str:
+        """Same as get_password_hashed, runs on the hashing pool instead of the event loop."""
+        pwd_bytes = password.encode("utf-8")
+        hashed_password = await cls.hashing_executor.run(_hash_password, password=pwd_bytes, rounds=cls.rounds)
+        return hashed_password.decode("utf-8")
+
+    @classmethod
+    def shutdown(cls) -> None:
+        cls.hashing_executor.shutdown(wait=False)
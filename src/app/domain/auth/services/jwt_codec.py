@@ -0,0 +1,88 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from typing import Optional
+
+
+class JWTCodecError(Exception):
+    """Token is malformed, forged or expired"""
+
+    pass
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class HS256Codec:
+    """
+    Specialized HS256 JWT codec for the `{"user", "type", "exp"}` payload shape.
+
+    Produces the same tokens as python-jose: the header is serialized once and
+    the HMAC key state is precomputed, so encode/decode is a copy of that state,
+    one digest and JSON of the payload. `decode` returns None for tokens outside
+    the fast path (other header, other registered claims, non-integer exp), the
+    caller is expected to fall back to python-jose for them.
+    """
+
+    ALGORITHM = "HS256"
+    HEADER = {"alg": ALGORITHM, "typ": "JWT"}
+    # Registered claims validated by python-jose, tokens carrying them take the slow path
+    FALLBACK_CLAIMS = frozenset(("nbf", "iat", "aud", "iss", "sub", "jti", "at_hash"))
+
+    def __init__(self, secret: str) -> None:
+        self._hmac = hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+        self._header_segment = _b64encode(json.dumps(self.HEADER, separators=(",", ":"), sort_keys=True).encode())
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._hmac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, payload: dict) -> str:
+        payload_segment = _b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        signing_input = self._header_segment + b"." + payload_segment
+        return (signing_input + b"." + _b64encode(self._sign(signing_input))).decode("ascii")
+
+    def _verify_signature(self, signing_input: bytes, signature_segment: bytes) -> None:
+        try:
+            signature = _b64decode(signature_segment)
+        except (binascii.Error, ValueError):
+            raise JWTCodecError("Invalid crypto padding")
+        if not hmac.compare_digest(signature, self._sign(signing_input)):
+            raise JWTCodecError("Signature verification failed")
+
+    @staticmethod
+    def _load_payload(payload_segment: bytes) -> dict:
+        try:
+            payload = json.loads(_b64decode(payload_segment))
+        except (binascii.Error, ValueError):
+            raise JWTCodecError("Invalid payload string")
+        if not isinstance(payload, dict):
+            raise JWTCodecError("Invalid payload string: must be a json object")
+        return payload
+
+    def decode(self, token: str) -> Optional[dict]:
+        signing_input, _, signature_segment = token.encode("utf-8").rpartition(b".")
+        header_segment, _, payload_segment = signing_input.partition(b".")
+        if not payload_segment:
+            raise JWTCodecError("Not enough segments")
+        if header_segment != self._header_segment:
+            return None
+
+        self._verify_signature(signing_input, signature_segment)
+        payload = self._load_payload(payload_segment)
+
+        exp = payload.get("exp")
+        if type(exp) is not int or not self.FALLBACK_CLAIMS.isdisjoint(payload):
+            return None
+        if exp < int(time.time()):
+            raise JWTCodecError("Signature has expired")
+        return payload
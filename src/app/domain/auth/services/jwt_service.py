@@ -1,14 +1,19 @@
 import datetime as dt
+import hashlib
+import time
 from datetime import timedelta
-from typing import Optional
+from typing import List, Optional
 
-from jose import jwt
+from jose import jwk, jwt
+from jose.backends.base import Key
 from loguru import logger
 
 from src.app.domain.common.exceptions import AuthenticationError
 from src.app.config.settings import settings
+from src.app.domain.auth.services.jwt_codec import HS256Codec
 from src.app.domain.auth.value_objects import TokenType, TokenPair, DecodedToken
 from src.app.domain.common.services.base import AbstractBaseDomainService
+from src.app.domain.common.utils.cache import LRUCache
 from src.app.domain.common.utils.common import generate_str
 
 
@@ -20,6 +25,28 @@ class DomainJWTService(AbstractBaseDomainService):
     REFRESH_TOKEN_EXPIRES_DAYS = settings.REFRESH_TOKEN_EXPIRES_DAYS
     ALGORITHM = settings.ALGORITHM
 
+    # verified access tokens, sha256(token) -> DecodedToken, kept until the token's exp
+    access_token_cache: Optional[LRUCache] = None
+    if settings.ACCESS_TOKEN_CACHE_MAX_SIZE > 0:
+        access_token_cache = LRUCache(max_size=settings.ACCESS_TOKEN_CACHE_MAX_SIZE)
+
+    _key: Optional[Key] = None
+    _codec: Optional[HS256Codec] = None
+
+    @classmethod
+    def _get_key(cls) -> Key:
+        """HMAC key object, built once instead of on every encode/decode."""
+        if cls._key is None:
+            cls._key = jwk.construct(cls.SECRET, cls.ALGORITHM)
+        return cls._key
+
+    @classmethod
+    def _get_codec(cls) -> Optional[HS256Codec]:
+        """Fast codec for HS256, python-jose handles other algorithms."""
+        if cls._codec is None and cls.ALGORITHM == HS256Codec.ALGORITHM:
+            cls._codec = HS256Codec(cls.SECRET)
+        return cls._codec
+
     @classmethod
     def _get_auth_exception(cls) -> AuthenticationError:
         return AuthenticationError(
@@ -29,37 +56,50 @@ class DomainJWTService(AbstractBaseDomainService):
         )
 
     @classmethod
-    def _decode(cls, token: str) -> Optional[dict]:
+    def _decode(cls, token: str, is_logged: bool = True) -> Optional[dict]:
         """Decode a JWT token and return the payload."""
+        codec = cls._get_codec()
         try:
-            payload = jwt.decode(token=token, key=cls.SECRET, algorithms=[cls.ALGORITHM])
+            payload = codec.decode(token) if codec is not None else None
+            if payload is None:
+                payload = jwt.decode(token=token, key=cls._get_key(), algorithms=[cls.ALGORITHM])
             return payload
         except Exception as e:
-            logger.info(f"Token decode error: {e}")
+            if is_logged:
+                logger.info(f"Token decode error: {e}")
             raise cls._get_auth_exception()
 
+    @classmethod
+    def _encode(cls, user_data: dict, token_type: TokenType, exp: int) -> str:
+        payload = {"user": user_data, "type": token_type.value, "exp": exp}
+        codec = cls._get_codec()
+        if codec is not None:
+            return codec.encode(payload)
+        return jwt.encode(payload, cls._get_key(), algorithm=cls.ALGORITHM)
+
+    @classmethod
+    def _get_expirations(cls) -> tuple[int, int]:
+        """Access and refresh token `exp` for tokens issued now."""
+        now = dt.datetime.now(dt.UTC)
+        access_exp = now + timedelta(minutes=cls.ACCESS_TOKEN_EXPIRES_MINUTES)
+        refresh_exp = now + timedelta(days=cls.REFRESH_TOKEN_EXPIRES_DAYS)
+        return int(access_exp.timestamp()), int(refresh_exp.timestamp())
+
     @classmethod
     def create_access_token(cls, data: dict) -> str:
         """Create a new access token with the given data."""
-        user_data = data.copy()
-        expire = dt.datetime.now(dt.UTC) + timedelta(minutes=cls.ACCESS_TOKEN_EXPIRES_MINUTES)
-        payload = {"user": user_data, "type": TokenType.ACCESS.value, "exp": expire}
-        encoded_jwt = jwt.encode(payload, cls.SECRET, algorithm=cls.ALGORITHM)
-        return encoded_jwt
+        access_exp, _ = cls._get_expirations()
+        return cls._encode(data.copy(), TokenType.ACCESS, access_exp)
 
     @classmethod
     def create_refresh_token(cls, data: dict) -> str:
         """Create a new refresh token with the given data."""
-        user_data = data.copy()
-        expire = dt.datetime.now(dt.UTC) + timedelta(days=cls.REFRESH_TOKEN_EXPIRES_DAYS)
-        payload = {"user": user_data, "type": TokenType.REFRESH.value, "exp": expire}
-        encoded_jwt = jwt.encode(payload, cls.SECRET, algorithm=cls.ALGORITHM)
-        return encoded_jwt
+        _, refresh_exp = cls._get_expirations()
+        return cls._encode(data.copy(), TokenType.REFRESH, refresh_exp)
 
     @classmethod
-    def create_token_pair(cls, uuid: str) -> TokenPair:
-        """Create a pair of access and refresh tokens for the given user UUID."""
-        access_sid: str = generate_str(size=6)
+    def _create_token_pair(cls, uuid: str, sid: Optional[str], access_exp: int, refresh_exp: int) -> TokenPair:
+        access_sid: str = sid or generate_str(size=6)
         refresh_sid: str = f"{generate_str(size=8)}#{access_sid}"
 
         access_token_payload = {
@@ -71,32 +111,95 @@ class DomainJWTService(AbstractBaseDomainService):
             "sid": refresh_sid,
         }
 
-        access_token = cls.create_access_token(access_token_payload)
-        refresh_token = cls.create_refresh_token(refresh_token_payload)
-
         return TokenPair(
-            access_token=access_token,
-            refresh_token=refresh_token,
+            access_token=cls._encode(access_token_payload, TokenType.ACCESS, access_exp),
+            refresh_token=cls._encode(refresh_token_payload, TokenType.REFRESH, refresh_exp),
+            sid=access_sid,
+            refresh_sid=refresh_sid,
         )
 
     @classmethod
-    def verify_access_token(cls, token: str) -> DecodedToken:
+    def create_token_pair(cls, uuid: str, sid: Optional[str] = None) -> TokenPair:
+        """Create a pair of access and refresh tokens for the given user UUID, `sid` keeps an existing session."""
+        access_exp, refresh_exp = cls._get_expirations()
+        return cls._create_token_pair(uuid, sid=sid, access_exp=access_exp, refresh_exp=refresh_exp)
+
+    @classmethod
+    def create_token_pairs(cls, uuids: List[str]) -> List[TokenPair]:
+        """Create token pairs for many users at once, expirations are computed once per batch."""
+        access_exp, refresh_exp = cls._get_expirations()
+        return [
+            cls._create_token_pair(uuid, sid=None, access_exp=access_exp, refresh_exp=refresh_exp)
+            for uuid in uuids
+        ]
+
+    @classmethod
+    def _get_token_cache_deadline(cls, payload: dict) -> float:
+        """Monotonic deadline matching the token's exp, never later than a fresh token's lifetime."""
+        ttl: float = cls.ACCESS_TOKEN_EXPIRES_MINUTES * 60
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            ttl = min(ttl, exp - time.time())
+        return time.monotonic() + ttl
+
+    @classmethod
+    def verify_access_token(cls, token: str, is_logged: bool = True) -> DecodedToken:
         """Verify an access token and return the decoded data."""
-        payload = cls._decode(token) or {}
+        cache_key = None
+        if cls.access_token_cache is not None:
+            cache_key = hashlib.sha256(token.encode("utf-8")).digest()
+            found, decoded = cls.access_token_cache.lookup(cache_key)
+            if found:
+                return decoded
+
+        payload = cls._decode(token, is_logged=is_logged) or {}
         token_type = payload.get("type", "") or ""
 
         if payload and token_type == TokenType.ACCESS.value:
-            return DecodedToken.from_payload(payload, TokenType.ACCESS)
+            decoded = DecodedToken.from_payload(payload, TokenType.ACCESS)
+            if cache_key is not None:
+                cls.access_token_cache.set(  # type: ignore
+                    cache_key, decoded, expires_at=cls._get_token_cache_deadline(payload)
+                )
+            return decoded
 
         raise cls._get_auth_exception()
 
     @classmethod
-    def verify_refresh_token(cls, token: str) -> DecodedToken:
+    def get_access_token_cache_stats(cls) -> dict:
+        """Hit/miss counters of the verified access token cache."""
+        if cls.access_token_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **cls.access_token_cache.stats()}
+
+    @classmethod
+    def get_session_sid(cls, decoded: DecodedToken) -> str:
+        """Session id of a token, refresh sids are `<refresh part>#<access sid>`"""
+        return decoded.sid.rsplit("#", 1)[-1]
+
+    @classmethod
+    def verify_refresh_token(cls, token: str, is_logged: bool = True) -> DecodedToken:
         """Verify a refresh token and return the decoded data."""
-        payload = cls._decode(token) or {}
+        payload = cls._decode(token, is_logged=is_logged) or {}
         token_type = payload.get("type", "") or ""
 
         if payload and token_type == TokenType.REFRESH.value:
             return DecodedToken.from_payload(payload, TokenType.REFRESH)
 
         raise cls._get_auth_exception()
+
+    @classmethod
+    def verify_tokens(cls, tokens: List[str], token_type: TokenType) -> List[Optional[DecodedToken]]:
+        """Verify many tokens at once, invalid ones are returned as None in place."""
+        verify = cls.verify_access_token if token_type == TokenType.ACCESS else cls.verify_refresh_token
+        results: List[Optional[DecodedToken]] = []
+        for token in tokens:
+            try:
+                results.append(verify(token, is_logged=False))
+            except AuthenticationError:
+                results.append(None)
+
+        invalid_count = results.count(None)
+        if invalid_count:
+            logger.info(f"Token batch decode: {invalid_count} of {len(tokens)} invalid")
+        return results
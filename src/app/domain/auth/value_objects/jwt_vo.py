@@ -31,6 +31,8 @@ class TokenPair:
 
     access_token: str
     refresh_token: str
+    sid: str = ""
+    refresh_sid: str = ""
 
     def to_dict(self) -> dict:
         return {
@@ -52,3 +52,15 @@ class AuthorizationError(AppException):
     """Insufficient permissions"""
 
     pass
+
+
+class TooManyRequestsError(AppException):
+    """Rate limit exceeded"""
+
+    pass
+
+
+class ServiceUnavailableError(AppException):
+    """Service is temporarily overloaded or unavailable"""
+
+    pass
@@ -0,0 +1,48 @@
+import hashlib
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    """
+    Compact probabilistic set: no false negatives, false positives at about `error_rate`.
+
+    Bit positions come from double hashing of a single blake2b digest, so a
+    membership test costs one hash regardless of the number of hash functions.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be greater than 0")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    @classmethod
+    def from_items(cls, items: Iterable[str], capacity: int, error_rate: float = 0.001) -> "BloomFilter":
+        bloom_filter = cls(capacity=capacity, error_rate=error_rate)
+        for item in items:
+            bloom_filter.add(item)
+        return bloom_filter
+
+    def _get_positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._get_positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._get_positions(item))
+
+    def __len__(self) -> int:
+        return self.count
@@ -0,0 +1,84 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    """
+    Bounded in-process LRU cache with optional per-entry expiration.
+
+    Expiration uses `time.monotonic()` by default; the least recently used
+    entry is evicted once `max_size` is reached. Hit/miss counters are kept
+    for observability.
+    """
+
+    def __init__(self, max_size: int, default_ttl: Optional[float] = None) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than 0")
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._items: OrderedDict[Hashable, Tuple[Any, Optional[float]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.lookup(key, count=False)[0]
+
+    def lookup(self, key: Hashable, now: Optional[float] = None, count: bool = True) -> Tuple[bool, Any]:
+        """Return `(found, value)` for the key, dropping it if expired."""
+        item = self._items.get(key)
+        if item is not None:
+            value, expires_at = item
+            if expires_at is None or expires_at > (now if now is not None else time.monotonic()):
+                self._items.move_to_end(key)
+                if count:
+                    self.hits += 1
+                return True, value
+            del self._items[key]
+        if count:
+            self.misses += 1
+        return False, None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        found, value = self.lookup(key)
+        return value if found else default
+
+    def set(
+        self, key: Hashable, value: Any, ttl: Optional[float] = None, expires_at: Optional[float] = None
+    ) -> None:
+        """Store value; `expires_at` is an absolute monotonic deadline and wins over `ttl`."""
+        if expires_at is None:
+            ttl_ = ttl if ttl is not None else self.default_ttl
+            expires_at = time.monotonic() + ttl_ if ttl_ is not None else None
+
+        if key in self._items:
+            self._items.move_to_end(key)
+        self._items[key] = (value, expires_at)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        return self._items.pop(key, None) is not None
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._items),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
@@ -0,0 +1,74 @@
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.app.domain.common.exceptions import ServiceUnavailableError
+
+
+class BoundedExecutor:
+    """
+    Runs blocking callables on a thread or process pool with a bounded backlog.
+
+    At most `max_workers + queue_size` calls are accepted at once; further calls
+    fail fast with ServiceUnavailableError instead of queueing without limit.
+    Process pools use the "spawn" start method, so callables must be importable
+    module level functions.
+    """
+
+    def __init__(self, name: str, max_workers: int, queue_size: int, use_processes: bool = False) -> None:
+        if max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
+        self.name = name
+        self.max_workers = max_workers
+        self.queue_size = max(0, queue_size)
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self.rejected = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.queue_size
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+        return self._executor
+
+    async def run(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        if self._pending >= self.capacity:
+            self.rejected += 1
+            raise ServiceUnavailableError(
+                message="Service is busy, try again later",
+                details=[{"key": "executor", "value": self.name}],
+                extra={"headers": {"Retry-After": "1"}},
+            )
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), functools.partial(func, *args, **kwargs))
+        finally:
+            self._pending -= 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._pending,
+            "capacity": self.capacity,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,218 @@
+import asyncio
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric:
+    """Base of in-process metrics, values are kept per combination of label values"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _get_label_values(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[i]) for i in self.labelnames)
+
+    def _render_labels(self, label_values: LabelValues, extra: Optional[Dict[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, label_values)) + list((extra or {}).items())
+        if not pairs:
+            return ""
+        escaped = (f'{k}="{escape_label_value(v)}"' for k, v in pairs)
+        return "{" + ",".join(escaped) + "}"
+
+    def render(self) -> List[str]:
+        """Lines of the metric in Prometheus text exposition format"""
+        documentation = self.documentation.replace("\\", "\\\\").replace("\n", "\\n")
+        return [f"# HELP {self.name} {documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Gauge(Metric):
+    """Value that goes up and down, e.g. messages in flight"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._get_label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._get_label_values(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._get_label_values(labels), 0.0)
+
+    def collect(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for label_values, value in sorted(self.collect().items()):
+            lines.append(f"{self.name}{self._render_labels(label_values)} {format_value(value)}")
+        return lines
+
+
+class Counter(Gauge):
+    """Value that only goes up, e.g. handled messages, rates come from `rate()` on the Prometheus side"""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError(f"{self.name} can only be increased")
+        super().inc(amount, **labels)
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        raise ValueError(f"{self.name} can only be increased")
+
+    def set(self, value: float, **labels: str) -> None:
+        raise ValueError(f"{self.name} can only be increased")
+
+
+class Histogram(Metric):
+    """Distribution of observed values over cumulative buckets, e.g. handler latency in seconds"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}  # bucket counts, sum, count
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._get_label_values(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key) or self._get_empty()
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def _get_empty(self) -> Tuple[List[int], float, int]:
+        return [0] * len(self.buckets), 0.0, 0
+
+    def get(self, **labels: str) -> Tuple[List[int], float, int]:
+        counts, total, count = self._values.get(self._get_label_values(labels)) or self._get_empty()
+        return list(counts), total, count
+
+    def collect(self) -> Dict[LabelValues, Tuple[List[int], float, int]]:
+        with self._lock:
+            return {key: (list(counts), total, count) for key, (counts, total, count) in self._values.items()}
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for label_values, (counts, total, count) in sorted(self.collect().items()):
+            for bound, bucket_count in zip((*self.buckets, float("inf")), (*counts, count)):
+                labels = self._render_labels(label_values, {"le": format_value(bound)})
+                lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+            lines.append(f"{self.name}_sum{self._render_labels(label_values)} {format_value(total)}")
+            lines.append(f"{self.name}_count{self._render_labels(label_values)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide metrics by name, getters return the already registered metric"""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is None:
+                self._metrics[metric.name] = metric
+                return metric
+        if type(existing) is not type(metric):
+            raise ValueError(f"Metric {metric.name} is already registered as {existing.type_name}")
+        return existing
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge(name, documentation, labelnames))  # type: ignore
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter(name, documentation, labelnames))  # type: ignore
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None,
+    ) -> Histogram:
+        histogram = Histogram(name, documentation, labelnames, buckets=buckets or DEFAULT_BUCKETS)
+        return self._get_or_create(histogram)  # type: ignore
+
+    def get_metrics(self) -> List[Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format 0.0.4"""
+        return "".join(f"{line}\n" for metric in self.get_metrics() for line in metric.render())
+
+
+metrics_registry = MetricsRegistry()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def start_metrics_server(port: int, host: str = "0.0.0.0") -> asyncio.Server:
+    """
+    Minimal HTTP server answering every request with `metrics_registry` for
+    processes without an API, e.g. consumers. Runs in the current event loop.
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+            body = metrics_registry.render().encode()
+            head = f"HTTP/1.1 200 OK\r\nContent-Type: {PROMETHEUS_CONTENT_TYPE}\r\n"
+            writer.write(f"{head}Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError) as ex:
+            logger.debug(f"Metrics request failed. Reason: {ex}")
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    logger.info(f"Metrics are served on {host}:{port}")
+    return server
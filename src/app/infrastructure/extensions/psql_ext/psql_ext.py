@@ -74,6 +74,17 @@ async def get_session(
         await session.close()
 
 
+@asynccontextmanager
+async def get_transaction(
+    expire_on_commit: bool = False,
+    isolation_level: str | None = None,
+) -> AsyncGenerator:
+    """Session committed on exit, lets several repository writes share one transaction"""
+    async with get_session(expire_on_commit=expire_on_commit, isolation_level=isolation_level) as session:
+        yield session
+        await session.commit()
+
+
 sync_engine = create_engine(settings.DB_URL_SYNC)
 autocommit_engine = sync_engine.execution_options(isolation_level="AUTOCOMMIT")
 autocommit_session = sessionmaker(autocommit_engine)
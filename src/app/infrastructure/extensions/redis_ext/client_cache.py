@@ -0,0 +1,177 @@
+import asyncio
+from typing import Any, List, Optional, Sequence, Tuple
+
+import redis.asyncio as redis
+from loguru import logger
+from redis.asyncio.connection import AbstractConnection
+
+from src.app.domain.common.utils.cache import LRUCache
+
+INVALIDATION_CHANNEL = "__redis__:invalidate"
+
+
+class RedisClientSideCache:
+    """
+    Process-local copy of read-mostly Redis keys kept coherent by the server.
+
+    Relies on CLIENT TRACKING in broadcasting mode: Redis pushes an invalidation
+    message for every modified key matching one of `prefixes` to a dedicated
+    connection subscribed to `__redis__:invalidate` (RESP2 redirect). Local values
+    are served only while that listener is connected, otherwise reads fall
+    through to Redis. Any invalidation received while a read is in flight
+    prevents that read from being stored locally.
+    """
+
+    RECONNECT_TIMEOUT: float = 1.0
+    IDLE_PING_INTERVAL: float = 15.0
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        prefixes: Sequence[str],
+        max_size: int,
+        ttl: Optional[float] = None,
+    ) -> None:
+        if not prefixes:
+            raise ValueError("At least one key prefix is required for client side caching")
+        self.client = client
+        self.prefixes: Tuple[str, ...] = tuple(prefixes)
+        self.invalidations = 0
+        self._cache = LRUCache(max_size=max_size, default_ttl=ttl)
+        self._epoch = 0
+        self._is_ready = False
+        self._listener_task: Optional[asyncio.Task] = None
+        self._listener_connection: Optional[AbstractConnection] = None
+        self._tracking_connection: Optional[AbstractConnection] = None
+        _instances.append(self)
+
+    @property
+    def is_ready(self) -> bool:
+        return self._is_ready
+
+    def is_tracked(self, key: str) -> bool:
+        return key.startswith(self.prefixes)
+
+    def ensure_started(self) -> None:
+        """Start invalidation listener in the running event loop (no-op if already running)."""
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.get_running_loop().create_task(self._listen())
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        if not self._is_ready:
+            return False, None
+        return self._cache.lookup(key)
+
+    def begin_fetch(self) -> Optional[int]:
+        """Token to pass to `store` after reading the key from Redis."""
+        return self._epoch if self._is_ready else None
+
+    def store(self, key: str, value: Any, token: Optional[int]) -> None:
+        if token is not None and self._is_ready and token == self._epoch:
+            self._cache.set(key, value)
+
+    def evict(self, keys: List[str]) -> None:
+        self._epoch += 1
+        for key in keys:
+            self._cache.delete(key)
+
+    def stats(self) -> dict:
+        return {**self._cache.stats(), "invalidations": self.invalidations, "is_ready": self._is_ready}
+
+    async def close(self) -> None:
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        await self._disconnect()
+
+    # ==========================================
+    # INVALIDATION LISTENER
+    # ==========================================
+
+    async def _connect(self) -> None:
+        pool = self.client.connection_pool
+
+        listener = pool.make_connection()
+        await listener.connect()
+        await listener.send_command("CLIENT", "ID")
+        listener_id = await listener.read_response()
+        await listener.send_command("SUBSCRIBE", INVALIDATION_CHANNEL)
+        await listener.read_response()
+        self._listener_connection = listener
+
+        # Tracking state belongs to the connection that enabled it, so keep it open
+        tracking = pool.make_connection()
+        await tracking.connect()
+        tracking_args: List[Any] = ["CLIENT", "TRACKING", "ON", "REDIRECT", listener_id, "BCAST"]
+        for prefix in self.prefixes:
+            tracking_args.extend(["PREFIX", prefix])
+        await tracking.send_command(*tracking_args)
+        await tracking.read_response()
+        self._tracking_connection = tracking
+
+    async def _disconnect(self) -> None:
+        for connection in (self._listener_connection, self._tracking_connection):
+            if connection is not None:
+                try:
+                    await connection.disconnect()
+                except Exception as ex:  # noqa
+                    logger.debug(f"Client side cache disconnect error: {ex}")
+        self._listener_connection = None
+        self._tracking_connection = None
+
+    def _reset(self) -> None:
+        self._is_ready = False
+        self._epoch += 1
+        self._cache.clear()
+
+    def _handle_message(self, message: Any) -> None:
+        if not isinstance(message, list) or len(message) < 3 or message[0] != b"message":
+            return
+        self.invalidations += 1
+        keys = message[2]
+        if keys is None:
+            # FLUSHALL / FLUSHDB or tracking table overflow
+            self._epoch += 1
+            self._cache.clear()
+            return
+        self.evict([key.decode("utf-8") if isinstance(key, bytes) else str(key) for key in keys])
+
+    async def _ping(self) -> None:
+        assert self._listener_connection is not None and self._tracking_connection is not None
+        await self._listener_connection.send_command("PING")
+        await self._tracking_connection.send_command("PING")
+        await self._tracking_connection.read_response()
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                await self._connect()
+                self._is_ready = True
+                logger.info(f"Redis client side cache tracking {', '.join(self.prefixes)}")
+                while True:
+                    assert self._listener_connection is not None
+                    message = await self._listener_connection.read_response(timeout=self.IDLE_PING_INTERVAL)
+                    if message is None:
+                        await self._ping()
+                        continue
+                    self._handle_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logger.warning(f"Redis client side cache listener error! Local copy dropped. {ex}")
+            finally:
+                self._reset()
+                await self._disconnect()
+            await asyncio.sleep(self.RECONNECT_TIMEOUT)
+
+
+_instances: List[RedisClientSideCache] = []
+
+
+async def close_client_side_caches() -> None:
+    for instance in _instances:
+        await instance.close()
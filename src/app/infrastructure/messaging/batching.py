@@ -0,0 +1,70 @@
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Set
+
+
+class MessageBatcher:
+    """
+    Accumulates consumed messages into batches of up to `batch_size` items or
+    `batch_timeout_ms` since the first one, whichever comes first.
+
+    `submit` returns once the batch holding the message is handled and raises
+    if it failed, so brokers ack/commit a message only after its batch succeeds.
+    Batches are handled one at a time in the order they were formed.
+    """
+
+    def __init__(
+        self,
+        flush_handler: Callable[[List[dict]], Awaitable[None]],
+        batch_size: int,
+        batch_timeout_ms: int,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be greater than 0")
+        self.flush_handler = flush_handler
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout_ms / 1000
+
+        self._items: List[dict] = []
+        self._futures: List[asyncio.Future] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: dict) -> None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._items.append(item)
+        self._futures.append(future)
+        if len(self._items) >= self.batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.batch_timeout, self.flush)
+        await future
+
+    def flush(self) -> None:
+        """Hand over accumulated messages without waiting for the batch to be handled"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._items:
+            return None
+        items, futures = self._items, self._futures
+        self._items, self._futures = [], []
+        task = asyncio.create_task(self._handle(items, futures))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _handle(self, items: List[dict], futures: List[asyncio.Future]) -> None:
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            try:
+                await self.flush_handler(items)
+            except Exception as ex:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(ex)
+            else:
+                for future in futures:
+                    if not future.done():
+                        future.set_result(None)
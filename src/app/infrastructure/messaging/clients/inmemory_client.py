@@ -0,0 +1,174 @@
+import asyncio
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from src.app.config.settings import settings
+from src.app.infrastructure.messaging.retries import (
+    FailedMessages,
+    get_replay_body,
+    get_undecodable,
+    route_failed,
+)
+
+
+class InMemoryPartition:
+    """
+    Messages of an exchanger queue. Every consumer group has its own asyncio
+    queue of them, consumers of a group compete for its messages. Messages
+    produced before any group subscribed wait for the first one.
+    """
+
+    def __init__(self) -> None:
+        self.groups: Dict[str, asyncio.Queue] = {}
+        self.dead_letters: Dict[str, List[bytes]] = {}
+        self._pending: List[bytes] = []
+
+    def get_group_queue(self, group_id: str) -> asyncio.Queue:
+        queue = self.groups.get(group_id)
+        if queue is None:
+            queue = self.groups[group_id] = asyncio.Queue()
+            for body in self._pending:
+                queue.put_nowait(body)
+            self._pending = []
+        return queue
+
+    def put(self, bodies: List[bytes]) -> None:
+        if not self.groups:
+            self._pending.extend(bodies)
+            return None
+        for queue in self.groups.values():
+            for body in bodies:
+                queue.put_nowait(body)
+
+
+class InMemoryBrokerClient:
+    """
+    Broker living in the process, for local runs, tests and benchmarks.
+
+    Clients created with the same URL share exchangers and their queues, so a
+    producing and a consuming MQClientProxy can talk to each other. Messages go
+    through JSON like with network brokers and nothing is persisted.
+    """
+
+    _brokers: Dict[str, Dict[str, Dict[str, InMemoryPartition]]] = {}  # url -> exchanger -> queue -> partition
+
+    def __init__(self, message_broker_url: str) -> None:
+        self.message_broker_url = message_broker_url
+        self.exchangers = self._brokers.setdefault(message_broker_url, {})
+
+    async def is_healthy(self) -> bool:
+        return True
+
+    async def close(self) -> None:
+        return None
+
+    def get_partition(self, exchanger_name: str, queue_name: str | int) -> InMemoryPartition:
+        queues = self.exchangers.setdefault(exchanger_name, {})
+        return queues.setdefault(str(queue_name), InMemoryPartition())
+
+    @staticmethod
+    def get_group_id(exchanger_name: str, queue_name: str | int) -> str:
+        return f"GROUP_#_{exchanger_name}_#_{queue_name}"
+
+    async def produce_messages(
+        self, messages: List[dict], queue_name: str | int, exchanger_name: str, **kwargs: Any
+    ) -> None:
+        bodies = [json.dumps(message, ensure_ascii=False).encode() for message in messages]
+        self.get_partition(exchanger_name, queue_name).put(bodies)
+
+    async def get_backlog(self, queues: List[str | int], exchanger_name: str, **kwargs: Any) -> Dict[str, int]:
+        backlog = {}
+        for queue_name in queues:
+            group_id = kwargs.get("group_id") or self.get_group_id(exchanger_name, queue_name)
+            group_queue = self.get_partition(exchanger_name, queue_name).groups.get(group_id)
+            backlog[str(queue_name)] = group_queue.qsize() if group_queue is not None else 0
+        return backlog
+
+    async def consume(
+        self,
+        queues: List[str | int],
+        exchanger_name: str,
+        aggregator: Callable,
+        handlers_by_event: dict,
+        **kwargs: Any,
+    ) -> None:
+        """Runs `workers` handlers per queue until cancelled, `group_id` picks the consumer group"""
+        workers_count = max(
+            kwargs.get("workers") or 1, kwargs.get("min_workers", 1), kwargs.get("min_in_flight", 1)
+        )
+        tasks = []
+        for queue_name in queues:
+            group_id = kwargs.get("group_id") or self.get_group_id(exchanger_name, queue_name)
+            partition = self.get_partition(exchanger_name, queue_name)
+            group_queue = partition.get_group_queue(group_id)
+            for _ in range(workers_count):
+                tasks.append(
+                    asyncio.create_task(
+                        self.__work(partition, group_id, group_queue, aggregator, handlers_by_event)
+                    )
+                )
+        logger.info(f"Queue {'|'.join(str(i) for i in queues)}|{exchanger_name} in-memory consume starting..")
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __work(
+        self,
+        partition: InMemoryPartition,
+        group_id: str,
+        group_queue: asyncio.Queue,
+        aggregator: Callable,
+        handlers_by_event: dict,
+    ) -> None:
+        while True:
+            body = await group_queue.get()
+            try:
+                await self.__callback(partition, group_id, group_queue, body, aggregator, handlers_by_event)
+            finally:
+                group_queue.task_done()
+
+    async def __callback(
+        self,
+        partition: InMemoryPartition,
+        group_id: str,
+        group_queue: asyncio.Queue,
+        body: bytes,
+        aggregator: Callable,
+        handlers_by_event: dict,
+    ) -> None:
+        try:
+            message_json = json.loads(body.decode("utf-8")) or {}
+        except ValueError as ex:
+            logger.warning(f"Got message with incorrect data! {ex}")
+            failed: Optional[FailedMessages] = FailedMessages(delayed={}, dead=[get_undecodable(body, ex)])
+        else:
+            failed = None
+            try:
+                await aggregator(message_json, handlers_by_event)
+            except Exception as ex:
+                logger.warning(f"Message handling failed! {ex}")
+                failed = route_failed([message_json], ex, handlers_by_event)
+        if failed is None or not settings.CONSUMER_RETRY_ENABLED:
+            return None
+        loop = asyncio.get_running_loop()
+        for delay_ms, messages in failed.delayed.items():
+            for message in messages:
+                loop.call_later(delay_ms / 1000, group_queue.put_nowait, json.dumps(message).encode())
+        partition.dead_letters.setdefault(group_id, []).extend(json.dumps(i).encode() for i in failed.dead)
+
+    async def replay_dead_letters(
+        self, exchanger_name: str, queue_name: str | int, limit: int, **kwargs: Any
+    ) -> int:
+        group_id = kwargs.get("group_id") or self.get_group_id(exchanger_name, queue_name)
+        partition = self.get_partition(exchanger_name, queue_name)
+        dead_letters = partition.dead_letters.get(group_id, [])
+        replayed, partition.dead_letters[group_id] = dead_letters[:limit], dead_letters[limit:]
+        group_queue = partition.get_group_queue(group_id)
+        for body in replayed:
+            group_queue.put_nowait(get_replay_body(json.loads(body)))
+        return len(replayed)
@@ -1,8 +1,23 @@
+import asyncio
 import json
-import datetime as dt
-from typing import Callable, List
+import time
+from typing import Any, Callable, Dict, List, Optional
 from loguru import logger
-from aiokafka import AIOKafkaConsumer, AIOKafkaProducer, ConsumerRecord, TopicPartition, AIOKafkaClient
+from aiokafka import AIOKafkaConsumer, AIOKafkaProducer, ConsumerRecord, TopicPartition
+
+from src.app.config.settings import settings
+from src.app.infrastructure.messaging.clients.kafka_consumer_engine import KafkaConsumerEngine
+from src.app.infrastructure.messaging.retries import (
+    ORIGIN_PARTITION_FIELD,
+    RETRY_AT_FIELD,
+    FailedMessages,
+    get_dead_letter_queue_name,
+    get_replay_body,
+    get_retry_delays_ms,
+    get_retry_queue_name,
+    get_undecodable,
+    route_failed,
+)
 
 
 class KafkaClient:
@@ -10,42 +25,88 @@ class KafkaClient:
 
     __request_timeout_ms = 1000 * 50  # 50 seconds
     __retry_backoff_ms = 1000 * 20  # 10 seconds
+    __failed_publish_backoff_seconds = 5
+    __replay_poll_timeout_ms = 1000 * 5  # first poll waits for the group join
+
+    __producer: Optional[AIOKafkaProducer]
+    __producer_loop: Optional[asyncio.AbstractEventLoop]
+    __producer_lock: Optional[asyncio.Lock]
 
-    def __init__(self, message_broker_url: str) -> None:
+    def __init__(
+        self,
+        message_broker_url: str,
+        linger_ms: int = settings.KAFKA_PRODUCER_LINGER_MS,
+        max_batch_size: int = settings.KAFKA_PRODUCER_MAX_BATCH_SIZE,
+        compression_type: Optional[str] = settings.KAFKA_PRODUCER_COMPRESSION_TYPE or None,
+    ) -> None:
         self.message_broker_url = message_broker_url
+        self.linger_ms = linger_ms
+        self.max_batch_size = max_batch_size
+        self.compression_type = compression_type
+        self.__producer = None
+        self.__producer_loop = None
+        self.__producer_lock = None
+        self.__lag_consumers: Dict[str, AIOKafkaConsumer] = {}
 
     async def is_healthy(self) -> bool:
-        client = AIOKafkaClient(bootstrap_servers=self.message_broker_url)
+        """Metadata refresh over the shared producer's connections"""
         try:
-            await client.bootstrap()
-            metadata = await client.fetch_all_metadata()
-            # Check if brokers is a method or property
-            brokers = metadata.brokers() if callable(metadata.brokers) else metadata.brokers
-            return len(brokers) > 0
+            async with asyncio.timeout(settings.MESSAGE_BROKER_HEALTH_CHECK_TIMEOUT_SECONDS):
+                producer = await self.__get_producer()
+                is_updated = await producer.client.force_metadata_update()
+            return bool(is_updated) and len(producer.client.cluster.brokers()) > 0
         except Exception as ex:
-            logger.warning(f"{ex}")
+            logger.warning(f"{type(ex).__name__}: {ex}")
             return False
-        finally:
-            await client.close()
 
-    async def produce_messages(self, topic: str, partition: int, messages: List[dict], **kwargs: dict) -> None:
-        producer = AIOKafkaProducer(
-            bootstrap_servers=self.message_broker_url,
-            request_timeout_ms=self.__request_timeout_ms,
-            retry_backoff_ms=self.__retry_backoff_ms,
-        )
-        await producer.start()
-        try:
-            for message in messages:
-                message_ = json.dumps(message, ensure_ascii=False)
-                await producer.send_and_wait(
-                    topic=topic,
-                    partition=partition,
-                    timestamp_ms=dt.datetime.now(dt.UTC).timestamp(),
-                    value=message_.encode(),
+    async def __get_producer(self) -> AIOKafkaProducer:
+        """Shared producer, started on first use and bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self.__producer is not None and self.__producer_loop is loop:
+            return self.__producer
+        if self.__producer_loop is not loop:
+            # Producer of a previous loop cannot be stopped from this one, let it go
+            self.__producer = None
+            self.__producer_loop = loop
+            self.__producer_lock = asyncio.Lock()
+
+        async with self.__producer_lock:  # type: ignore
+            if self.__producer is None:
+                producer = AIOKafkaProducer(
+                    bootstrap_servers=self.message_broker_url,
+                    request_timeout_ms=self.__request_timeout_ms,
+                    retry_backoff_ms=self.__retry_backoff_ms,
+                    linger_ms=self.linger_ms,
+                    max_batch_size=self.max_batch_size,
+                    compression_type=self.compression_type,
                 )
-        finally:
+                await producer.start()
+                self.__producer = producer
+        return self.__producer
+
+    async def close(self) -> None:
+        producer, self.__producer = self.__producer, None
+        if producer is not None and self.__producer_loop is asyncio.get_running_loop():
             await producer.stop()
+        lag_consumers, self.__lag_consumers = self.__lag_consumers, {}
+        for consumer in lag_consumers.values():
+            await consumer.stop()
+
+    async def produce_messages(self, topic: str, partition: int, messages: List[dict], **kwargs: dict) -> None:
+        await self.__send(
+            topic, partition, [json.dumps(message, ensure_ascii=False).encode() for message in messages]
+        )
+
+    async def __send(self, topic: str, partition: Optional[int], values: List[bytes]) -> None:
+        """Sends values to the partition, or spread by the partitioner if it is None"""
+        producer = await self.__get_producer()
+        timestamp_ms = int(time.time() * 1000)
+        deliveries = []
+        for value in values:
+            deliveries.append(
+                await producer.send(topic=topic, partition=partition, timestamp_ms=timestamp_ms, value=value)
+            )
+        await asyncio.gather(*deliveries)
 
     async def __callback(self, message: ConsumerRecord, aggregator: Callable, handlers_by_event: dict) -> None:
         """
@@ -61,14 +122,211 @@ class KafkaClient:
                 f"Got message with incorrect data! {e} " f"[{message.topic}*{message.partition}*{message.offset}]"
             )
 
+    async def __callback_with_retry(
+        self, message: ConsumerRecord, aggregator: Callable, handlers_by_event: dict
+    ) -> None:
+        """
+        Callback for partition consuming with retries
+        A failed message goes to the retry topic of its next attempt or to the
+        dead-letter topic before its offset is committed
+        """
+        try:
+            message_json = json.loads(message.value.decode("utf-8")) or {}
+        except ValueError as ex:
+            logger.warning(
+                f"Got message with incorrect data! {ex} [{message.topic}*{message.partition}*{message.offset}]"
+            )
+            failed = FailedMessages(delayed={}, dead=[get_undecodable(message.value, ex)])
+            return await self.__publish_failed(message.topic, message.partition, failed)
+        try:
+            await aggregator(message_json, handlers_by_event)
+        except Exception as ex:
+            logger.warning(f"Message handling failed! {ex} [{message.topic}*{message.partition}*{message.offset}]")
+            failed = route_failed([message_json], ex, handlers_by_event)
+            await self.__publish_failed(message.topic, message.partition, failed)
+
+    async def __publish_failed(self, topic: str, partition: int, failed: FailedMessages) -> None:
+        """Retried until published, the lane waits meanwhile and the offset is not committed"""
+        retry_at_ms = int(time.time() * 1000)
+        while True:
+            try:
+                for delay_ms, messages in failed.delayed.items():
+                    values = [
+                        self.__dumps(
+                            {**i, RETRY_AT_FIELD: retry_at_ms + delay_ms, ORIGIN_PARTITION_FIELD: partition}
+                        )
+                        for i in messages
+                    ]
+                    await self.__send(get_retry_queue_name(topic, delay_ms), None, values)
+                if failed.dead:
+                    values = [self.__dumps({**i, ORIGIN_PARTITION_FIELD: partition}) for i in failed.dead]
+                    await self.__send(get_dead_letter_queue_name(topic), None, values)
+                return None
+            except Exception as ex:
+                logger.error(f"Failed messages are not published, retrying. Reason: {ex}")
+                await asyncio.sleep(self.__failed_publish_backoff_seconds)
+
+    @staticmethod
+    def __dumps(message: dict) -> bytes:
+        return json.dumps(message, ensure_ascii=False).encode()
+
+    def __get_service_consumer(self, topic: str, group_id: str) -> AIOKafkaConsumer:
+        """Consumer of retry and dead-letter topics, all their partitions and from the beginning"""
+        return AIOKafkaConsumer(
+            topic,
+            group_id=group_id,
+            bootstrap_servers=self.message_broker_url,
+            auto_offset_reset="earliest",
+            enable_auto_commit=False,
+            request_timeout_ms=self.__request_timeout_ms,
+            retry_backoff_ms=self.__retry_backoff_ms,
+        )
+
+    async def __forward_retries(self, topic: str, delay_ms: int) -> None:
+        """
+        Moves due messages of a retry topic back to their partition. Messages of
+        a retry topic share the delay, so they become due in the order they came.
+        A partition waiting for its next message is paused rather than slept on,
+        the consumer keeps polling and stays in its group. Failures are retried
+        from the committed offsets until the messages are forwarded.
+        """
+        retry_topic = get_retry_queue_name(topic, delay_ms)
+        consumer = self.__get_service_consumer(retry_topic, group_id=f"GROUP_#_{retry_topic}")
+        await consumer.start()
+        resume_at: Dict[TopicPartition, float] = {}
+        is_rewind_required = False
+        try:
+            while True:
+                try:
+                    if is_rewind_required:
+                        await consumer.seek_to_committed()
+                        is_rewind_required = False
+                    self.__resume_due(consumer, resume_at)
+                    batches = await consumer.getmany(timeout_ms=1000)
+                    for tp, messages in batches.items():
+                        await self.__forward_partition(consumer, topic, tp, messages, resume_at)
+                except Exception as ex:
+                    logger.error(f"Retries of {retry_topic} are not forwarded, retrying. Reason: {ex}")
+                    is_rewind_required = True
+                    await asyncio.sleep(self.__failed_publish_backoff_seconds)
+        finally:
+            await consumer.stop()
+
+    @staticmethod
+    def __resume_due(consumer: AIOKafkaConsumer, resume_at: Dict[TopicPartition, float]) -> None:
+        for tp, at in list(resume_at.items()):
+            if at <= time.time():
+                consumer.resume(tp)
+                del resume_at[tp]
+
+    async def __forward_partition(
+        self,
+        consumer: AIOKafkaConsumer,
+        topic: str,
+        tp: TopicPartition,
+        messages: List[ConsumerRecord],
+        resume_at: Dict[TopicPartition, float],
+    ) -> None:
+        """Forwards due messages, the partition is paused at the first one not due yet"""
+        forwarded = 0
+        for message in messages:
+            retry_at = await self.__forward(topic, message)
+            if retry_at is not None:
+                consumer.seek(tp, message.offset)
+                consumer.pause(tp)
+                resume_at[tp] = retry_at
+                break
+            forwarded += 1
+        if forwarded:
+            await consumer.commit({tp: messages[forwarded - 1].offset + 1})
+
+    async def __forward(self, topic: str, message: ConsumerRecord) -> Optional[float]:
+        """Sends a due message to its partition, dead-letters an undecodable one. Returns due time if not due"""
+        try:
+            message_json = json.loads(message.value.decode("utf-8"))
+            if not isinstance(message_json, dict):
+                raise ValueError("Message is not an object")
+            retry_at = float(message_json.pop(RETRY_AT_FIELD, 0)) / 1000
+        except (ValueError, TypeError) as ex:
+            logger.warning(
+                f"Got retry with incorrect data! {ex} [{message.topic}*{message.partition}*{message.offset}]"
+            )
+            await self.__send(
+                get_dead_letter_queue_name(topic), None, [self.__dumps(get_undecodable(message.value, ex))]
+            )
+            return None
+        if retry_at > time.time():
+            return retry_at
+        partition = message_json.pop(ORIGIN_PARTITION_FIELD, None)
+        await self.__send(topic, partition, [self.__dumps(message_json)])
+        return None
+
+    async def replay_dead_letters(self, topic: str, limit: int, **kwargs: Any) -> int:
+        """Moves up to `limit` dead letters of the topic back to their partitions"""
+        dead_letter_topic = get_dead_letter_queue_name(topic)
+        consumer = self.__get_service_consumer(dead_letter_topic, group_id=f"GROUP_#_{dead_letter_topic}_#_replay")
+        await consumer.start()
+        replayed = 0
+        try:
+            while replayed < limit:
+                batches = await consumer.getmany(
+                    timeout_ms=self.__replay_poll_timeout_ms, max_records=min(500, limit - replayed)
+                )
+                values_by_partition: Dict[Optional[int], List[bytes]] = {}
+                for messages in batches.values():
+                    for message in messages:
+                        message_json = json.loads(message.value.decode("utf-8"))
+                        partition = message_json.get(ORIGIN_PARTITION_FIELD)
+                        values_by_partition.setdefault(partition, []).append(get_replay_body(message_json))
+                if not values_by_partition:
+                    break
+                for partition, values in values_by_partition.items():
+                    await self.__send(topic, partition, values)
+                await consumer.commit()
+                replayed += sum(len(i) for i in values_by_partition.values())
+        finally:
+            await consumer.stop()
+        return replayed
+
+    @staticmethod
+    def get_group_id(topic: str, partitions: List[int]) -> str:
+        return f"GROUP_#_{topic}_#_{'*'.join(str(i) for i in partitions)}"
+
+    async def get_backlog(self, topic: str, partitions: List[int], **kwargs: Any) -> Dict[str, int]:
+        """Consumer lag by partition, end offset minus the offset committed by the consumer group"""
+        group_id = self.get_group_id(topic, partitions)
+        consumer = self.__lag_consumers.get(group_id)
+        if consumer is None:
+            consumer = AIOKafkaConsumer(
+                group_id=group_id,
+                bootstrap_servers=self.message_broker_url,
+                enable_auto_commit=False,
+                request_timeout_ms=self.__request_timeout_ms,
+            )
+            await consumer.start()
+            self.__lag_consumers[group_id] = consumer
+        partitions_ = [TopicPartition(topic, partition) for partition in partitions]
+        end_offsets = await consumer.end_offsets(partitions_)
+        beginning_offsets = await consumer.beginning_offsets(partitions_)
+        backlog = {}
+        for tp in partitions_:
+            committed = await consumer.committed(tp)
+            backlog[str(tp.partition)] = max(0, end_offsets[tp] - (committed or beginning_offsets[tp]))
+        return backlog
+
     async def consume(
-        self, topic: str, partitions: List[int], aggregator: Callable, handlers_by_event: dict, **kwargs: dict
+        self, topic: str, partitions: List[int], aggregator: Callable, handlers_by_event: dict, **kwargs: Any
     ) -> None:
-        partitions_str = "*".join(str(i) for i in partitions)
+        """
+        Consume assigned partitions.
+
+        By default messages go through KafkaConsumerEngine with manual commits,
+        `enable_auto_commit=True` keeps sequential processing with auto-commit.
+        """
         auto_offset_reset = kwargs.get("auto_offset_reset", "latest") or "latest"
-        enable_auto_commit = kwargs.get("enable_auto_commit", True)
+        enable_auto_commit = bool(kwargs.get("enable_auto_commit", False))
         consumer = AIOKafkaConsumer(
-            group_id=f"GROUP_#_{topic}_#_{partitions_str}",
+            group_id=self.get_group_id(topic, partitions),
             bootstrap_servers=self.message_broker_url,
             auto_offset_reset=auto_offset_reset,
             enable_auto_commit=enable_auto_commit,
@@ -77,11 +335,38 @@ class KafkaClient:
         )
         partitions_ = [TopicPartition(topic, partition) for partition in partitions]
         consumer.assign(partitions_)
+
+        is_retry_enabled = settings.CONSUMER_RETRY_ENABLED and not enable_auto_commit
+        callback = self.__callback_with_retry if is_retry_enabled else self.__callback
+
+        async def handler(message: ConsumerRecord) -> None:
+            await callback(message, aggregator, handlers_by_event)
+
+        forwarders = []
+        if is_retry_enabled:
+            forwarders = [
+                asyncio.create_task(self.__forward_retries(topic, delay_ms))
+                for delay_ms in get_retry_delays_ms(handlers_by_event)
+            ]
+
         try:
             partitions_str = "*".join(str(queue) for queue in partitions)
             logger.info(f"Partitions {partitions_str}|{topic} consume starting..")
             await consumer.start()
-            async for message in consumer:
-                await self.__callback(message, aggregator, handlers_by_event)
+            if enable_auto_commit:
+                async for message in consumer:
+                    await handler(message)
+            else:
+                engine = KafkaConsumerEngine(
+                    consumer=consumer,
+                    handler=handler,
+                    max_in_flight=max(settings.KAFKA_CONSUMER_MAX_IN_FLIGHT, kwargs.get("min_in_flight", 1)),
+                    ordering=kwargs.get("ordering") or settings.KAFKA_CONSUMER_ORDERING,
+                    commit_interval_ms=settings.KAFKA_CONSUMER_COMMIT_INTERVAL_MS,
+                )
+                await engine.run()
         finally:
+            for task in forwarders:
+                task.cancel()
+            await asyncio.gather(*forwarders, return_exceptions=True)
             await consumer.stop()
@@ -0,0 +1,168 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+from aiokafka import AIOKafkaConsumer, ConsumerRecord, TopicPartition
+from loguru import logger
+
+
+class PartitionOffsetTracker:
+    """
+    Offsets of one partition taken for processing, in fetch order.
+
+    Messages may finish out of order; the commit position only moves past an
+    offset once it and every offset before it are processed.
+    """
+
+    def __init__(self) -> None:
+        self._offsets: Dict[int, bool] = {}  # offset -> is processed, insertion ordered
+        self.position: Optional[int] = None  # next offset to consume
+        self.committed: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def track(self, offset: int) -> None:
+        self._offsets[offset] = False
+
+    def done(self, offset: int) -> None:
+        if offset not in self._offsets:
+            return None
+        self._offsets[offset] = True
+        while self._offsets:
+            first = next(iter(self._offsets))
+            if not self._offsets[first]:
+                break
+            del self._offsets[first]
+            self.position = first + 1
+
+    def get_commit_offset(self) -> Optional[int]:
+        """Offset to commit if the position moved since the last commit"""
+        if self.position is None or self.position == self.committed:
+            return None
+        return self.position
+
+
+class KafkaConsumerEngine:
+    """
+    Concurrent consumer loop preserving order per partition or per message key.
+
+    Messages of the same lane (partition, or partition and key) are handled one
+    after another, lanes run concurrently; with "none" ordering every message
+    is a lane of its own. At most `max_in_flight` messages are taken at a time,
+    beyond that fetched partitions are paused. Offsets are committed manually
+    up to the highest contiguous processed offset.
+    """
+
+    ORDERING_PARTITION = "partition"
+    ORDERING_KEY = "key"
+    ORDERING_NONE = "none"
+
+    def __init__(
+        self,
+        consumer: AIOKafkaConsumer,
+        handler: Callable[[ConsumerRecord], Awaitable[None]],
+        max_in_flight: int = 100,
+        ordering: str = ORDERING_PARTITION,
+        commit_interval_ms: int = 1000,
+        fetch_timeout_ms: int = 500,
+    ) -> None:
+        if ordering not in (self.ORDERING_PARTITION, self.ORDERING_KEY, self.ORDERING_NONE):
+            raise ValueError(f"Unsupported ordering: {ordering}")
+        self.consumer = consumer
+        self.handler = handler
+        self.max_in_flight = max(1, max_in_flight)
+        self.ordering = ordering
+        self.commit_interval = commit_interval_ms / 1000
+        self.fetch_timeout_ms = fetch_timeout_ms
+
+        self.trackers: Dict[TopicPartition, PartitionOffsetTracker] = {}
+        self.in_flight = 0
+        self._lanes: Dict[Hashable, asyncio.Queue] = {}
+        self._workers: Dict[Hashable, asyncio.Task] = {}
+        self._has_capacity = asyncio.Event()
+        self._has_capacity.set()
+
+    def _get_lane(self, tp: TopicPartition, message: ConsumerRecord) -> Hashable:
+        if self.ordering == self.ORDERING_NONE:
+            return tp, message.offset
+        if self.ordering == self.ORDERING_KEY and message.key is not None:
+            return tp, message.key
+        return tp
+
+    def dispatch(self, tp: TopicPartition, message: ConsumerRecord) -> None:
+        self.trackers.setdefault(tp, PartitionOffsetTracker()).track(message.offset)
+        self.in_flight += 1
+        if self.in_flight >= self.max_in_flight:
+            self._has_capacity.clear()
+
+        lane = self._get_lane(tp, message)
+        queue = self._lanes.get(lane)
+        if queue is None:
+            queue = self._lanes[lane] = asyncio.Queue()
+            self._workers[lane] = asyncio.create_task(self._run_lane(lane, queue))
+        queue.put_nowait((tp, message))
+
+    async def _run_lane(self, lane: Hashable, queue: asyncio.Queue) -> None:
+        # Lane lives while it has messages, key lanes would pile up otherwise
+        try:
+            while not queue.empty():
+                tp, message = queue.get_nowait()
+                try:
+                    await self.handler(message)
+                except Exception as ex:
+                    logger.warning(f"Message handling failed! {ex} [{tp.topic}*{tp.partition}*{message.offset}]")
+                self.trackers[tp].done(message.offset)
+                self.in_flight -= 1
+                if self.in_flight < self.max_in_flight:
+                    self._has_capacity.set()
+        finally:
+            self._lanes.pop(lane, None)
+            self._workers.pop(lane, None)
+
+    async def commit(self) -> None:
+        offsets = {}
+        for tp, tracker in self.trackers.items():
+            offset = tracker.get_commit_offset()
+            if offset is not None:
+                offsets[tp] = offset
+        if not offsets:
+            return None
+        await self.consumer.commit(offsets)
+        for tp, offset in offsets.items():
+            self.trackers[tp].committed = offset
+
+    async def _wait_for_capacity(self) -> None:
+        """Pause fetching while the in-flight limit is reached"""
+        if self._has_capacity.is_set():
+            return None
+        partitions = list(self.consumer.assignment())
+        self.consumer.pause(*partitions)
+        try:
+            await self._has_capacity.wait()
+        finally:
+            self.consumer.resume(*partitions)
+
+    async def drain(self) -> None:
+        """Wait for taken messages and commit them"""
+        workers = list(self._workers.values())
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+        await self.commit()
+
+    async def run(self) -> None:
+        committed_at = time.monotonic()
+        try:
+            while True:
+                await self._wait_for_capacity()
+                batches = await self.consumer.getmany(
+                    timeout_ms=self.fetch_timeout_ms, max_records=self.max_in_flight - self.in_flight
+                )
+                for tp, messages in batches.items():
+                    for message in messages:
+                        self.dispatch(tp, message)
+                if time.monotonic() - committed_at >= self.commit_interval:
+                    await self.commit()
+                    committed_at = time.monotonic()
+        finally:
+            await self.drain()
@@ -1,13 +1,32 @@
 import asyncio
 import json
-from typing import Callable, List
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary
 
 import aio_pika
-from aio_pika.abc import AbstractIncomingMessage, AbstractRobustConnection
+from aio_pika.abc import (
+    AbstractChannel,
+    AbstractExchange,
+    AbstractIncomingMessage,
+    AbstractQueue,
+    AbstractRobustConnection,
+)
 from aio_pika.channel import Channel
 from aio_pika.pool import Pool
 from loguru import logger
 
+from src.app.config.settings import settings
+from src.app.infrastructure.messaging.clients.rabbitmq_consumer_workers import RabbitConsumerWorkers
+from src.app.infrastructure.messaging.retries import (
+    FailedMessages,
+    get_dead_letter_queue_name,
+    get_replay_body,
+    get_retry_queue_name,
+    get_undecodable,
+    route_failed,
+)
+
 
 class RabbitQueueClientClient:
     __message_broker_url: str
@@ -19,6 +38,12 @@ class RabbitQueueClientClient:
     __channel_pool: Pool
     __channel_pool_max_size = 10
 
+    # Exchanges already declared on a pooled channel, dropped together with the channel
+    __exchanges: "WeakKeyDictionary[AbstractChannel, Dict[Tuple[str, str], AbstractExchange]]"
+    # Retry and dead-letter queues already declared on a pooled channel
+    __queues: "WeakKeyDictionary[AbstractChannel, Dict[str, AbstractQueue]]"
+    __publish_window = 500  # messages awaiting publisher confirms at once
+
     __handlers_by_event: dict
     __aggregator: Callable
 
@@ -26,16 +51,30 @@ class RabbitQueueClientClient:
         self.message_broker_url = message_broker_url
         self.__connection_pool: Pool = Pool(self.__get_connection, max_size=self.__connections_pool_max_size)
         self.__channel_pool: Pool = Pool(self.__get_channel, max_size=self.__channel_pool_max_size)
+        self.__exchanges = WeakKeyDictionary()
+        self.__queues = WeakKeyDictionary()
 
     async def is_healthy(self) -> bool:
+        """Round trip on a pooled channel, a passive declare of a built-in exchange"""
         try:
-            connection_ = await aio_pika.connect_robust(self.message_broker_url)
-            await connection_.close()
+            async with asyncio.timeout(settings.MESSAGE_BROKER_HEALTH_CHECK_TIMEOUT_SECONDS):
+                async with self.__channel_pool.acquire() as channel:
+                    await channel.get_exchange("amq.direct", ensure=True)
             return True
         except Exception as ex:
-            logger.warning(f"{ex}")
+            logger.warning(f"{type(ex).__name__}: {ex}")
             return False
 
+    async def close(self) -> None:
+        """Close pooled channels and connections, fresh pools connect lazily on next use"""
+        channel_pool, connection_pool = self.__channel_pool, self.__connection_pool
+        self.__connection_pool = Pool(self.__get_connection, max_size=self.__connections_pool_max_size)
+        self.__channel_pool = Pool(self.__get_channel, max_size=self.__channel_pool_max_size)
+        self.__exchanges = WeakKeyDictionary()
+        self.__queues = WeakKeyDictionary()
+        await channel_pool.close()
+        await connection_pool.close()
+
     async def __get_connection(self) -> AbstractRobustConnection:
         while True:
             try:
@@ -63,18 +102,121 @@ class RabbitQueueClientClient:
         except Exception as e:  # noqa
             logger.warning(f"Got message with incorrect data! {e}")
 
+    async def __callback_with_retry(
+        self, message: AbstractIncomingMessage, exchanger_name: str, queue_name: str
+    ) -> None:
+        """
+        Callback for queue consuming with retries
+        A failed message goes to the delay queue of its next attempt or to the
+        dead-letter queue; it is requeued only if that publish fails
+        """
+        async with message.process(requeue=True):
+            try:
+                message_json = json.loads(message.body.decode("utf-8")) or {}
+            except ValueError as ex:
+                logger.warning(f"Got message with incorrect data! {ex}")
+                failed = FailedMessages(delayed={}, dead=[get_undecodable(message.body, ex)])
+                return await self.__publish_failed(exchanger_name, queue_name, failed)
+            try:
+                await self.__aggregator(message_json, self.__handlers_by_event)
+            except Exception as ex:
+                logger.warning(f"Message handling failed! {ex} [{queue_name}]")
+                failed = route_failed([message_json], ex, self.__handlers_by_event)
+                await self.__publish_failed(exchanger_name, queue_name, failed)
+
+    async def __publish_failed(self, exchanger_name: str, queue_name: str, failed: FailedMessages) -> None:
+        """Delay queues dead-letter expired messages back to the consumed queue"""
+        async with self.__channel_pool.acquire() as channel:
+            for delay_ms, messages in failed.delayed.items():
+                retry_queue_name = get_retry_queue_name(queue_name, delay_ms)
+                arguments = {
+                    "x-message-ttl": delay_ms,
+                    "x-dead-letter-exchange": exchanger_name,
+                    "x-dead-letter-routing-key": queue_name,
+                }
+                await self.__get_queue(channel, retry_queue_name, arguments)
+                await self.__publish(channel.default_exchange, retry_queue_name, self.__get_bodies(messages))
+            if failed.dead:
+                dead_letter_queue_name = get_dead_letter_queue_name(queue_name)
+                await self.__get_queue(channel, dead_letter_queue_name)
+                await self.__publish(
+                    channel.default_exchange, dead_letter_queue_name, self.__get_bodies(failed.dead)
+                )
+
+    async def __get_queue(
+        self, channel: AbstractChannel, queue_name: str, arguments: Optional[dict] = None
+    ) -> AbstractQueue:
+        queues = self.__queues.setdefault(channel, {})
+        queue_ = queues.get(queue_name)
+        if queue_ is None:
+            queue_ = await channel.declare_queue(queue_name, durable=True, auto_delete=False, arguments=arguments)
+            queues[queue_name] = queue_
+        return queue_
+
+    async def __get_exchange(
+        self, channel: AbstractChannel, exchanger_name: str, exchange_type: Any
+    ) -> AbstractExchange:
+        exchanges = self.__exchanges.setdefault(channel, {})
+        key = (exchanger_name, str(exchange_type))
+        exchange = exchanges.get(key)
+        if exchange is None:
+            exchange = await channel.declare_exchange(exchanger_name, exchange_type)
+            exchanges[key] = exchange
+        return exchange
+
     async def produce_messages(
         self, messages: List[dict], queue_name: str, exchanger_name: str, **kwargs: dict
     ) -> None:
+        """Publishes messages with their publisher confirms awaited together"""
         exchange_type = kwargs.get("exchange_type", aio_pika.exchange.ExchangeType.DIRECT)
         async with self.__channel_pool.acquire() as channel:
-            exchanger_ = await channel.declare_exchange(
-                exchanger_name,
-                exchange_type,
+            exchanger_ = await self.__get_exchange(channel, exchanger_name, exchange_type)
+            await self.__publish(exchanger_, queue_name, self.__get_bodies(messages))
+
+    @staticmethod
+    def __get_bodies(messages: List[dict]) -> List[bytes]:
+        return [json.dumps(message, ensure_ascii=False).encode() for message in messages]
+
+    async def __publish(self, exchange: AbstractExchange, routing_key: str, bodies: List[bytes]) -> None:
+        for i in range(0, len(bodies), self.__publish_window):
+            await asyncio.gather(
+                *[
+                    exchange.publish(aio_pika.Message(body=body), routing_key=routing_key)
+                    for body in bodies[i : i + self.__publish_window]
+                ]
             )
-            for message in messages:
-                message_ = json.dumps(message, ensure_ascii=False)
-                await exchanger_.publish(aio_pika.Message(body=message_.encode()), routing_key=queue_name)
+
+    async def replay_dead_letters(self, exchanger_name: str, queue_name: str, limit: int, **kwargs: Any) -> int:
+        """Moves up to `limit` dead letters back to the queue, acked once republished"""
+        exchange_type = kwargs.get("exchange_type", aio_pika.exchange.ExchangeType.DIRECT)
+        replayed = 0
+        async with self.__channel_pool.acquire() as channel:
+            exchanger_ = await self.__get_exchange(channel, exchanger_name, exchange_type)
+            dead_letter_queue = await self.__get_queue(channel, get_dead_letter_queue_name(queue_name))
+            while replayed < limit:
+                incoming: List[AbstractIncomingMessage] = []
+                while len(incoming) < min(self.__publish_window, limit - replayed):
+                    message = await dead_letter_queue.get(no_ack=False, fail=False)
+                    if message is None:
+                        break
+                    incoming.append(message)
+                if not incoming:
+                    break
+                bodies = [get_replay_body(json.loads(i.body.decode("utf-8"))) for i in incoming]
+                await self.__publish(exchanger_, queue_name, bodies)
+                for message in incoming:
+                    await message.ack()
+                replayed += len(incoming)
+        return replayed
+
+    async def get_backlog(self, queues: List[str | int], **kwargs: Any) -> Dict[str, int]:
+        """Messages ready for delivery by queue, from a passive declare"""
+        backlog = {}
+        async with self.__channel_pool.acquire() as channel:
+            for queue_name in queues:
+                queue_ = await channel.declare_queue(str(queue_name), passive=True)
+                backlog[str(queue_name)] = queue_.declaration_result.message_count or 0
+        return backlog
 
     async def consume(
         self,
@@ -82,15 +224,21 @@ class RabbitQueueClientClient:
         exchanger_name: str,
         aggregator: Callable,
         handlers_by_event: dict,
-        **kwargs: dict,
+        **kwargs: Any,
     ) -> None:
         exchange_type = kwargs.get("exchange_type", aio_pika.exchange.ExchangeType.DIRECT.value)
 
         queues_str = "|".join(str(queue) for queue in queues)
         logger.info(f"Queue {queues_str}|{exchanger_name}|{exchange_type} consume starting..")
 
+        prefetch_count = max(
+            kwargs.get("prefetch_count") or settings.RABBITMQ_PREFETCH_COUNT, kwargs.get("min_prefetch_count", 1)
+        )
+        workers_count = max(settings.RABBITMQ_CONSUMER_WORKERS, kwargs.get("min_workers", 1))
+        ordering = kwargs.get("ordering") or settings.RABBITMQ_CONSUMER_ORDERING
+
         async with self.__channel_pool.acquire() as channel:
-            await channel.set_qos(1)
+            await channel.set_qos(prefetch_count=prefetch_count)
             exchanger = await channel.declare_exchange(
                 exchanger_name,
                 exchange_type,
@@ -108,7 +256,38 @@ class RabbitQueueClientClient:
                 await queue_.bind(exchanger)
                 queues_.append(queue_)
 
-            for i in queues_:
-                await i.consume(self.__callback)
+            consumers: List[Tuple[AbstractQueue, str, RabbitConsumerWorkers]] = []
+            try:
+                for i in queues_:
+                    handler = self.__callback
+                    if settings.CONSUMER_RETRY_ENABLED:
+                        handler = partial(
+                            self.__callback_with_retry, exchanger_name=exchanger_name, queue_name=i.name
+                        )
+                    workers = RabbitConsumerWorkers(
+                        queue_name=i.name, handler=handler, workers=workers_count, ordering=ordering
+                    )
+                    workers.start()
+                    consumers.append((i, await i.consume(workers.submit), workers))
+
+                await asyncio.Future()
+            finally:
+                await self.__drain(consumers)
 
-            await asyncio.Future()
+    async def __drain(self, consumers: List[Tuple[AbstractQueue, str, RabbitConsumerWorkers]]) -> None:
+        """Stop deliveries, finish and ack messages already delivered"""
+        for queue_, consumer_tag, _ in consumers:
+            try:
+                await queue_.cancel(consumer_tag)
+            except Exception as ex:
+                logger.warning(f"Consumer cancel failed for {queue_.name}. Reason: {ex}")
+        logger.info(f"Draining {len(consumers)} consumers..")
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*[workers.drain() for _, _, workers in consumers]),
+                timeout=settings.RABBITMQ_CONSUMER_DRAIN_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Consumers drain timed out, unacked messages will be redelivered")
+            for _, _, workers in consumers:
+                workers.stop()
@@ -0,0 +1,93 @@
+import asyncio
+import time
+import zlib
+from typing import Awaitable, Callable, List, Optional
+
+from aio_pika.abc import AbstractIncomingMessage
+from loguru import logger
+
+from src.app.infrastructure.common.metrics import metrics_registry
+
+in_flight_gauge = metrics_registry.gauge(
+    "mq_consumer_in_flight_messages", "Messages taken by consumer workers and not finished yet", ("queue",)
+)
+handler_latency_histogram = metrics_registry.histogram(
+    "mq_consumer_handler_seconds", "Time spent handling a consumed message", ("queue",)
+)
+
+
+class RabbitConsumerWorkers:
+    """
+    Bounded pool of handler workers of a consumed queue.
+
+    Delivered messages wait in worker lanes, `workers` of them are handled at a
+    time. With "routing_key" ordering each worker owns a lane and messages are
+    spread by a hash of their routing key, so messages sharing a routing key are
+    handled in delivery order; otherwise all workers share one lane.
+    """
+
+    ORDERING_NONE = "none"
+    ORDERING_ROUTING_KEY = "routing_key"
+
+    def __init__(
+        self,
+        queue_name: str,
+        handler: Callable[[AbstractIncomingMessage], Awaitable[None]],
+        workers: int = 10,
+        ordering: str = ORDERING_NONE,
+    ) -> None:
+        if ordering not in (self.ORDERING_NONE, self.ORDERING_ROUTING_KEY):
+            raise ValueError(f"Unsupported ordering: {ordering}")
+        self.queue_name = queue_name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.ordering = ordering
+        lanes_count = self.workers if ordering == self.ORDERING_ROUTING_KEY else 1
+        self._lanes: List[asyncio.Queue] = [asyncio.Queue() for _ in range(lanes_count)]
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            lane = self._lanes[i % len(self._lanes)]
+            self._tasks.append(asyncio.create_task(self._work(lane)))
+
+    def _get_lane(self, message: AbstractIncomingMessage) -> asyncio.Queue:
+        if len(self._lanes) == 1:
+            return self._lanes[0]
+        routing_key = (message.routing_key or "").encode("utf-8")
+        return self._lanes[zlib.crc32(routing_key) % len(self._lanes)]
+
+    async def submit(self, message: AbstractIncomingMessage) -> None:
+        """Consumer callback, the message is acked by the handler once a worker is done with it"""
+        in_flight_gauge.inc(queue=self.queue_name)
+        self._get_lane(message).put_nowait(message)
+
+    async def _work(self, lane: asyncio.Queue) -> None:
+        while True:
+            message: Optional[AbstractIncomingMessage] = await lane.get()
+            if message is None:
+                lane.task_done()
+                return None
+            started = time.perf_counter()
+            try:
+                await self.handler(message)
+            except Exception as ex:
+                logger.warning(f"Message handling failed! {ex} [{self.queue_name}]")
+            finally:
+                handler_latency_histogram.observe(time.perf_counter() - started, queue=self.queue_name)
+                in_flight_gauge.dec(queue=self.queue_name)
+                lane.task_done()
+
+    async def drain(self) -> None:
+        """Finish messages already delivered, then stop workers"""
+        for lane in self._lanes:
+            await lane.join()
+        for i in range(self.workers):
+            self._lanes[i % len(self._lanes)].put_nowait(None)
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
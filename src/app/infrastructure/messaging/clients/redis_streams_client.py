@@ -0,0 +1,272 @@
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import redis.asyncio as redis
+from loguru import logger
+from redis.exceptions import ResponseError
+
+from src.app.config.settings import settings
+from src.app.infrastructure.messaging.retries import (
+    FailedMessages,
+    get_dead_letter_queue_name,
+    get_replay_body,
+    get_undecodable,
+    route_failed,
+)
+
+StreamEntry = Tuple[bytes, Dict[bytes, bytes]]
+
+# Moves due delayed retries back to their stream.
+# KEYS[1] - retry sorted set, KEYS[2] - stream, ARGV: now ms, max entries, stream max length
+FORWARD_DUE_RETRIES_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, body in ipairs(due) do
+    redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[3], '*', 'body', body)
+    redis.call('ZREM', KEYS[1], body)
+end
+return #due
+"""
+
+
+class RedisStreamsClient:
+    """
+    Redis Streams broker, a stream per exchanger queue ("<exchanger>:<queue>").
+
+    Consumers of a group share the stream's entries, each reads batches with
+    XREADGROUP and acks them with one pipelined XACK per stream. Entries left
+    pending by a dead consumer are taken over with XAUTOCLAIM after
+    REDIS_STREAMS_CLAIM_IDLE_MS. Streams are trimmed to about
+    REDIS_STREAMS_MAXLEN entries on XADD. Delayed retries wait in a sorted set
+    per stream, dead letters go to the "<stream>.dlq" stream.
+    """
+
+    __FIELD = b"body"
+
+    def __init__(self, message_broker_url: str) -> None:
+        self.message_broker_url = message_broker_url
+        self.client = redis.from_url(message_broker_url)
+        self.maxlen = settings.REDIS_STREAMS_MAXLEN
+        self.consumer_name = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.__forward_due_retries = self.client.register_script(FORWARD_DUE_RETRIES_LUA)
+
+    async def is_healthy(self) -> bool:
+        try:
+            return bool(await self.client.ping())
+        except Exception as ex:
+            logger.warning(f"{ex}")
+            return False
+
+    async def close(self) -> None:
+        """Drop pooled connections, they reconnect lazily on next use"""
+        await self.client.connection_pool.disconnect()
+
+    @staticmethod
+    def get_stream_name(exchanger_name: str, queue_name: str | int) -> str:
+        return f"{exchanger_name}:{queue_name}"
+
+    @staticmethod
+    def get_retry_set_name(stream_name: str) -> str:
+        return f"{stream_name}.retry"
+
+    async def __add(self, stream_name: str, bodies: List[bytes]) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for body in bodies:
+                pipe.xadd(stream_name, {self.__FIELD: body}, maxlen=self.maxlen, approximate=True)
+            await pipe.execute()
+
+    async def produce_messages(
+        self, messages: List[dict], queue_name: str | int, exchanger_name: str, **kwargs: Any
+    ) -> None:
+        """XADD of all messages in one round trip"""
+        bodies = [json.dumps(message, ensure_ascii=False).encode() for message in messages]
+        await self.__add(self.get_stream_name(exchanger_name, queue_name), bodies)
+
+    @staticmethod
+    def get_group_id(exchanger_name: str) -> str:
+        return f"GROUP_#_{exchanger_name}"
+
+    async def get_backlog(self, queues: List[str | int], exchanger_name: str, **kwargs: Any) -> Dict[str, int]:
+        """Entries not delivered to the consumer group yet plus delivered and not acked ones, by queue"""
+        group_id = kwargs.get("group_id") or self.get_group_id(exchanger_name)
+        backlog = {}
+        for queue_name in queues:
+            stream_name = self.get_stream_name(exchanger_name, queue_name)
+            groups = await self.client.xinfo_groups(stream_name)
+            group = next((i for i in groups if i["name"] in (group_id, group_id.encode())), None)
+            if group is None:
+                backlog[str(queue_name)] = await self.client.xlen(stream_name)
+                continue
+            lag = group.get("lag")
+            if lag is None:  # Redis < 7 has no lag of groups, entries after the last delivered one are counted
+                last_delivered_id = group["last-delivered-id"]
+                last_delivered_id = (
+                    last_delivered_id.decode() if isinstance(last_delivered_id, bytes) else last_delivered_id
+                )
+                lag = len(await self.client.xrange(stream_name, min=f"({last_delivered_id}", count=self.maxlen))
+            backlog[str(queue_name)] = lag + group["pending"]
+        return backlog
+
+    async def __ensure_group(self, stream_name: str, group_id: str) -> None:
+        try:
+            await self.client.xgroup_create(stream_name, group_id, id="0", mkstream=True)
+        except ResponseError as ex:
+            if "BUSYGROUP" not in str(ex):
+                raise
+
+    async def consume(
+        self,
+        queues: List[str | int],
+        exchanger_name: str,
+        aggregator: Callable,
+        handlers_by_event: dict,
+        **kwargs: Any,
+    ) -> None:
+        """Reads and handles batches until cancelled, the batch being handled is finished and acked first"""
+        streams = [self.get_stream_name(exchanger_name, queue_name) for queue_name in queues]
+        group_id = kwargs.get("group_id") or self.get_group_id(exchanger_name)
+        count = max(settings.REDIS_STREAMS_READ_COUNT, kwargs.get("min_prefetch_count", 1))
+        for stream_name in streams:
+            await self.__ensure_group(stream_name, group_id)
+        logger.info(f"Streams {'|'.join(streams)} consume starting as {self.consumer_name}..")
+
+        claimed_at = 0.0
+        while True:
+            batches: List[Tuple[str, List[StreamEntry]]] = []
+            if time.monotonic() - claimed_at >= settings.REDIS_STREAMS_CLAIM_IDLE_MS / 1000:
+                claimed_at = time.monotonic()
+                batches = await self.__claim_stale(streams, group_id, count)
+            await self.__forward_retries(streams, count)
+            if not batches:
+                response = await self.client.xreadgroup(
+                    group_id,
+                    self.consumer_name,
+                    {stream_name: ">" for stream_name in streams},
+                    count=count,
+                    block=settings.REDIS_STREAMS_BLOCK_MS,
+                )
+                batches = [
+                    (name.decode() if isinstance(name, bytes) else name, entries) for name, entries in response
+                ]
+            if batches:
+                task = asyncio.ensure_future(self.__handle(batches, group_id, aggregator, handlers_by_event))
+                try:
+                    await asyncio.shield(task)
+                except asyncio.CancelledError:
+                    await task
+                    raise
+
+    async def __claim_stale(
+        self, streams: List[str], group_id: str, count: int
+    ) -> List[Tuple[str, List[StreamEntry]]]:
+        """Entries pending longer than the claim idle time with consumers that may be gone"""
+        batches = []
+        for stream_name in streams:
+            response = await self.client.xautoclaim(
+                stream_name,
+                group_id,
+                self.consumer_name,
+                min_idle_time=settings.REDIS_STREAMS_CLAIM_IDLE_MS,
+                start_id="0-0",
+                count=count,
+            )
+            entries = [i for i in response[1] if i and i[1]]  # trimmed entries come back empty
+            if entries:
+                logger.info(f"Claimed {len(entries)} stale entries of {stream_name}")
+                batches.append((stream_name, entries))
+        return batches
+
+    async def __forward_retries(self, streams: List[str], count: int) -> None:
+        """Due retries back to the stream, checked once per read so at most REDIS_STREAMS_BLOCK_MS late"""
+        now_ms = int(time.time() * 1000)
+        for stream_name in streams:
+            await self.__forward_due_retries(
+                keys=[self.get_retry_set_name(stream_name), stream_name], args=[now_ms, count, self.maxlen]
+            )
+
+    async def __handle(
+        self,
+        batches: List[Tuple[str, List[StreamEntry]]],
+        group_id: str,
+        aggregator: Callable,
+        handlers_by_event: dict,
+    ) -> None:
+        """Handles entries of the batch concurrently and acks the finished ones in one round trip"""
+        handled = await asyncio.gather(
+            *[
+                self.__callback(stream_name, entry, aggregator, handlers_by_event)
+                for stream_name, entries in batches
+                for entry in entries
+            ]
+        )
+        acks: Dict[str, List[bytes]] = {}
+        for stream_name, entry_id in handled:
+            if entry_id is not None:
+                acks.setdefault(stream_name, []).append(entry_id)
+        async with self.client.pipeline(transaction=False) as pipe:
+            for stream_name, entry_ids in acks.items():
+                pipe.xack(stream_name, group_id, *entry_ids)
+            await pipe.execute()
+
+    async def __callback(
+        self, stream_name: str, entry: StreamEntry, aggregator: Callable, handlers_by_event: dict
+    ) -> Tuple[str, Optional[bytes]]:
+        """Entry ID to ack, None leaves the entry pending to be claimed again"""
+        entry_id, fields = entry
+        body = fields.get(self.__FIELD, b"")
+        failed = None
+        try:
+            message_json = json.loads(body.decode("utf-8")) or {}
+            try:
+                await aggregator(message_json, handlers_by_event)
+            except Exception as ex:
+                logger.warning(f"Message handling failed! {ex} [{stream_name}*{entry_id!r}]")
+                failed = route_failed([message_json], ex, handlers_by_event)
+        except ValueError as ex:
+            logger.warning(f"Got message with incorrect data! {ex} [{stream_name}*{entry_id!r}]")
+            failed = FailedMessages(delayed={}, dead=[get_undecodable(body, ex)])
+        if failed is not None and settings.CONSUMER_RETRY_ENABLED:
+            try:
+                await self.__publish_failed(stream_name, failed)
+            except Exception as ex:
+                logger.error(f"Failed message is not published, left pending. Reason: {ex}")
+                return stream_name, None
+        return stream_name, entry_id
+
+    async def __publish_failed(self, stream_name: str, failed: FailedMessages) -> None:
+        now_ms = int(time.time() * 1000)
+        async with self.client.pipeline(transaction=False) as pipe:
+            for delay_ms, messages in failed.delayed.items():
+                pipe.zadd(
+                    self.get_retry_set_name(stream_name),
+                    {json.dumps(message, ensure_ascii=False): now_ms + delay_ms for message in messages},
+                )
+            for message in failed.dead:
+                pipe.xadd(
+                    get_dead_letter_queue_name(stream_name),
+                    {self.__FIELD: json.dumps(message, ensure_ascii=False).encode()},
+                    maxlen=self.maxlen,
+                    approximate=True,
+                )
+            await pipe.execute()
+
+    async def replay_dead_letters(
+        self, exchanger_name: str, queue_name: str | int, limit: int, **kwargs: Any
+    ) -> int:
+        """Moves up to `limit` oldest dead letters back to the stream"""
+        stream_name = self.get_stream_name(exchanger_name, queue_name)
+        dead_letter_stream_name = get_dead_letter_queue_name(stream_name)
+        replayed = 0
+        while replayed < limit:
+            entries = await self.client.xrange(dead_letter_stream_name, count=min(500, limit - replayed))
+            if not entries:
+                break
+            bodies = [get_replay_body(json.loads(fields[self.__FIELD])) for _, fields in entries]
+            await self.__add(stream_name, bodies)
+            await self.client.xdel(dead_letter_stream_name, *[entry_id for entry_id, _ in entries])
+            replayed += len(entries)
+        return replayed
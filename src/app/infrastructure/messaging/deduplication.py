@@ -0,0 +1,147 @@
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Protocol, Tuple
+
+from loguru import logger
+
+from src.app.config.settings import settings
+from src.app.infrastructure.repositories.container import container as repo_container
+
+
+class DeduplicationStoreProtocol(Protocol):
+
+    async def claim(self, message_ids: List[str], ttl_seconds: int) -> List[str]: ...
+
+    async def complete(self, message_ids: List[str], ttl_seconds: int) -> None: ...
+
+    async def release(self, message_ids: List[str]) -> None: ...
+
+    async def purge(self) -> None: ...
+
+
+class MessageDeduplicator:
+    """
+    Skips messages whose `message_id` was already consumed within `ttl_seconds`.
+
+    IDs of a whole batch are claimed in one store round trip for
+    `processing_ttl_seconds`, messages whose IDs are claimed or consumed are
+    dropped. Claims are kept for `ttl_seconds` once the batch is handled and
+    released if it fails, so redelivered messages are handled again; claims of
+    a consumer that died mid-batch expire. Messages without `message_id` are
+    always handled. If the store is unavailable messages pass through, delivery
+    stays at least once.
+
+    Keeping claims after the batch is a second round trip. With
+    `processing_ttl_seconds=0` IDs are claimed for `ttl_seconds` right away,
+    one round trip per handled batch, but messages claimed by a consumer that
+    died mid-batch are skipped until the claims expire.
+    """
+
+    PURGE_INTERVAL_SECONDS = 60 * 60
+
+    def __init__(self, store: DeduplicationStoreProtocol, ttl_seconds: int, processing_ttl_seconds: int) -> None:
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.processing_ttl_seconds = processing_ttl_seconds
+        self._purged_at = time.monotonic()
+
+    @staticmethod
+    def get_message_id(data: dict) -> Optional[str]:
+        message_id = data.get("message_id")
+        return str(message_id) if message_id else None
+
+    async def claim(self, messages: List[dict]) -> Tuple[List[dict], List[str]]:
+        """Messages to handle in their original order and their claimed IDs"""
+        message_ids = list(dict.fromkeys(i for i in map(self.get_message_id, messages) if i is not None))
+        if not message_ids:
+            return messages, []
+        try:
+            claimed = await self.store.claim(
+                message_ids, ttl_seconds=self.processing_ttl_seconds or self.ttl_seconds
+            )
+        except Exception as ex:
+            logger.warning(f"Deduplication store is unavailable, messages are not checked. Reason: {ex}")
+            return messages, []
+        await self._purge_if_due()
+        if len(claimed) < len(message_ids):
+            logger.info(f"Skipped {len(message_ids) - len(claimed)} already consumed messages")
+        return self._get_fresh(messages, claimed), claimed
+
+    def _get_fresh(self, messages: List[dict], claimed: List[str]) -> List[dict]:
+        fresh = []
+        pending = set(claimed)  # the first copy of a message redelivered within the batch wins
+        for data in messages:
+            message_id = self.get_message_id(data)
+            if message_id is None:
+                fresh.append(data)
+            elif message_id in pending:
+                pending.discard(message_id)
+                fresh.append(data)
+        return fresh
+
+    async def complete(self, message_ids: List[str]) -> None:
+        try:
+            await self.store.complete(message_ids, ttl_seconds=self.ttl_seconds)
+        except Exception as ex:
+            logger.warning(f"Deduplication claims are not completed, redelivery will be handled. Reason: {ex}")
+
+    async def release(self, message_ids: List[str]) -> None:
+        try:
+            await self.store.release(message_ids)
+        except Exception as ex:
+            logger.warning(f"Deduplication claims are not released, redelivery will be skipped. Reason: {ex}")
+
+    async def _purge_if_due(self) -> None:
+        if time.monotonic() - self._purged_at < self.PURGE_INTERVAL_SECONDS:
+            return None
+        self._purged_at = time.monotonic()
+        try:
+            await self.store.purge()
+        except Exception as ex:
+            logger.warning(f"Deduplication store purge failed. Reason: {ex}")
+
+    async def _handle(self, messages: List[dict], handler: Callable[[List[dict]], Awaitable[None]]) -> None:
+        fresh, claimed = await self.claim(messages)
+        if not fresh:
+            return None
+        try:
+            await handler(fresh)
+        except BaseException:
+            await self.release(claimed)
+            raise
+        if self.processing_ttl_seconds:
+            await self.complete(claimed)
+
+    def wrap_aggregator(self, aggregator: Callable) -> Callable:
+        """`aggregator(message, handlers_by_event)` skipping consumed messages"""
+
+        async def deduplicated_aggregator(data: dict, handlers_by_event: dict) -> None:
+            await self._handle([data], lambda fresh: aggregator(fresh[0], handlers_by_event))
+
+        return deduplicated_aggregator
+
+    def wrap_batch_aggregator(self, batch_aggregator: Callable) -> Callable:
+        """`batch_aggregator(messages, handlers_by_event)` skipping consumed messages"""
+
+        async def deduplicated_batch_aggregator(messages: List[dict], handlers_by_event: dict) -> None:
+            await self._handle(messages, lambda fresh: batch_aggregator(fresh, handlers_by_event))
+
+        return deduplicated_batch_aggregator
+
+
+def get_deduplicator(store_name: Optional[str] = None) -> Optional[MessageDeduplicator]:
+    """Deduplicator of CONSUMER_DEDUPLICATION store: "redis", "postgres" or "" to disable"""
+    store_name = settings.CONSUMER_DEDUPLICATION if store_name is None else store_name
+    if not store_name:
+        return None
+    stores: Dict[str, DeduplicationStoreProtocol] = {
+        "redis": repo_container.consumed_messages_redis_repository,  # type: ignore
+        "postgres": repo_container.consumed_messages_psql_repository,  # type: ignore
+    }
+    store = stores.get(store_name)
+    if store is None:
+        raise ValueError(f"Unsupported deduplication store: {store_name}")
+    return MessageDeduplicator(
+        store=store,
+        ttl_seconds=settings.CONSUMER_DEDUPLICATION_TTL_SECONDS,
+        processing_ttl_seconds=settings.CONSUMER_DEDUPLICATION_PROCESSING_TTL_SECONDS,
+    )
@@ -1,9 +1,16 @@
+import time
+import uuid
 from enum import Enum
-from typing import Any, Callable, List, Protocol
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
 
 from src.app.config.settings import settings
+from src.app.infrastructure.messaging.batching import MessageBatcher
+from src.app.infrastructure.messaging.clients.inmemory_client import InMemoryBrokerClient
 from src.app.infrastructure.messaging.clients.kafka_client import KafkaClient
+from src.app.infrastructure.messaging.clients.kafka_consumer_engine import KafkaConsumerEngine
 from src.app.infrastructure.messaging.clients.rabbitmq_client import RabbitQueueClientClient
+from src.app.infrastructure.messaging.clients.redis_streams_client import RedisStreamsClient
+from src.app.infrastructure.messaging.deduplication import MessageDeduplicator
 
 
 class MessageBrokerProtocol(Protocol):
@@ -14,16 +21,32 @@ class MessageBrokerProtocol(Protocol):
 
     async def consume(self, **kwargs: Any) -> None: ...
 
+    async def replay_dead_letters(self, **kwargs: Any) -> int: ...
+
+    async def get_backlog(self, **kwargs: Any) -> Dict[str, int]: ...
+
+    async def close(self) -> None: ...
+
 
 class BrokerType(Enum):
     RABBITMQ = "rabbitmq"
     KAFKA = "kafka"
+    INMEMORY = "inmemory"  # process-local, for local runs, tests and benchmarks
+    REDIS_STREAMS = "redis_streams"
 
 
 class MQClientProxy:
     _client: MessageBrokerProtocol
     message_broker_type: str
-    SUPPORTED_MESSAGE_BROKERS: dict = {"rabbitmq": RabbitQueueClientClient, "kafka": KafkaClient}
+    SUPPORTED_MESSAGE_BROKERS: dict = {
+        "rabbitmq": RabbitQueueClientClient,
+        "kafka": KafkaClient,
+        "inmemory": InMemoryBrokerClient,
+        "redis_streams": RedisStreamsClient,
+    }
+    health_check_cache_seconds: float = settings.MESSAGE_BROKER_HEALTH_CHECK_CACHE_SECONDS
+    # Brokers addressed by exchanger and queue names
+    QUEUE_MESSAGE_BROKERS = (BrokerType.RABBITMQ.value, BrokerType.INMEMORY.value, BrokerType.REDIS_STREAMS.value)
 
     def __init__(self, message_broker_type: str, message_broker_url: str) -> None:
         client_class = self.SUPPORTED_MESSAGE_BROKERS.get(message_broker_type)
@@ -33,9 +56,23 @@ class MQClientProxy:
             raise ValueError("Value for message_broker_url cannot be empty")
         self._client = client_class(message_broker_url)
         self.message_broker_type = message_broker_type
+        self._health: Optional[Tuple[float, bool]] = None  # checked at, is healthy
 
     async def is_healthy(self) -> bool:
-        return await self._client.is_healthy()
+        """
+        Checks the broker over pooled connections. The result is reused for
+        MESSAGE_BROKER_HEALTH_CHECK_CACHE_SECONDS, so frequent probes do not
+        reach the broker every time.
+        """
+        if self._health is not None and time.monotonic() - self._health[0] < self.health_check_cache_seconds:
+            return self._health[1]
+        is_healthy = await self._client.is_healthy()
+        self._health = (time.monotonic(), is_healthy)
+        return is_healthy
+
+    async def close(self) -> None:
+        """Release broker connections and flush pending messages"""
+        await self._client.close()
 
     async def produce_messages(
         self,
@@ -44,7 +81,9 @@ class MQClientProxy:
         messages: List[dict],
         **kwargs: dict,
     ) -> None:
-        if self.message_broker_type == BrokerType.RABBITMQ.value:
+        """Publishes messages, each gets a `message_id` unless it already has one"""
+        messages = [i if i.get("message_id") else {**i, "message_id": uuid.uuid4().hex} for i in messages]
+        if self.message_broker_type in self.QUEUE_MESSAGE_BROKERS:
             return await self._client.produce_messages(
                 messages=messages,
                 queue_name=queue_name,
@@ -61,15 +100,104 @@ class MQClientProxy:
         else:
             raise ValueError(f"Unsupported broker type: {self.message_broker_type}")
 
+    async def replay_dead_letters(
+        self,
+        exchanger_name: str,  # Exchange name, Topic
+        queue_name: str | int,  # Queue name, Partition
+        limit: int,
+        **kwargs: Any,
+    ) -> int:
+        """
+        Republishes up to `limit` dead-lettered messages with a fresh attempt count,
+        returns the number of replayed messages. Kafka keeps one dead-letter topic
+        per topic, its messages return to the partitions they failed on.
+        """
+        if self.message_broker_type in self.QUEUE_MESSAGE_BROKERS:
+            return await self._client.replay_dead_letters(
+                exchanger_name=exchanger_name, queue_name=queue_name, limit=limit, **kwargs
+            )
+        elif self.message_broker_type == BrokerType.KAFKA.value:
+            return await self._client.replay_dead_letters(topic=exchanger_name, limit=limit, **kwargs)
+        else:
+            raise ValueError(f"Unsupported broker type: {self.message_broker_type}")
+
+    async def get_backlog(
+        self,
+        exchanger_name: str,  # Exchange name, Topic
+        queues: List[str | int],  # Queue's names, Partitions
+        **kwargs: Any,
+    ) -> Dict[str, int]:
+        """
+        Messages waiting for the consumer by queue/partition: Kafka consumer lag
+        (end offset minus committed offset), RabbitMQ queue depth, Redis Streams
+        entries not delivered or not acked yet.
+        """
+        if self.message_broker_type in self.QUEUE_MESSAGE_BROKERS:
+            return await self._client.get_backlog(queues=queues, exchanger_name=exchanger_name, **kwargs)
+        elif self.message_broker_type == BrokerType.KAFKA.value:
+            return await self._client.get_backlog(topic=exchanger_name, partitions=queues, **kwargs)
+        else:
+            raise ValueError(f"Unsupported broker type: {self.message_broker_type}")
+
+    def _get_batch_options(
+        self,
+        handlers_by_event: dict,
+        batch_aggregator: Callable,
+        batch_size: int,
+        batch_timeout_ms: int,
+    ) -> tuple[Callable, dict]:
+        """Per-message aggregator feeding a batcher and broker options letting batches fill up"""
+        batcher = MessageBatcher(
+            flush_handler=lambda items: batch_aggregator(items, handlers_by_event),
+            batch_size=batch_size,
+            batch_timeout_ms=batch_timeout_ms,
+        )
+
+        async def aggregator(data: dict, handlers_by_event_: dict) -> None:
+            await batcher.submit(data)
+
+        if self.message_broker_type in self.QUEUE_MESSAGE_BROKERS:
+            return aggregator, {"min_prefetch_count": batch_size, "min_workers": batch_size, "ordering": "none"}
+        return aggregator, {"ordering": KafkaConsumerEngine.ORDERING_NONE, "min_in_flight": batch_size}
+
     async def consume(
         self,
         queues: List[str | int],  # Queue's names, Partitions
         exchanger_name: str,  # Exchange name, Topic
         aggregator: Callable,
         handlers_by_event: dict,
-        **kwargs: dict,
+        batch_aggregator: Optional[Callable] = None,
+        batch_size: int = 1,
+        batch_timeout_ms: int = 200,
+        deduplicator: Optional[MessageDeduplicator] = None,
+        **kwargs: Any,
     ) -> None:
-        if self.message_broker_type == BrokerType.RABBITMQ.value:
+        """
+        Consume queues/partitions calling `aggregator(message, handlers_by_event)` per message.
+
+        With `batch_aggregator` and `batch_size` > 1 messages are accumulated up to
+        `batch_size` items or `batch_timeout_ms` and handed over as
+        `batch_aggregator(messages, handlers_by_event)`. Messages are acked/committed
+        only after their batch is handled.
+
+        With `deduplicator` messages already consumed by `message_id` are skipped,
+        checked once per batch.
+
+        Failed messages are retried with backoff of their event's `"retry_policy"`
+        (RetryPolicy) in handlers_by_event and dead-lettered after the last attempt,
+        see CONSUMER_RETRY_* settings. Messages of a failed batch are retried one by one.
+        """
+        if deduplicator is not None:
+            aggregator = deduplicator.wrap_aggregator(aggregator)
+            if batch_aggregator is not None:
+                batch_aggregator = deduplicator.wrap_batch_aggregator(batch_aggregator)
+        if batch_aggregator is not None and batch_size > 1:
+            aggregator, batch_kwargs = self._get_batch_options(
+                handlers_by_event, batch_aggregator, batch_size, batch_timeout_ms
+            )
+            kwargs = {**batch_kwargs, **kwargs}
+
+        if self.message_broker_type in self.QUEUE_MESSAGE_BROKERS:
             await self._client.consume(
                 queues=queues,
                 exchanger_name=exchanger_name,
@@ -0,0 +1,94 @@
+import json
+from typing import Dict, List, NamedTuple, Optional
+
+from loguru import logger
+
+from src.app.config.settings import settings
+
+# Delivery fields added to failed messages, dropped when dead letters are replayed
+ATTEMPT_FIELD = "attempt"
+LAST_ERROR_FIELD = "last_error"
+RETRY_AT_FIELD = "retry_at_ms"
+ORIGIN_PARTITION_FIELD = "origin_partition"
+DELIVERY_FIELDS = (ATTEMPT_FIELD, LAST_ERROR_FIELD, RETRY_AT_FIELD, ORIGIN_PARTITION_FIELD)
+
+
+class RetryPolicy(NamedTuple):
+    """
+    Exponential backoff of a failed message: attempt N is retried after
+    `initial_delay_ms * multiplier ** (N - 1)` capped by `max_delay_ms`,
+    after `max_attempts` failed attempts the message is dead-lettered.
+    """
+
+    max_attempts: int = settings.CONSUMER_RETRY_MAX_ATTEMPTS
+    initial_delay_ms: int = settings.CONSUMER_RETRY_INITIAL_DELAY_MS
+    multiplier: float = settings.CONSUMER_RETRY_BACKOFF_MULTIPLIER
+    max_delay_ms: int = settings.CONSUMER_RETRY_MAX_DELAY_MS
+
+    def get_delay_ms(self, attempt: int) -> int:
+        return int(min(self.max_delay_ms, self.initial_delay_ms * self.multiplier ** max(0, attempt - 1)))
+
+    def get_delays_ms(self) -> List[int]:
+        """Distinct delays of the policy, each one is a delay queue/topic"""
+        return sorted({self.get_delay_ms(attempt) for attempt in range(1, self.max_attempts)})
+
+
+class FailedMessages(NamedTuple):
+    delayed: Dict[int, List[dict]]  # delay ms -> messages
+    dead: List[dict]
+
+
+def get_retry_policy(handlers_by_event: dict, event: Optional[str]) -> RetryPolicy:
+    """Policy of the event's handler, `"retry_policy"` key of HANDLERS_MAP, or the default one"""
+    handler_info = handlers_by_event.get(event or "", {}) or {}
+    return handler_info.get("retry_policy") or RetryPolicy()
+
+
+def get_retry_delays_ms(handlers_by_event: dict) -> List[int]:
+    delays = set(RetryPolicy().get_delays_ms())
+    for handler_info in handlers_by_event.values():
+        policy = (handler_info or {}).get("retry_policy")
+        if policy is not None:
+            delays.update(policy.get_delays_ms())
+    return sorted(delays)
+
+
+def get_retry_queue_name(queue_name: str | int, delay_ms: int) -> str:
+    return f"{queue_name}.retry.{delay_ms}"
+
+
+def get_dead_letter_queue_name(queue_name: str | int) -> str:
+    return f"{queue_name}.dlq"
+
+
+def route_failed(messages: List[dict], error: BaseException, handlers_by_event: dict) -> FailedMessages:
+    """Counts the failed attempt of every message and splits them into retries by delay and dead letters"""
+    failed = FailedMessages(delayed={}, dead=[])
+    for data in messages:
+        attempt = int(data.get(ATTEMPT_FIELD) or 0) + 1
+        policy = get_retry_policy(handlers_by_event, data.get("event"))
+        data_ = {**data, ATTEMPT_FIELD: attempt, LAST_ERROR_FIELD: f"{type(error).__name__}: {error}"}
+        if attempt < policy.max_attempts:
+            failed.delayed.setdefault(policy.get_delay_ms(attempt), []).append(data_)
+        else:
+            failed.dead.append(data_)
+    if failed.dead:
+        logger.warning(f"{len(failed.dead)} messages are dead-lettered after the last attempt. Reason: {error}")
+    return failed
+
+
+def reset_delivery(data: dict) -> dict:
+    """Message as originally produced, for replay"""
+    return {key: value for key, value in data.items() if key not in DELIVERY_FIELDS}
+
+
+def get_undecodable(body: bytes, error: BaseException) -> dict:
+    """Dead letter of a message that is not valid JSON, replayed with its original body"""
+    return {"raw": body.decode("utf-8", "replace"), LAST_ERROR_FIELD: f"{type(error).__name__}: {error}"}
+
+
+def get_replay_body(data: dict) -> bytes:
+    raw = data.get("raw")
+    if isinstance(raw, str) and set(data) <= {"raw", *DELIVERY_FIELDS}:
+        return raw.encode()
+    return json.dumps(reset_delivery(data), ensure_ascii=False).encode()
@@ -0,0 +1,28 @@
+"""consumed messages expires at
+
+Revision ID: 5f0c2e9b7d41
+Revises: a12d5d39feb5
+Create Date: 2026-10-19 14:12:37.482915
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "5f0c2e9b7d41"
+down_revision = "a12d5d39feb5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index(op.f("ix_consumed_messages_consumed_at"), table_name="consumed_messages")
+    op.alter_column("consumed_messages", "consumed_at", new_column_name="expires_at")
+    op.create_index(op.f("ix_consumed_messages_expires_at"), "consumed_messages", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_consumed_messages_expires_at"), table_name="consumed_messages")
+    op.alter_column("consumed_messages", "expires_at", new_column_name="consumed_at")
+    op.create_index(op.f("ix_consumed_messages_consumed_at"), "consumed_messages", ["consumed_at"], unique=False)
@@ -0,0 +1,47 @@
+"""outbox messages failed at
+
+Revision ID: 9c3e7a1f2b60
+Revises: 5f0c2e9b7d41
+Create Date: 2026-10-19 16:03:18.204317
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9c3e7a1f2b60"
+down_revision = "5f0c2e9b7d41"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("outbox_messages", sa.Column("failed_at", sa.DateTime(), nullable=True))
+    op.drop_index(
+        "ix_outbox_messages_pending", table_name="outbox_messages", postgresql_where=sa.text("sent_at IS NULL")
+    )
+    op.create_index(
+        "ix_outbox_messages_pending",
+        "outbox_messages",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("sent_at IS NULL AND failed_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_outbox_messages_pending",
+        table_name="outbox_messages",
+        postgresql_where=sa.text("sent_at IS NULL AND failed_at IS NULL"),
+    )
+    op.create_index(
+        "ix_outbox_messages_pending",
+        "outbox_messages",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("sent_at IS NULL"),
+    )
+    op.drop_column("outbox_messages", "failed_at")
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, String
+
+from src.app.infrastructure.extensions.psql_ext.psql_ext import Base
+
+
+class ConsumedMessage(Base):
+    """Identity of a claimed or consumed broker message, the durable deduplication store"""
+
+    __tablename__ = "consumed_messages"  # noqa
+    __table_args__ = {"extend_existing": True}
+
+    message_id = Column(String(64), primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)  # then the message may be claimed again
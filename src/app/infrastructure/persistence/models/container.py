@@ -1,5 +1,7 @@
 from typing import List, NamedTuple, Type
 
+from src.app.infrastructure.persistence.models.consumed_message import ConsumedMessage
+from src.app.infrastructure.persistence.models.outbox import OutboxMessage
 from src.app.infrastructure.persistence.models.users import User
 from src.app.infrastructure.extensions.psql_ext.psql_ext import Base
 
@@ -8,6 +10,14 @@ class ModelsContainer(NamedTuple):
     all: List[Type[Base]]
     base: Type[Base]
     user: Type[User]
+    outbox_message: Type[OutboxMessage]
+    consumed_message: Type[ConsumedMessage]
 
 
-container = ModelsContainer(all=[User], base=Base, user=User)
+container = ModelsContainer(
+    all=[User, OutboxMessage, ConsumedMessage],
+    base=Base,
+    user=User,
+    outbox_message=OutboxMessage,
+    consumed_message=ConsumedMessage,
+)
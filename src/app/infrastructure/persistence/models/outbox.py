@@ -0,0 +1,24 @@
+from sqlalchemy import Column, DateTime, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from src.app.infrastructure.persistence.models.mixins import PKMixin
+from src.app.infrastructure.extensions.psql_ext.psql_ext import Base
+
+
+class OutboxMessage(Base, PKMixin):
+    """Message written in the transaction of the change it describes, published later by the outbox relay"""
+
+    __tablename__ = "outbox_messages"  # noqa
+    __table_args__ = (  # type: ignore
+        Index("ix_outbox_messages_pending", "id", postgresql_where=text("sent_at IS NULL AND failed_at IS NULL")),
+        {"extend_existing": True},
+    )
+
+    created_at = Column(DateTime, nullable=False)
+    sent_at = Column(DateTime, nullable=True, default=None)
+    exchanger_name = Column(String(128), nullable=False)
+    queue_name = Column(String(128), nullable=False)
+    event = Column(String(128), nullable=False)
+    data = Column(JSONB, nullable=False, default=dict)
+    attempts = Column(Integer, nullable=False, default=0)
+    failed_at = Column(DateTime, nullable=True, default=None)  # parked after OUTBOX_RELAY_MAX_ATTEMPTS
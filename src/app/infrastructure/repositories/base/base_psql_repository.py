@@ -1,9 +1,10 @@
 import datetime as dt
 import re
+from contextlib import asynccontextmanager
 from copy import deepcopy
 from datetime import datetime
 from dataclasses import fields, make_dataclass
-from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, Type
+from typing import Any, AsyncGenerator, Callable, Dict, Generic, List, Optional, Tuple, Type
 
 from sqlalchemy import (
     delete,
@@ -24,7 +25,9 @@ from sqlalchemy import (
     Integer,
 )
 
-from src.app.infrastructure.extensions.psql_ext.psql_ext import Base, get_session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.infrastructure.extensions.psql_ext.psql_ext import Base, get_session, get_transaction
 from src.app.infrastructure.repositories.base.abstract import (
     AbstractBaseRepository,
     OutRepoGenericType,
@@ -629,6 +632,22 @@ class BasePSQLRepository(AbstractBaseRepository[OutRepoGenericType], Generic[Out
             raise AttributeError("Model class not configured")
         return cls.MODEL
 
+    @classmethod
+    def transaction(cls) -> Any:
+        """`async with repository.transaction() as session` - writes given `session` commit together on exit"""
+        return get_transaction(expire_on_commit=False)
+
+    @classmethod
+    @asynccontextmanager
+    async def _session_scope(cls, session: Optional[AsyncSession] = None) -> AsyncGenerator:
+        """Session of the caller's transaction as is, or a new one committed on exit"""
+        if session is not None:
+            yield session
+            return
+        async with get_session(expire_on_commit=False) as session_:
+            yield session_
+            await session_.commit()
+
     # ==========================================
     # DATACLASS HELPERS
     # ==========================================
@@ -697,7 +716,10 @@ class BasePSQLRepository(AbstractBaseRepository[OutRepoGenericType], Generic[Out
 
     @classmethod
     async def get_first(
-        cls, filter_data: dict, out_dataclass: Optional[Type[OutRepoGenericType]] = None
+        cls,
+        filter_data: dict,
+        out_dataclass: Optional[Type[OutRepoGenericType]] = None,
+        session: Optional[AsyncSession] = None,
     ) -> OutRepoGenericType | None:
         """Get the first record matching the filter criteria"""
         filter_data_ = filter_data.copy()
@@ -705,10 +727,10 @@ class BasePSQLRepository(AbstractBaseRepository[OutRepoGenericType], Generic[Out
         stmt: Select = select(cls.model())
         stmt = cls.query_builder().apply_where(stmt, filter_data=filter_data_, model_class=cls.model())
 
-        async with get_session(expire_on_commit=False) as session:
-            result = await session.execute(stmt)
+        async with cls._session_scope(session) as session_:
+            result = await session_.execute(stmt)
+            raw = result.scalars().first()
 
-        raw = result.scalars().first()
         if raw:
             out_entity_, _ = cls.out_dataclass_with_columns(out_dataclass=out_dataclass)
             entity_data_tmp = {c.key: getattr(raw, c.key) for c in inspect(raw).mapper.column_attrs}
@@ -744,11 +766,37 @@ class BasePSQLRepository(AbstractBaseRepository[OutRepoGenericType], Generic[Out
             items.append(out_entity_(**entity_data_tmp))
         return items
 
+    @classmethod
+    async def get_values(
+        cls,
+        filter_data: dict,
+        columns: Tuple[str, ...],
+        order_data: Optional[Tuple[str]] = ("id",),
+    ) -> List[dict]:
+        """Get only the given columns of records matching the filter criteria as dicts"""
+        filter_data_ = filter_data.copy()
+        model_class = cls.model()
+        selected = [cls.query_builder().validate_model_key(name, model_class) for name in columns]
+
+        stmt: Select = select(*selected)
+        stmt = cls.query_builder().apply_where(stmt, filter_data=filter_data_, model_class=model_class)
+        stmt = cls.query_builder().apply_ordering(stmt, order_data=order_data, model_class=model_class)
+        stmt = cls.query_builder().apply_pagination(stmt, filter_data=filter_data_)
+
+        async with get_session(expire_on_commit=False) as session:
+            result = await session.execute(stmt)
+
+        return [dict(row) for row in result.mappings().all()]
+
     @classmethod
     async def create(
-        cls, data: dict, is_return_require: bool = False, out_dataclass: Optional[Type[OutRepoGenericType]] = None
+        cls,
+        data: dict,
+        is_return_require: bool = False,
+        out_dataclass: Optional[Type[OutRepoGenericType]] = None,
+        session: Optional[AsyncSession] = None,
     ) -> OutRepoGenericType | None:
-        """Create a single record"""
+        """Create a single record, within the caller's transaction if `session` is given"""
         data_copy = data.copy()
 
         # Handle explicit ID if provided, otherwise let database auto-increment
@@ -756,14 +804,13 @@ class BasePSQLRepository(AbstractBaseRepository[OutRepoGenericType], Generic[Out
 
         cls._set_timestamps_on_create(items=[data_copy])
 
-        async with get_session(expire_on_commit=False) as session:
+        async with cls._session_scope(session) as session_:
             if is_return_require:
                 # Use RETURNING to get specific columns instead of the whole model
                 model_class = cls.model()  # type: ignore
                 model_table = model_class.__table__  # type: ignore
                 stmt = insert(model_class).values(data_copy).returning(*model_table.columns.values())
-                result = await session.execute(stmt)
-                await session.commit()
+                result = await session_.execute(stmt)
                 raw = result.fetchone()
                 if raw:
                     out_entity_, out_cols = cls.out_dataclass_with_columns(out_dataclass=out_dataclass)
@@ -780,12 +827,12 @@ class BasePSQLRepository(AbstractBaseRepository[OutRepoGenericType], Generic[Out
             else:
                 if explicit_id_provided:
                     # For explicit ID, use insert statement to handle potential conflicts better
-                    await session.execute(insert(cls.model()).values(data_copy))
+                    await session_.execute(insert(cls.model()).values(data_copy))
                 else:
                     # For auto-increment ID, use ORM method
                     new_obj = cls.model()(**data_copy)  # type: ignore
-                    session.add(new_obj)
-                await session.commit()
+                    session_.add(new_obj)
+                    await session_.flush()
 
         return None
 
@@ -796,8 +843,9 @@ class BasePSQLRepository(AbstractBaseRepository[OutRepoGenericType], Generic[Out
         data: Dict[str, Any],
         is_return_require: bool = False,
         out_dataclass: Optional[Type[OutRepoGenericType]] = None,
+        session: Optional[AsyncSession] = None,
     ) -> OutRepoGenericType | None:
-        """Update records matching the filter criteria"""
+        """Update records matching the filter criteria, within the caller's transaction if `session` is given"""
         data_copy = data.copy()
 
         stmt = update(cls.model())
@@ -808,12 +856,11 @@ class BasePSQLRepository(AbstractBaseRepository[OutRepoGenericType], Generic[Out
         stmt = stmt.values(**data_copy)
         stmt.execution_options(synchronize_session="fetch")
 
-        async with get_session(expire_on_commit=False) as session:
-            await session.execute(stmt)
-            await session.commit()
+        async with cls._session_scope(session) as session_:
+            await session_.execute(stmt)
 
         if is_return_require:
-            return await cls.get_first(filter_data=filter_data, out_dataclass=out_dataclass)
+            return await cls.get_first(filter_data=filter_data, out_dataclass=out_dataclass, session=session)
         return None
 
     @classmethod
@@ -845,16 +892,16 @@ class BasePSQLRepository(AbstractBaseRepository[OutRepoGenericType], Generic[Out
     async def remove(
         cls,
         filter_data: Dict[str, Any],
+        session: Optional[AsyncSession] = None,
     ) -> None:
-        """Delete records matching the filter criteria"""
+        """Delete records matching the filter criteria, within the caller's transaction if `session` is given"""
         if not filter_data:
             filter_data = {}
         stmt = delete(cls.model())
         stmt = cls.query_builder().apply_where(stmt, filter_data=filter_data, model_class=cls.model())
 
-        async with get_session() as session:
-            await session.execute(stmt)
-            await session.commit()
+        async with cls._session_scope(session) as session_:
+            await session_.execute(stmt)
 
     @classmethod
     async def create_bulk(
@@ -862,8 +909,9 @@ class BasePSQLRepository(AbstractBaseRepository[OutRepoGenericType], Generic[Out
         items: List[dict],
         is_return_require: bool = False,
         out_dataclass: Optional[Type[OutRepoGenericType]] = None,
+        session: Optional[AsyncSession] = None,
     ) -> List[OutRepoGenericType] | None:
-        """Create multiple records in a single operation"""
+        """Create multiple records in a single operation, within the caller's transaction if `session` is given"""
         if not items:
             return []
 
@@ -873,16 +921,15 @@ class BasePSQLRepository(AbstractBaseRepository[OutRepoGenericType], Generic[Out
         cls._set_timestamps_on_create(items=items_copy)
 
         # No need to keep objects attached, we use RETURNING clause
-        async with get_session(expire_on_commit=False) as session:
+        async with cls._session_scope(session) as session_:
             model_class = cls.model()  # type: ignore
             model_table = model_class.__table__  # type: ignore
             if is_return_require:
                 # Use RETURNING to get created records efficiently in single query
                 stmt = insert(model_class).values(items_copy).returning(*model_table.columns.values())
-                result = await session.execute(stmt)
-                await session.commit()
+                result = await session_.execute(stmt)
 
-                # Process results immediately after commit, before session closes
+                # Process results before session closes
                 raw_items = result.fetchall()
                 out_entity_, _ = cls.out_dataclass_with_columns(out_dataclass=out_dataclass)
                 created_items = []
@@ -893,8 +940,7 @@ class BasePSQLRepository(AbstractBaseRepository[OutRepoGenericType], Generic[Out
                     created_items.append(out_entity_(**entity_data))
                 return created_items
             else:
-                await session.execute(insert(model_class).values(items_copy))
-                await session.commit()
+                await session_.execute(insert(model_class).values(items_copy))
 
         return None
 
@@ -1,8 +1,10 @@
 import json
-from typing import Any
+from typing import Any, Optional, Tuple
 
 import redis.asyncio as redis
 
+from src.app.config.settings import settings
+from src.app.infrastructure.extensions.redis_ext.client_cache import RedisClientSideCache
 from src.app.infrastructure.extensions.redis_ext.redis_ext import redis_client
 from src.app.infrastructure.repositories.base.abstract import AbstractRepository
 
@@ -10,20 +12,56 @@ from src.app.infrastructure.repositories.base.abstract import AbstractRepository
 class BaseRedisRepository(AbstractRepository):
     client: redis.Redis = redis_client
 
+    # Opt-in: keys with these prefixes are served from a local copy kept coherent
+    # by Redis CLIENT TRACKING (see RedisClientSideCache). Enabled by REDIS_CLIENT_CACHE_ENABLED.
+    CLIENT_SIDE_CACHE_PREFIXES: Tuple[str, ...] = ()
+
     @classmethod
     def get_client(cls) -> redis.Redis:
         return cls.client
 
+    @classmethod
+    def get_client_side_cache(cls) -> Optional[RedisClientSideCache]:
+        if not cls.CLIENT_SIDE_CACHE_PREFIXES or not settings.REDIS_CLIENT_CACHE_ENABLED:
+            return None
+        # Per class attribute, subclasses must not share the parent's local copy
+        local_cache = cls.__dict__.get("_client_side_cache")
+        if local_cache is None:
+            local_cache = RedisClientSideCache(
+                client=cls.get_client(),
+                prefixes=cls.CLIENT_SIDE_CACHE_PREFIXES,
+                max_size=settings.REDIS_CLIENT_CACHE_MAX_SIZE,
+                ttl=settings.REDIS_CLIENT_CACHE_TTL_SECONDS or None,
+            )
+            setattr(cls, "_client_side_cache", local_cache)
+        local_cache.ensure_started()
+        return local_cache
+
+    @classmethod
+    def _evict_local(cls, keys: list) -> None:
+        local_cache = cls.get_client_side_cache()
+        if local_cache is not None:
+            local_cache.evict([str(key) for key in keys])
+
     @classmethod
     async def set(cls, key: str, value: dict, expire_in_seconds: int) -> None:
         client = cls.get_client()
         value_ = json.dumps(value, default=str)
         await client.setex(name=key, value=value_, time=expire_in_seconds)
+        cls._evict_local([key])
 
     @classmethod
     async def get(cls, key: str) -> Any:
         client = cls.get_client()
-        value_ = await client.get(name=key)
+        local_cache = cls.get_client_side_cache()
+        if local_cache is not None and local_cache.is_tracked(key):
+            is_found, value_ = local_cache.lookup(key)
+            if not is_found:
+                token = local_cache.begin_fetch()
+                value_ = await client.get(name=key)
+                local_cache.store(key, value_, token)
+        else:
+            value_ = await client.get(name=key)
         if value_:
             return json.loads(value_)
         return None
@@ -33,6 +71,7 @@ class BaseRedisRepository(AbstractRepository):
         client = cls.get_client()
         for key in keys:
             await client.delete(key)
+        cls._evict_local(keys)
         return None
 
     @classmethod
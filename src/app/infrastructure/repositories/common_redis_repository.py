@@ -10,3 +10,12 @@ class CommonRedisRepository(BaseRedisRepository):
         client = cls.get_client()
         result = await client.ping()
         return result
+
+    @classmethod
+    async def set_if_absent(cls, key: str, value: str, expire_in_seconds: int) -> str:
+        """Stores `value` unless the key exists, returns the stored value"""
+        async with cls.get_client().pipeline(transaction=True) as pipe:
+            pipe.set(key, value, ex=expire_in_seconds, nx=True)
+            pipe.get(key)
+            _, stored = await pipe.execute()
+        return stored.decode() if isinstance(stored, bytes) else stored
@@ -0,0 +1,92 @@
+import datetime as dt
+from typing import Any, List
+
+from sqlalchemy.dialects.postgresql import insert
+
+from src.app.infrastructure.persistence.models.container import container as models_container
+from src.app.infrastructure.repositories.base.base_psql_repository import BasePSQLRepository
+from src.app.infrastructure.repositories.base.base_redis_repository import BaseRedisRepository
+
+
+class ConsumedMessagesRedisRepository(BaseRedisRepository):
+    """Claimed and consumed message IDs as keys expiring after their claim or the deduplication window"""
+
+    KEY_PREFIX = "consumed_message"
+
+    @classmethod
+    def _get_key(cls, message_id: str) -> str:
+        return f"{cls.KEY_PREFIX}:{message_id}"
+
+    @classmethod
+    async def claim(cls, message_ids: List[str], ttl_seconds: int) -> List[str]:
+        """IDs not claimed nor consumed, SET NX of all of them in one round trip"""
+        if not message_ids:
+            return []
+        async with cls.get_client().pipeline(transaction=False) as pipe:
+            for message_id in message_ids:
+                pipe.set(cls._get_key(message_id), 1, nx=True, ex=ttl_seconds)
+            results = await pipe.execute()
+        return [message_id for message_id, is_set in zip(message_ids, results) if is_set]
+
+    @classmethod
+    async def complete(cls, message_ids: List[str], ttl_seconds: int) -> None:
+        """Keep claimed IDs for the deduplication window"""
+        if not message_ids:
+            return None
+        async with cls.get_client().pipeline(transaction=False) as pipe:
+            for message_id in message_ids:
+                pipe.set(cls._get_key(message_id), 1, ex=ttl_seconds)
+            await pipe.execute()
+
+    @classmethod
+    async def release(cls, message_ids: List[str]) -> None:
+        if message_ids:
+            await cls.get_client().delete(*[cls._get_key(i) for i in message_ids])
+
+    @classmethod
+    async def purge(cls) -> None:
+        """Keys expire by themselves"""
+        return None
+
+
+class ConsumedMessagesPSQLRepository(BasePSQLRepository):
+    """Consumed message IDs in a table with a unique key, survives Redis flushes"""
+
+    MODEL = models_container.consumed_message
+
+    @classmethod
+    async def claim(cls, message_ids: List[str], ttl_seconds: int) -> List[str]:
+        """IDs not claimed nor consumed, a single INSERT .. ON CONFLICT taking over expired rows"""
+        if not message_ids:
+            return []
+        model = models_container.consumed_message
+        now = dt.datetime.now(dt.UTC).replace(tzinfo=None)
+        expires_at = now + dt.timedelta(seconds=ttl_seconds)
+        stmt: Any = insert(model).values([{"message_id": i, "expires_at": expires_at} for i in message_ids])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[model.message_id],
+            set_={"expires_at": stmt.excluded.expires_at},
+            where=model.expires_at < now,
+        ).returning(model.message_id)
+        async with cls.transaction() as session:
+            result = await session.execute(stmt)
+            claimed = set(result.scalars().all())
+        return [i for i in message_ids if i in claimed]
+
+    @classmethod
+    async def complete(cls, message_ids: List[str], ttl_seconds: int) -> None:
+        """Keep claimed IDs for the deduplication window"""
+        if not message_ids:
+            return None
+        expires_at = dt.datetime.now(dt.UTC).replace(tzinfo=None) + dt.timedelta(seconds=ttl_seconds)
+        await cls.update(filter_data={"message_id__in": message_ids}, data={"expires_at": expires_at})
+
+    @classmethod
+    async def release(cls, message_ids: List[str]) -> None:
+        if message_ids:
+            await cls.remove(filter_data={"message_id__in": message_ids})
+
+    @classmethod
+    async def purge(cls) -> None:
+        """Drop expired claims and IDs older than the deduplication window"""
+        await cls.remove(filter_data={"expires_at__lt": dt.datetime.now(dt.UTC).replace(tzinfo=None)})
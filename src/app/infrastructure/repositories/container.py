@@ -2,6 +2,14 @@ from typing import NamedTuple, Type
 
 from src.app.infrastructure.repositories.common_psql_repository import CommonPSQLRepository
 from src.app.infrastructure.repositories.common_redis_repository import CommonRedisRepository
+from src.app.infrastructure.repositories.consumed_messages_repository import (
+    ConsumedMessagesPSQLRepository,
+    ConsumedMessagesRedisRepository,
+)
+from src.app.infrastructure.repositories.outbox_repository import OutboxPSQLRepository
+from src.app.infrastructure.repositories.rate_limit_redis_repository import RateLimitRedisRepository
+from src.app.infrastructure.repositories.sessions_redis_repository import SessionsRedisRepository
+from src.app.infrastructure.repositories.users_profile_redis_repository import UsersProfileRedisRepository
 from src.app.infrastructure.repositories.users_repository import UsersPSQLRepository
 
 
@@ -9,11 +17,23 @@ class RepositoriesContainer(NamedTuple):
 
     common_psql_repository: Type[CommonPSQLRepository]
     common_redis_repository: Type[CommonRedisRepository]
+    consumed_messages_psql_repository: Type[ConsumedMessagesPSQLRepository]
+    consumed_messages_redis_repository: Type[ConsumedMessagesRedisRepository]
+    outbox_repository: Type[OutboxPSQLRepository]
+    rate_limit_repository: Type[RateLimitRedisRepository]
+    sessions_repository: Type[SessionsRedisRepository]
     users_repository: Type[UsersPSQLRepository]
+    users_profile_repository: Type[UsersProfileRedisRepository]
 
 
 container = RepositoriesContainer(
     common_psql_repository=CommonPSQLRepository,
     common_redis_repository=CommonRedisRepository,
+    consumed_messages_psql_repository=ConsumedMessagesPSQLRepository,
+    consumed_messages_redis_repository=ConsumedMessagesRedisRepository,
+    outbox_repository=OutboxPSQLRepository,
+    rate_limit_repository=RateLimitRedisRepository,
+    sessions_repository=SessionsRedisRepository,
     users_repository=UsersPSQLRepository,
+    users_profile_repository=UsersProfileRedisRepository,
 )
@@ -0,0 +1,74 @@
+import datetime as dt
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, List, NamedTuple
+
+from sqlalchemy import Select, case, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.infrastructure.persistence.models.container import container as models_container
+from src.app.infrastructure.repositories.base.base_psql_repository import BasePSQLRepository
+
+
+class ClaimedOutbox(NamedTuple):
+    session: AsyncSession  # transaction holding the row locks, see `mark_sent` and `mark_failed`
+    messages: List[dict]
+
+
+class OutboxPSQLRepository(BasePSQLRepository):
+    MODEL = models_container.outbox_message
+
+    @classmethod
+    @asynccontextmanager
+    async def claim(cls, limit: int) -> AsyncGenerator[ClaimedOutbox, None]:
+        """
+        Oldest pending messages, locked for the caller until the block exits.
+
+        Rows are selected FOR UPDATE SKIP LOCKED, so concurrent relays get disjoint
+        batches. Rows marked within the block are committed when it exits normally,
+        the others are released for the next claim; an exception releases all of them.
+        """
+        model = models_container.outbox_message
+        stmt: Select = (
+            select(
+                model.id,
+                model.uuid,
+                model.exchanger_name,
+                model.queue_name,
+                model.event,
+                model.data,
+                model.attempts,
+            )
+            .where(model.sent_at.is_(None), model.failed_at.is_(None))
+            .order_by(model.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        async with cls.transaction() as session:
+            result = await session.execute(stmt)
+            yield ClaimedOutbox(session=session, messages=[dict(row) for row in result.mappings().all()])
+
+    @classmethod
+    async def mark_sent(cls, session: AsyncSession, ids: List[int]) -> None:
+        model = models_container.outbox_message
+        sent_at = dt.datetime.now(dt.UTC).replace(tzinfo=None)
+        await session.execute(
+            update(model).where(model.id.in_(ids)).values(sent_at=sent_at, attempts=model.attempts + 1)
+        )
+
+    @classmethod
+    async def mark_failed(cls, session: AsyncSession, ids: List[int], max_attempts: int) -> int:
+        """Count a failed attempt, messages reaching `max_attempts` are parked. Returns the number parked"""
+        model = models_container.outbox_message
+        failed_at = dt.datetime.now(dt.UTC).replace(tzinfo=None)
+        is_last_attempt: Any = model.attempts + 1 >= max_attempts
+        stmt: Any = (
+            update(model)
+            .where(model.id.in_(ids))
+            .values(
+                attempts=model.attempts + 1,
+                failed_at=case((is_last_attempt, failed_at), else_=None),
+            )
+            .returning(model.failed_at)
+        )
+        result = await session.execute(stmt)
+        return sum(1 for i in result.scalars().all() if i is not None)
@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from typing import Dict, List
+
+from redis.commands.core import AsyncScript
+
+from src.app.infrastructure.repositories.base.abstract import BaseOutEntity
+from src.app.infrastructure.repositories.base.base_redis_repository import BaseRedisRepository
+
+# Token bucket. KEYS[1] - bucket, ARGV: capacity, refill tokens per second, cost
+# Returns {allowed, remaining tokens, retry after ms}
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local refill_per_ms = tonumber(ARGV[2]) / 1000
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill_per_ms)
+
+local allowed = 0
+local retry_after_ms = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after_ms = math.ceil((cost - tokens) / refill_per_ms)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / refill_per_ms))
+return {allowed, math.floor(tokens), retry_after_ms}
+"""
+
+# Sliding window log. KEYS[1] - window, ARGV: limit, window ms, unique member
+# Returns {allowed, remaining requests, retry after ms}
+SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local window_ms = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window_ms)
+local count = redis.call('ZCARD', KEYS[1])
+if count < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window_ms)
+    return {1, limit - count - 1, 0}
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return {0, 0, math.max(1, window_ms - (now - tonumber(oldest[2])))}
+"""
+
+
+@dataclass
+class RateLimitOutEntity(BaseOutEntity):
+    is_allowed: bool
+    remaining: int
+    retry_after_ms: int
+
+
+class RateLimitRedisRepository(BaseRedisRepository):
+    KEY_PREFIX = "rate_limit"
+    SCRIPTS: Dict[str, str] = {
+        "token_bucket": TOKEN_BUCKET_LUA,
+        "sliding_window": SLIDING_WINDOW_LUA,
+    }
+
+    _scripts: Dict[str, AsyncScript] = {}
+
+    @classmethod
+    def _get_script(cls, name: str) -> AsyncScript:
+        script = cls._scripts.get(name)
+        if script is None:
+            # Registered scripts are called with EVALSHA and reloaded on NOSCRIPT
+            script = cls.get_client().register_script(cls.SCRIPTS[name])
+            cls._scripts[name] = script
+        return script
+
+    @classmethod
+    async def load_scripts(cls) -> None:
+        """Preload all scripts into the Redis script cache"""
+        client = cls.get_client()
+        for name, lua in cls.SCRIPTS.items():
+            cls._get_script(name).sha = await client.script_load(lua)
+
+    @classmethod
+    def _get_key(cls, scope: str, identity: str) -> str:
+        return f"{cls.KEY_PREFIX}:{scope}:{identity}"
+
+    @classmethod
+    def _to_out_entity(cls, raw: List[int]) -> RateLimitOutEntity:
+        return RateLimitOutEntity(is_allowed=bool(int(raw[0])), remaining=int(raw[1]), retry_after_ms=int(raw[2]))
+
+    @classmethod
+    async def hit_token_bucket(
+        cls, scope: str, identity: str, capacity: int, refill_per_second: float, cost: int = 1
+    ) -> RateLimitOutEntity:
+        script = cls._get_script("token_bucket")
+        raw = await script(keys=[cls._get_key(scope, identity)], args=[capacity, refill_per_second, cost])
+        return cls._to_out_entity(raw)
+
+    @classmethod
+    async def hit_sliding_window(
+        cls, scope: str, identity: str, limit: int, window_seconds: int, request_id: str
+    ) -> RateLimitOutEntity:
+        script = cls._get_script("sliding_window")
+        raw = await script(keys=[cls._get_key(scope, identity)], args=[limit, window_seconds * 1000, request_id])
+        return cls._to_out_entity(raw)
@@ -0,0 +1,129 @@
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from redis.commands.core import AsyncScript
+
+from src.app.infrastructure.repositories.base.base_redis_repository import BaseRedisRepository
+
+# Refresh token rotation. KEYS[1] - session, ARGV: presented refresh sid, new refresh sid, ttl seconds
+# Returns 1 - rotated, 0 - no such session, -1 - refresh sid already used (replay)
+ROTATE_SESSION_LUA = """
+local current = redis.call('GET', KEYS[1])
+if not current then
+    return 0
+end
+if current ~= ARGV[1] then
+    return -1
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', tonumber(ARGV[3]))
+return 1
+"""
+
+
+class SessionsRedisRepository(BaseRedisRepository):
+    """
+    Auth sessions registry and revocation list.
+
+    `auth:session:{uuid}:{sid}` holds the refresh sid currently allowed for the
+    session, `auth:sessions:{uuid}` indexes sessions of a user. Revoked sessions
+    live in a sorted set scored by the time their last access token expires;
+    a counter next to it lets workers skip reloading an unchanged list.
+    """
+
+    KEY_PREFIX = "auth:session"
+    USER_SESSIONS_KEY_PREFIX = "auth:sessions"
+    REVOKED_KEY = "auth:sessions:revoked"
+    REVOKED_VERSION_KEY = "auth:sessions:revoked:version"
+
+    _scripts: Dict[str, AsyncScript] = {}
+
+    @classmethod
+    def _get_rotate_script(cls) -> AsyncScript:
+        script = cls._scripts.get("rotate")
+        if script is None:
+            script = cls.get_client().register_script(ROTATE_SESSION_LUA)
+            cls._scripts["rotate"] = script
+        return script
+
+    @classmethod
+    def _get_key(cls, uuid: str, sid: str) -> str:
+        return f"{cls.KEY_PREFIX}:{uuid}:{sid}"
+
+    @classmethod
+    def _get_user_sessions_key(cls, uuid: str) -> str:
+        return f"{cls.USER_SESSIONS_KEY_PREFIX}:{uuid}"
+
+    @classmethod
+    async def create_session(cls, uuid: str, sid: str, refresh_sid: str, expire_in_seconds: int) -> None:
+        await cls.create_sessions(items=[(uuid, sid, refresh_sid)], expire_in_seconds=expire_in_seconds)
+
+    @classmethod
+    async def create_sessions(cls, items: List[Tuple[str, str, str]], expire_in_seconds: int) -> None:
+        """Register `(uuid, sid, refresh_sid)` sessions in a single round trip"""
+        if not items:
+            return
+        async with cls.get_client().pipeline(transaction=False) as pipe:
+            for uuid, sid, refresh_sid in items:
+                user_sessions_key = cls._get_user_sessions_key(uuid)
+                pipe.set(name=cls._get_key(uuid, sid), value=refresh_sid, ex=expire_in_seconds)
+                pipe.sadd(user_sessions_key, sid)
+                pipe.expire(name=user_sessions_key, time=expire_in_seconds)
+            await pipe.execute()
+
+    @classmethod
+    async def rotate_session(
+        cls, uuid: str, sid: str, refresh_sid: str, new_refresh_sid: str, expire_in_seconds: int
+    ) -> int:
+        script = cls._get_rotate_script()
+        result = await script(
+            keys=[cls._get_key(uuid, sid)], args=[refresh_sid, new_refresh_sid, expire_in_seconds]
+        )
+        return int(result)
+
+    @classmethod
+    async def get_refresh_sids(cls, items: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """Refresh sids currently allowed for `(uuid, sid)` sessions, None for unknown ones, in one MGET"""
+        if not items:
+            return []
+        values = await cls.get_client().mget([cls._get_key(uuid, sid) for uuid, sid in items])
+        return [i.decode("utf-8") if isinstance(i, bytes) else i for i in values]
+
+    @classmethod
+    async def get_user_sessions(cls, uuid: str) -> List[str]:
+        sids = await cls.get_client().smembers(cls._get_user_sessions_key(uuid))  # type: ignore
+        return sorted(i.decode("utf-8") if isinstance(i, bytes) else str(i) for i in sids)
+
+    @classmethod
+    async def revoke_sessions(cls, uuid: str, sids: List[str], revoked_until: float) -> None:
+        """Drop sessions from the registry and list them as revoked until `revoked_until` (unix time)"""
+        if not sids:
+            return
+        async with cls.get_client().pipeline(transaction=True) as pipe:
+            pipe.delete(*[cls._get_key(uuid, sid) for sid in sids])
+            pipe.srem(cls._get_user_sessions_key(uuid), *sids)
+            pipe.zadd(cls.REVOKED_KEY, {f"{uuid}:{sid}": revoked_until for sid in sids})
+            pipe.incr(cls.REVOKED_VERSION_KEY)
+            await pipe.execute()
+
+    @classmethod
+    async def get_revoked_version(cls) -> int:
+        return int(await cls.get_client().get(cls.REVOKED_VERSION_KEY) or 0)
+
+    @classmethod
+    async def get_revoked(cls) -> Tuple[int, List[str]]:
+        """Current `(version, members)` of the revocation list, expired entries are purged"""
+        async with cls.get_client().pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(cls.REVOKED_KEY, "-inf", time.time())
+            pipe.get(cls.REVOKED_VERSION_KEY)
+            pipe.zrange(cls.REVOKED_KEY, 0, -1)
+            _, version, members = await pipe.execute()
+        return int(version or 0), [i.decode("utf-8") if isinstance(i, bytes) else str(i) for i in members]
+
+    @classmethod
+    async def get_revoked_members(cls, members: List[str]) -> Set[str]:
+        """Members of the revocation list among the given ones"""
+        if not members:
+            return set()
+        scores: List[Optional[float]] = await cls.get_client().zmscore(cls.REVOKED_KEY, members)
+        now = time.time()
+        return {member for member, score in zip(members, scores) if score is not None and score > now}
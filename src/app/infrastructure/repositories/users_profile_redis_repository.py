@@ -0,0 +1,64 @@
+import json
+from typing import Iterable, Optional, Tuple
+
+from src.app.infrastructure.repositories.base.base_redis_repository import BaseRedisRepository
+
+
+class UsersProfileRedisRepository(BaseRedisRepository):
+    """
+    Compact user profile snapshots keyed by uuid.
+
+    Each snapshot records the profile version it was built from. Writers bump
+    the version after commit, so a snapshot built from a row read before the
+    write never matches the current version again.
+    """
+
+    KEY_PREFIX = "users:profile"
+    CLIENT_SIDE_CACHE_PREFIXES = ("users:profile:",)
+
+    @classmethod
+    def _get_key(cls, uuid: str) -> str:
+        return f"{cls.KEY_PREFIX}:{uuid}"
+
+    @classmethod
+    def _get_version_key(cls, uuid: str) -> str:
+        return f"{cls.KEY_PREFIX}:{uuid}:version"
+
+    @classmethod
+    async def get_snapshot(cls, uuid: str) -> Tuple[Optional[dict], int]:
+        """Return `(data, version)`, data is None unless the snapshot matches the current version"""
+        version_key, key = cls._get_version_key(uuid), cls._get_key(uuid)
+        if cls.get_client_side_cache() is not None:
+            version_raw, snapshot = await cls.get(version_key), await cls.get(key)
+        else:
+            version_raw, snapshot_raw = await cls.get_client().mget([version_key, key])
+            snapshot = json.loads(snapshot_raw) if snapshot_raw else None
+
+        version = int(version_raw or 0)
+        if snapshot and snapshot.get("version") == version:
+            return snapshot.get("data"), version
+        return None, version
+
+    @classmethod
+    async def set_snapshot(cls, uuid: str, version: int, data: dict, expire_in_seconds: int) -> None:
+        """Store a snapshot built from `version`, the version key outlives it"""
+        version_key, key = cls._get_version_key(uuid), cls._get_key(uuid)
+        value_ = json.dumps({"version": version, "data": data}, default=str)
+        async with cls.get_client().pipeline(transaction=False) as pipe:
+            pipe.setex(name=key, value=value_, time=expire_in_seconds)
+            pipe.expire(name=version_key, time=expire_in_seconds * 2)
+            await pipe.execute()
+        cls._evict_local([key])
+
+    @classmethod
+    async def bump_versions(cls, uuids: Iterable[str], expire_in_seconds: int) -> None:
+        """Invalidate snapshots of the given users"""
+        version_keys = [cls._get_version_key(uuid) for uuid in set(uuids)]
+        if not version_keys:
+            return
+        async with cls.get_client().pipeline(transaction=False) as pipe:
+            for version_key in version_keys:
+                pipe.incr(name=version_key)
+                pipe.expire(name=version_key, time=expire_in_seconds * 2)
+            await pipe.execute()
+        cls._evict_local(version_keys)
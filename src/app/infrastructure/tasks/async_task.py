@@ -0,0 +1,95 @@
+import asyncio
+import inspect
+from typing import Any, Optional
+
+from celery import Task
+from celery.signals import worker_process_init, worker_process_shutdown
+from loguru import logger
+
+from src.app.infrastructure.extensions.psql_ext.psql_ext import default_engine
+from src.app.infrastructure.extensions.redis_ext.redis_ext import redis_client
+from src.app.infrastructure.messaging.mq_client import mq_client
+from src.app.infrastructure.repositories.container import container as repo_container
+
+# Event loop of the worker process, Postgres, Redis and broker pools are bound to it
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Loop of the worker process, created on first use where worker_process_init is not sent (solo pool)"""
+    global _worker_loop
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+    return _worker_loop
+
+
+async def warm_up_pools() -> None:
+    """Opens pooled connections before the first task, a failed one is opened again by the task"""
+    checks = {
+        "psql": repo_container.common_psql_repository.is_healthy,
+        "redis": repo_container.common_redis_repository.is_healthy,
+        "message_broker": mq_client.is_healthy,
+    }
+    results = await asyncio.gather(*[check() for check in checks.values()], return_exceptions=True)
+    for name, result in zip(checks, results):
+        if result is not True:
+            reason = result if isinstance(result, BaseException) else "not healthy"
+            logger.warning(f"Worker pool {name} is not warmed up. Reason: {reason}")
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs: Any) -> None:
+    """
+    Forked worker processes drop connections inherited from the parent, the
+    pools then connect in the loop of the process.
+    """
+    default_engine.sync_engine.dispose(close=False)
+    redis_client.connection_pool.reset()
+    get_worker_loop().run_until_complete(warm_up_pools())
+
+
+async def close_pools() -> None:
+    """Closes pooled connections of the worker loop, one failed pool doesn't keep the others open"""
+    closers = {
+        "message_broker": mq_client.close,
+        "redis": redis_client.connection_pool.disconnect,
+        "psql": default_engine.dispose,
+    }
+    for name, close in closers.items():
+        try:
+            await close()
+        except Exception as ex:
+            logger.warning(f"Worker pool {name} is not closed. Reason: {ex}")
+
+
+def close_worker_loop() -> None:
+    """Closes the loop of the worker process, the next task creates a new one"""
+    global _worker_loop
+    loop, _worker_loop = _worker_loop, None
+    if loop is not None and not loop.is_closed():
+        loop.close()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs: Any) -> None:
+    if _worker_loop is not None and not _worker_loop.is_closed():
+        _worker_loop.run_until_complete(close_pools())
+    close_worker_loop()
+
+
+class AsyncTask(Task):
+    """
+    Base of Celery tasks defined as coroutine functions. Tasks of a worker
+    process run one at a time in its long-lived event loop, so Postgres, Redis
+    and broker pools stay warm across tasks. For prefork and solo pools.
+
+        @celery_app.task(base=AsyncTask)
+        async def some_task(**kwargs: dict) -> None: ...
+    """
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        result = super().__call__(*args, **kwargs)
+        if inspect.isawaitable(result):
+            return get_worker_loop().run_until_complete(result)
+        return result
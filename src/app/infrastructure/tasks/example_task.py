@@ -1,11 +1,11 @@
 import asyncio
 import random
 
+from src.app.infrastructure.tasks.async_task import AsyncTask
 from src.app.interfaces.cli.celery_app import celery_app
 
 
-@celery_app.task()
-def say_meow(*args: tuple, **kwargs: dict) -> str:
-    e_loop = asyncio.get_event_loop()
-    e_loop.run_until_complete(asyncio.sleep(random.randint(5, 25)))
+@celery_app.task(base=AsyncTask)
+async def say_meow(*args: tuple, **kwargs: dict) -> str:
+    await asyncio.sleep(random.randint(5, 25))
     return "meow"
@@ -1,9 +1,17 @@
-from fastapi import Depends
-from fastapi.security import HTTPBearer
+import hashlib
+import secrets
+from typing import Optional
+
+from fastapi import Depends, Request
+from fastapi.security import APIKeyHeader, HTTPBearer
 
 from src.app.application.container import container as app_svc_container
+from src.app.application.services.rate_limit_service import RateLimitAlgorithm
+from src.app.config.settings import settings
+from src.app.domain.common.exceptions import AppException, AuthenticationError
 
 auth_api_key_schema = HTTPBearer()
+service_api_key_schema = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 
 async def validate_api_key(auth_api_key: str = Depends(auth_api_key_schema)) -> str:
@@ -13,5 +21,95 @@ async def validate_api_key(auth_api_key: str = Depends(auth_api_key_schema)) ->
 
 async def validate_auth_data(auth_api_key: str = Depends(auth_api_key_schema)) -> dict:
     auth_api_key_ = str(auth_api_key.credentials).replace("Bearer ", "")  # type: ignore
-    decoded = app_svc_container.auth_service.verify_access_token(auth_api_key_)
+    decoded = await app_svc_container.auth_service.verify_access_token(auth_api_key_)
     return decoded.to_dict()
+
+
+async def validate_service_api_key(service_api_key: Optional[str] = Depends(service_api_key_schema)) -> None:
+    """Service-to-service endpoints, allowed only with AUTH_SERVICE_API_KEY configured and presented"""
+    expected = settings.AUTH_SERVICE_API_KEY
+    if not expected or not service_api_key or not secrets.compare_digest(service_api_key, expected):
+        raise AuthenticationError(message="Invalid API key", details=[])
+
+
+def get_client_ip(request: Request) -> str:
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded_for = request.headers.get("X-Forwarded-For", "")
+        if forwarded_for:
+            return forwarded_for.split(",")[0].strip()
+    return request.client.host if request.client else ""
+
+
+class RateLimit:
+    """
+    Dependency rejecting requests over the limit with 429 and Retry-After header.
+
+    key_by:
+        "ip" - client address
+        "email" - `email` field of the JSON body (hashed)
+        "user" - uuid of the authenticated user
+        "route" - one quota shared by all callers
+    """
+
+    KEY_BY_OPTIONS = ("ip", "email", "user", "route")
+
+    def __init__(
+        self,
+        scope: str,
+        limit: int,
+        period_seconds: int,
+        key_by: str = "ip",
+        algorithm: RateLimitAlgorithm = RateLimitAlgorithm.TOKEN_BUCKET,
+    ) -> None:
+        if key_by not in self.KEY_BY_OPTIONS:
+            raise ValueError(f"Unknown key_by: '{key_by}'. Available: {list(self.KEY_BY_OPTIONS)}")
+        self.scope = scope
+        self.limit = limit
+        self.period_seconds = period_seconds
+        self.key_by = key_by
+        self.algorithm = algorithm
+
+    async def __call__(self, request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return None
+        identity = await self._get_identity(request)
+        if not identity:
+            return None
+        await app_svc_container.rate_limit_service.hit(
+            scope=self.scope,
+            identity=identity,
+            limit=self.limit,
+            period_seconds=self.period_seconds,
+            algorithm=self.algorithm,
+        )
+        return None
+
+    async def _get_identity(self, request: Request) -> Optional[str]:
+        if self.key_by == "route":
+            return "all"
+        if self.key_by == "email":
+            return await self._get_email_identity(request)
+        if self.key_by == "user":
+            return await self._get_user_identity(request)
+        return get_client_ip(request)
+
+    @staticmethod
+    async def _get_email_identity(request: Request) -> Optional[str]:
+        try:
+            body = await request.json()
+        except Exception:
+            return None
+        email = body.get("email") if isinstance(body, dict) else None
+        if not email:
+            return None
+        return hashlib.sha256(str(email).strip().lower().encode("utf-8")).hexdigest()
+
+    @staticmethod
+    async def _get_user_identity(request: Request) -> Optional[str]:
+        token = request.headers.get("Authorization", "").replace("Bearer ", "")
+        if not token:
+            return None
+        try:
+            return (await app_svc_container.auth_service.verify_access_token(token)).uuid
+        except AppException:
+            return None
@@ -14,6 +14,8 @@ from src.app.domain.common.exceptions import (
     AlreadyExistsError,
     AuthenticationError,
     AuthorizationError,
+    TooManyRequestsError,
+    ServiceUnavailableError,
     AppException,
 )
 from src.app.interfaces.cli.main import app
@@ -73,6 +75,18 @@ async def exception_handler_authorization_error(request: Request, exc: Authoriza
     return _create_error_resp(exc, status.HTTP_403_FORBIDDEN)
 
 
+@app.exception_handler(TooManyRequestsError)
+async def exception_handler_too_many_requests_error(request: Request, exc: TooManyRequestsError) -> JSONResponse:
+    return _create_error_resp(exc, status.HTTP_429_TOO_MANY_REQUESTS)
+
+
+@app.exception_handler(ServiceUnavailableError)
+async def exception_handler_service_unavailable_error(
+    request: Request, exc: ServiceUnavailableError
+) -> JSONResponse:
+    return _create_error_resp(exc, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
 # ==========================================
 # FastAPI Exceptions
 # ==========================================
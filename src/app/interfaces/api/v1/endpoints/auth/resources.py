@@ -4,16 +4,47 @@ from typing import Annotated
 from fastapi import APIRouter, Body, Depends
 
 from src.app.application.container import container as app_svc_container
-from src.app.interfaces.api.core.dependencies import validate_api_key
+from src.app.application.services.rate_limit_service import RateLimitAlgorithm
+from src.app.config.settings import settings
+from src.app.interfaces.api.core.dependencies import RateLimit, validate_api_key, validate_service_api_key
+from src.app.interfaces.api.v1.endpoints.auth.schemas.req_schemas import LogoutReq
 from src.app.interfaces.api.v1.endpoints.auth.schemas.req_schemas import SignUpReq
 from src.app.interfaces.api.v1.endpoints.auth.schemas.req_schemas import TokenReq
+from src.app.interfaces.api.v1.endpoints.auth.schemas.req_schemas import TokensBatchReq
+from src.app.interfaces.api.v1.endpoints.auth.schemas.req_schemas import TokensVerifyBatchReq
 from src.app.interfaces.api.v1.endpoints.auth.schemas.resp_schemas import SignupResp
 from src.app.interfaces.api.v1.endpoints.auth.schemas.resp_schemas import TokenResp
+from src.app.interfaces.api.v1.endpoints.auth.schemas.resp_schemas import TokensBatchResp
+from src.app.interfaces.api.v1.endpoints.auth.schemas.resp_schemas import TokensVerifyBatchResp
 
 router = APIRouter(prefix="/auth")
 
+# Both endpoints run bcrypt, shed abusive clients before reaching it
+sign_up_ip_rate_limit = RateLimit(
+    scope="auth:sign-up",
+    limit=settings.RATE_LIMIT_AUTH_REQUESTS,
+    period_seconds=settings.RATE_LIMIT_AUTH_PERIOD_SECONDS,
+)
+tokens_ip_rate_limit = RateLimit(
+    scope="auth:tokens",
+    limit=settings.RATE_LIMIT_AUTH_REQUESTS,
+    period_seconds=settings.RATE_LIMIT_AUTH_PERIOD_SECONDS,
+)
+tokens_email_rate_limit = RateLimit(
+    scope="auth:tokens:email",
+    limit=settings.RATE_LIMIT_AUTH_EMAIL_REQUESTS,
+    period_seconds=settings.RATE_LIMIT_AUTH_EMAIL_PERIOD_SECONDS,
+    key_by="email",
+    algorithm=RateLimitAlgorithm.SLIDING_WINDOW,
+)
 
-@router.post(path="/sign-up/", response_model=SignupResp, name="sign-up")
+
+@router.post(
+    path="/sign-up/",
+    response_model=SignupResp,
+    name="sign-up",
+    dependencies=[Depends(sign_up_ip_rate_limit)],
+)
 async def sign_up(data: Annotated[SignUpReq, Body()]) -> dict:
 
     user_dto = await app_svc_container.users_service.create_user_by_email(
@@ -24,7 +55,12 @@ async def sign_up(data: Annotated[SignUpReq, Body()]) -> dict:
     return asdict(user_dto)
 
 
-@router.post(path="/tokens/", response_model=TokenResp, name="tokens pair")
+@router.post(
+    path="/tokens/",
+    response_model=TokenResp,
+    name="tokens pair",
+    dependencies=[Depends(tokens_ip_rate_limit), Depends(tokens_email_rate_limit)],
+)
 async def tokens(
     data: TokenReq,
 ) -> dict:
@@ -34,7 +70,7 @@ async def tokens(
         email=data.email, password=data.password
     )
 
-    token_pair = app_svc_container.auth_service.create_tokens_for_user(uuid=str(user_dto.uuid))
+    token_pair = await app_svc_container.auth_service.create_tokens_for_user(uuid=str(user_dto.uuid))
     tokens_data = {
         "user_data": {"uuid": str(user_dto.uuid)},
         "access": token_pair.access_token,
@@ -46,7 +82,7 @@ async def tokens(
 
 @router.post(path="/tokens/refresh/", response_model=TokenResp, name="refresh tokens")
 async def tokens_refreshed(auth_api_key: str = Depends(validate_api_key)) -> dict:
-    """Get new access, refresh tokens [Granted by refresh token in header]"""
+    """Get new access, refresh tokens [Granted by refresh token in header, usable once]"""
 
     user_dto, token_pair = await app_svc_container.auth_service.refresh_tokens(auth_api_key)
     tokens_data = {
@@ -56,3 +92,49 @@ async def tokens_refreshed(auth_api_key: str = Depends(validate_api_key)) -> dic
     }
 
     return tokens_data
+
+
+@router.post(path="/logout/", status_code=204, name="logout")
+async def logout(
+    data: Annotated[LogoutReq, Body()] = LogoutReq(),
+    auth_api_key: str = Depends(validate_api_key),
+) -> None:
+    """Revoke the session of the access token in header [or all sessions of the user]"""
+
+    await app_svc_container.auth_service.logout(access_token=auth_api_key, is_all_sessions=data.all_sessions)
+
+
+@router.post(
+    path="/batch/tokens/",
+    response_model=TokensBatchResp,
+    name="tokens pairs batch",
+    dependencies=[Depends(validate_service_api_key)],
+)
+async def tokens_batch(data: TokensBatchReq) -> dict:
+    """Get access, refresh tokens for many users [Service-to-service, X-API-Key header]"""
+
+    token_pairs = await app_svc_container.auth_service.create_tokens_batch(uuids=data.uuids)
+    results = [
+        {"uuid": uuid, "access": token_pair.access_token, "refresh": token_pair.refresh_token}
+        for uuid, token_pair in zip(data.uuids, token_pairs)
+    ]
+    return {"results": results}
+
+
+@router.post(
+    path="/batch/tokens/verify/",
+    response_model=TokensVerifyBatchResp,
+    name="verify tokens batch",
+    dependencies=[Depends(validate_service_api_key)],
+)
+async def tokens_verify_batch(data: TokensVerifyBatchReq) -> dict:
+    """Verify many tokens of one type, results keep the order of tokens [Service-to-service, X-API-Key header]"""
+
+    decoded_items = await app_svc_container.auth_service.verify_tokens_batch(
+        tokens=data.tokens, token_type=data.token_type
+    )
+    results = [
+        {"is_valid": True, "uuid": i.uuid, "sid": i.sid, "exp": i.exp} if i else {"is_valid": False}
+        for i in decoded_items
+    ]
+    return {"results": results}
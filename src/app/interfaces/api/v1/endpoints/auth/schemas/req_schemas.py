@@ -1,3 +1,8 @@
+from typing import List
+
+from pydantic import Field
+
+from src.app.config.settings import settings
 from src.app.interfaces.api.core.schemas.req_schemas import BaseReq
 
 
@@ -9,3 +14,16 @@ class TokenReq(BaseReq):
 class SignUpReq(BaseReq):
     email: str
     password: str
+
+
+class LogoutReq(BaseReq):
+    all_sessions: bool = False
+
+
+class TokensBatchReq(BaseReq):
+    uuids: List[str] = Field(max_length=settings.AUTH_BATCH_MAX_SIZE)
+
+
+class TokensVerifyBatchReq(BaseReq):
+    tokens: List[str] = Field(max_length=settings.AUTH_BATCH_MAX_SIZE)
+    token_type: str = "access"
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from src.app.interfaces.api.core.schemas.resp_schemas import BaseResp
 
@@ -18,3 +18,24 @@ class SignupResp(BaseResp):
     first_name: Optional[str]
     last_name: Optional[str]
     email: str
+
+
+class TokenPairResp(BaseResp):
+    uuid: str
+    access: str
+    refresh: str
+
+
+class TokensBatchResp(BaseResp):
+    results: List[TokenPairResp]
+
+
+class VerifiedTokenResp(BaseResp):
+    is_valid: bool
+    uuid: Optional[str] = None
+    sid: Optional[str] = None
+    exp: Optional[int] = None
+
+
+class TokensVerifyBatchResp(BaseResp):
+    results: List[VerifiedTokenResp]
@@ -1,11 +1,12 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Body, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from starlette.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
 
 from src.app.application.container import container as services_container
 from src.app.config.settings import settings
+from src.app.infrastructure.common.metrics import PROMETHEUS_CONTENT_TYPE, metrics_registry
 from src.app.infrastructure.messaging.mq_client import mq_client
 from src.app.interfaces.api.v1.endpoints.debug.schemas.req_schemas import MessageReq
 
@@ -41,13 +42,33 @@ async def send_message(
     )
 
 
+@router.get("/liveness/", status_code=200)
+async def liveness() -> JSONResponse:
+    """
+    Liveness probe, answers while the process serves requests without checking dependencies
+    """
+    is_alive = services_container.common_service.is_alive()
+    return JSONResponse(content={"status": "OK" if is_alive else "NOT OK"})
+
+
 @router.get("/health-check/", status_code=200)
 async def health_check(
     request: Request,
 ) -> JSONResponse:
-    is_healthy = await services_container.common_service.is_healthy()
+    """
+    Readiness probe, the dependencies status refreshed in the background
+    """
+    is_healthy = await services_container.common_service.get_status()
     status = "OK" if is_healthy else "NOT OK"
     status_code = HTTP_200_OK if is_healthy else HTTP_400_BAD_REQUEST
     resp = JSONResponse(content={"status": status}, status_code=status_code)
 
     return resp
+
+
+@router.get("/metrics/", status_code=200)
+async def metrics() -> Response:
+    """
+    Metrics of the API process in Prometheus text format. Consumers serve theirs on CONSUMER_METRICS_PORT.
+    """
+    return Response(content=metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,5 +1,3 @@
-from dataclasses import asdict
-
 from fastapi import APIRouter, Depends
 
 from src.app.interfaces.api.core.dependencies import validate_auth_data
@@ -13,7 +11,5 @@ router = APIRouter(prefix="/users")
 async def get_users(
     auth_data: dict = Depends(validate_auth_data),
 ) -> dict:
-    user = await services_container.users_service.get_first(filter_data={"uuid": auth_data["uuid"]})
-    if user:
-        return asdict(user)
-    return {}
+    profile = await services_container.users_service.get_profile(uuid=auth_data["uuid"])
+    return profile or {}
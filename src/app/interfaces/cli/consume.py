@@ -1,24 +1,81 @@
 import asyncio
 import inspect
-from typing import Any, Dict
+import signal
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Iterator, List, Optional
 
 from loguru import logger
 
 from src.app.config.celery import default_queue
 from src.app.config.settings import settings
+from src.app.infrastructure.common.metrics import metrics_registry, start_metrics_server
 from src.app.infrastructure.tasks.example_task import say_meow
+from src.app.infrastructure.messaging.deduplication import get_deduplicator
 from src.app.infrastructure.messaging.mq_client import mq_client
 
+# event -> {"handler": ..., "celery_queue": ...}, "batch_handler" - async callable taking a list of event data,
+# "retry_policy" - RetryPolicy of failed messages instead of the CONSUMER_RETRY_* defaults.
+# Handlers with "celery_queue" are Celery tasks for heavy jobs, coroutine functions without it run in the
+# consumer, limited by "max_concurrency" and "timeout_seconds" (CONSUMER_HANDLER_* settings by default).
 HANDLERS_MAP: dict = {"say_meow": {"handler": say_meow, "celery_queue": default_queue}}
 
+# event -> limit of its in-process handler runs, created in the consumer's event loop
+_handler_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+UNKNOWN_EVENT = "unknown"  # label of events without handlers, keeps label values bounded
+
+messages_counter = metrics_registry.counter(
+    "mq_consumer_messages_total", "Consumed messages by event and outcome", ("event", "status")
+)
+event_latency_histogram = metrics_registry.histogram(
+    "mq_consumer_event_handling_seconds", "Time spent handling or dispatching a message or batch", ("event",)
+)
+backlog_gauge = metrics_registry.gauge(
+    "mq_consumer_backlog_messages",
+    "Messages waiting for consumers: Kafka lag by partition, RabbitMQ queue depth",
+    ("exchanger", "queue"),
+)
+
+
+@contextmanager
+def observe_event(event: str, count: int = 1) -> Iterator[None]:
+    """Counts messages of the event by outcome and observes the handling time"""
+    started = time.perf_counter()
+    status = "failed"
+    try:
+        yield
+        status = "handled"
+    finally:
+        event_latency_histogram.observe(time.perf_counter() - started, event=event)
+        messages_counter.inc(count, event=event, status=status)
+
+
+async def run_async_handler(event: str, handler_info: Dict[str, Any], call: Callable[[], Awaitable]) -> None:
+    """Runs an in-process handler within its concurrency limit and timeout, a timeout fails the message"""
+    semaphore = _handler_semaphores.get(event)
+    if semaphore is None:
+        max_concurrency = handler_info.get("max_concurrency") or settings.CONSUMER_HANDLER_MAX_CONCURRENCY
+        semaphore = _handler_semaphores[event] = asyncio.Semaphore(max_concurrency)
+    timeout = handler_info.get("timeout_seconds") or settings.CONSUMER_HANDLER_TIMEOUT_SECONDS
+    async with semaphore, asyncio.timeout(timeout):
+        await call()
+
 
 async def queue_processing_aggregator(data: dict, handlers_by_event: Dict[str, Dict[str, Any]]) -> None:
     """Calls required trigger handler depend queue message"""
 
     event = data.get("event") or ""
-    event_data = data.get("data", None)
-
     handler_info = handlers_by_event.get(event, {}) or {}
+    with observe_event(event if handler_info else UNKNOWN_EVENT):
+        await dispatch(event, data, handler_info)
+
+    return None
+
+
+async def dispatch(event: str, data: dict, handler_info: Dict[str, Any]) -> None:
+    """Sends the event to its Celery task or runs its in-process handler"""
+    event_data = data.get("data", None)
     handler_func = handler_info.get("handler", None)
     celery_queue = handler_info.get("celery_queue")
     if not handler_func:
@@ -27,55 +84,151 @@ async def queue_processing_aggregator(data: dict, handlers_by_event: Dict[str, D
     if celery_queue:
         handler_func.apply_async(queue=celery_queue, kwargs=event_data)
         logger.info(f"Sent {event} execution {handler_func.__name__}")
-    elif inspect.isawaitable(handler_func):
-        await handler_func(**event_data)  # type: ignore
-        logger.info(f"Sent {event} execution {handler_func.__name__}")  # type: ignore
+    elif inspect.iscoroutinefunction(handler_func):
+        await run_async_handler(event, handler_info, lambda: handler_func(**(event_data or {})))
+        logger.info(f"Handled {event} by {handler_func.__name__}")
     else:
         logger.warning(f"Can't process {event} with data: {str(data)}")
 
+
+async def queue_batch_processing_aggregator(
+    messages: List[dict], handlers_by_event: Dict[str, Dict[str, Any]]
+) -> None:
+    """Calls batch handlers with data of all messages of their event, other events go one by one"""
+
+    messages_by_event: Dict[str, List[dict]] = {}
+    for data in messages:
+        messages_by_event.setdefault(data.get("event") or "", []).append(data)
+
+    for event, items in messages_by_event.items():
+        batch_handler = (handlers_by_event.get(event, {}) or {}).get("batch_handler")
+        if not batch_handler:
+            for data in items:
+                await queue_processing_aggregator(data, handlers_by_event)
+            continue
+        handler_info = handlers_by_event[event]
+        with observe_event(event, count=len(items)):
+            await run_async_handler(
+                event, handler_info, lambda: batch_handler([data.get("data") or {} for data in items])
+            )
+        logger.info(f"Sent {event} batch of {len(items)} execution {batch_handler.__name__}")
+
     return None
 
 
-if __name__ == "__main__":
+def run_until_signal(e_loop: asyncio.AbstractEventLoop, coro: Coroutine) -> None:
+    """Runs consuming until SIGINT/SIGTERM, consumers then finish and ack in-flight messages"""
+    consume_task = e_loop.create_task(coro)
 
-    try:
-        e_loop = asyncio.get_running_loop()
-    except RuntimeError:
-        e_loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(e_loop)
+    def stop() -> None:
+        # Repeated signals (Ctrl+C reaches the supervisor's workers too) must not interrupt the drain
+        if not consume_task.cancelling():
+            consume_task.cancel()
 
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        e_loop.add_signal_handler(sig, stop)
+    try:
+        e_loop.run_until_complete(consume_task)
+    except asyncio.CancelledError:
+        logger.info("Consumer stopped")
+    finally:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            e_loop.remove_signal_handler(sig)
+
+
+def wait_for_readiness(e_loop: asyncio.AbstractEventLoop) -> bool:
+    """Waits up to two minutes for the message broker"""
+    sleep_before = 120
+    slept = 10
+    logger.info("Waiting for readiness ..")
+    e_loop.run_until_complete(asyncio.sleep(slept))
+
+    is_healthy = e_loop.run_until_complete(mq_client.is_healthy())
+    while slept < sleep_before and not is_healthy:
+        logger.info(f"Waiting for readiness {slept}/{sleep_before} sec..")
+        sleep_ = 15
+        e_loop.run_until_complete(asyncio.sleep(sleep_))
+        slept += sleep_
+        is_healthy = e_loop.run_until_complete(mq_client.is_healthy())
+    logger.info("READY.." if is_healthy else "NOT READY!")
+    return is_healthy
+
+
+def count_handled(aggregator: Callable, on_handled: Callable[[int], None], is_batch: bool = False) -> Callable:
+    """Aggregator reporting the number of messages it went through"""
+
+    async def counting_aggregator(data: Any, handlers_by_event: Dict[str, Dict[str, Any]]) -> None:
+        try:
+            await aggregator(data, handlers_by_event)
+        finally:
+            on_handled(len(data) if is_batch else 1)
+
+    return counting_aggregator
+
+
+async def sample_backlog(queues: List[str | int], exchanger_name: str, interval_seconds: float) -> None:
+    """Updates the backlog gauge of the consumed queues/partitions every `interval_seconds`"""
+    while True:
+        try:
+            backlog = await mq_client.get_backlog(exchanger_name=exchanger_name, queues=queues)
+            for queue_name, messages in backlog.items():
+                backlog_gauge.set(messages, exchanger=exchanger_name, queue=queue_name)
+        except Exception as ex:
+            logger.warning(f"Backlog sampling failed. Reason: {ex}")
+        await asyncio.sleep(interval_seconds)
+
+
+async def consume_with_metrics(
+    consume: Coroutine, queues: List[str | int], exchanger_name: str, metrics_port: int
+) -> None:
+    """Consumes while sampling the backlog, metrics are served on `metrics_port` unless it is 0"""
+    server = await start_metrics_server(metrics_port) if metrics_port else None
+    sampler = asyncio.create_task(
+        sample_backlog(queues, exchanger_name, settings.CONSUMER_BACKLOG_SAMPLE_INTERVAL_SECONDS)
+    )
     try:
+        await consume
+    finally:
+        sampler.cancel()
+        await asyncio.gather(sampler, return_exceptions=True)
+        if server is not None:
+            server.close()
+
+
+def run_consumer(
+    queues: List[str | int],
+    exchanger_name: str,
+    on_handled: Optional[Callable[[int], None]] = None,
+    metrics_port: int = settings.CONSUMER_METRICS_PORT,
+) -> None:
+    """Consumes queues/partitions in a new event loop until SIGINT/SIGTERM"""
+    e_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(e_loop)
+
+    wait_for_readiness(e_loop)
+
+    aggregator_: Callable = queue_processing_aggregator
+    batch_aggregator_: Callable = queue_batch_processing_aggregator
+    if on_handled is not None:
+        aggregator_ = count_handled(aggregator_, on_handled)
+        batch_aggregator_ = count_handled(batch_aggregator_, on_handled, is_batch=True)
+    consume = mq_client.consume(
+        queues=queues,
+        exchanger_name=exchanger_name,
+        aggregator=aggregator_,
+        handlers_by_event=HANDLERS_MAP,
+        batch_aggregator=batch_aggregator_,
+        batch_size=settings.CONSUMER_BATCH_SIZE,
+        batch_timeout_ms=settings.CONSUMER_BATCH_TIMEOUT_MS,
+        deduplicator=get_deduplicator(),
+    )
+    run_until_signal(e_loop, consume_with_metrics(consume, queues, exchanger_name, metrics_port))
+    e_loop.run_until_complete(mq_client.close())
 
-        # =================================================
-        # WAIT FOR READINESS
-        # =================================================
-        sleep_before = 120
-        slept = 10
-        logger.info("Waiting for readiness ..")
-        e_loop.run_until_complete(asyncio.sleep(slept))
 
-        is_healthy = e_loop.run_until_complete(mq_client.is_healthy())
-        while slept < sleep_before and not is_healthy:
-            logger.info(f"Waiting for readiness {slept}/{sleep_before} sec..")
-            sleep_ = 15
-            e_loop.run_until_complete(asyncio.sleep(sleep_))
-            slept += sleep_
-            is_healthy = e_loop.run_until_complete(mq_client.is_healthy())
-        logger.info("READY.." if is_healthy else "NOT READY!")
-
-        # =================================================
-        # RUN CONSUMER
-        # =================================================
-
-        handlers_by_event_ = HANDLERS_MAP
-        aggregator_ = queue_processing_aggregator
-        e_loop.run_until_complete(
-            mq_client.consume(
-                queues=[settings.DEFAULT_QUEUE],
-                exchanger_name=settings.DEFAULT_EXCHANGER,
-                aggregator=aggregator_,
-                handlers_by_event=handlers_by_event_,
-            )
-        )
+if __name__ == "__main__":
+
+    try:
+        run_consumer(queues=[settings.DEFAULT_QUEUE], exchanger_name=settings.DEFAULT_EXCHANGER)
     except Exception as e:
         logger.warning(f"Error: {str(e)}")
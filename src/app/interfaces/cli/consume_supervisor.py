@@ -0,0 +1,166 @@
+import argparse
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.context import SpawnProcess
+from multiprocessing.sharedctypes import Synchronized
+from typing import Dict, List, NamedTuple, Optional
+
+from loguru import logger
+
+from src.app.config.settings import settings
+from src.app.infrastructure.messaging.mq_client import BrokerType, mq_client
+
+spawn_context = multiprocessing.get_context("spawn")
+
+
+class ConsumerWorker(NamedTuple):
+    queues: List[str | int]
+    handled: Synchronized  # messages handled by the worker, shared with the supervisor
+
+
+def assign_queues(queues: List[str | int], workers: int, is_exclusive: bool) -> List[List[str | int]]:
+    """
+    Queues of every worker. Exclusive queues (Kafka partitions) go to exactly one
+    worker, extra workers are not started; shared queues (RabbitMQ) are consumed
+    by all workers as competing consumers when there are fewer queues than workers.
+    """
+    if not queues:
+        return []
+    if len(queues) < workers and not is_exclusive:
+        return [list(queues) for _ in range(workers)]
+    workers_ = min(workers, len(queues))
+    return [list(queues[i::workers_]) for i in range(workers_)]
+
+
+def run_worker(queues: List[str | int], exchanger_name: str, handled: Synchronized, metrics_port: int) -> None:
+    """Worker process entry point, reports handled messages to the supervisor"""
+    from src.app.interfaces.cli.consume import run_consumer
+
+    def on_handled(count: int) -> None:
+        # Called once per message or batch, the value is private to the worker so the lock is uncontended
+        with handled.get_lock():
+            handled.value += count
+
+    run_consumer(queues=queues, exchanger_name=exchanger_name, on_handled=on_handled, metrics_port=metrics_port)
+
+
+class ConsumerSupervisor:
+    """
+    Runs consumer worker processes, restarts crashed ones with backoff and logs
+    per-worker throughput every `report_interval` seconds. SIGINT/SIGTERM stop
+    the workers, they finish and ack in-flight messages first.
+    """
+
+    RESTART_BACKOFF_MAX_SECONDS = 30
+    STOP_TIMEOUT_SECONDS = settings.RABBITMQ_CONSUMER_DRAIN_TIMEOUT_SECONDS + 10
+
+    def __init__(self, queues: List[str | int], exchanger_name: str, workers: int, report_interval: int) -> None:
+        is_exclusive = mq_client.message_broker_type == BrokerType.KAFKA.value
+        self.exchanger_name = exchanger_name
+        self.report_interval = report_interval
+        self.workers = [
+            ConsumerWorker(queues=i, handled=spawn_context.Value("Q", 0))
+            for i in assign_queues(queues, workers, is_exclusive)
+        ]
+        self.processes: Dict[int, SpawnProcess] = {}
+        self.restarts: Dict[int, int] = {}
+        self.started_at: Dict[int, float] = {}
+        self.is_stopping = False
+
+    def start_worker(self, index: int) -> None:
+        worker = self.workers[index]
+        process = spawn_context.Process(
+            target=run_worker,
+            args=(worker.queues, self.exchanger_name, worker.handled, self.get_metrics_port(index)),
+            name=f"consumer-{index}",
+            daemon=False,
+        )
+        process.start()
+        self.processes[index] = process
+        self.started_at[index] = time.monotonic()
+        logger.info(f"Worker {index} [pid {process.pid}] consumes {worker.queues}")
+
+    @staticmethod
+    def get_metrics_port(index: int) -> int:
+        """Every worker serves its own metrics, on CONSUMER_METRICS_PORT + worker index"""
+        return settings.CONSUMER_METRICS_PORT + index if settings.CONSUMER_METRICS_PORT else 0
+
+    def restart_crashed(self) -> None:
+        for index, process in self.processes.items():
+            if process.is_alive() or self.is_stopping:
+                continue
+            restarts = self.restarts.get(index, 0)
+            # Workers crashing right after start back off, the ones that ran for a while restart at once
+            if time.monotonic() - self.started_at[index] > self.RESTART_BACKOFF_MAX_SECONDS:
+                restarts = 0
+            backoff = min(self.RESTART_BACKOFF_MAX_SECONDS, 2**restarts - 1)
+            if time.monotonic() - self.started_at[index] < backoff:
+                continue
+            logger.warning(f"Worker {index} [pid {process.pid}] exited with {process.exitcode}, restarting")
+            self.restarts[index] = restarts + 1
+            self.start_worker(index)
+
+    def report(self, handled_before: List[int], elapsed: float) -> List[int]:
+        handled = [i.handled.value for i in self.workers]
+        rates = {index: round((handled[index] - handled_before[index]) / elapsed, 1) for index in self.processes}
+        logger.info(f"Consumers throughput, messages/s by worker: {rates}, total: {round(sum(rates.values()), 1)}")
+        return handled
+
+    def stop(self, *args: object) -> None:
+        self.is_stopping = True
+
+    def run(self) -> None:
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        for index in range(len(self.workers)):
+            self.start_worker(index)
+
+        handled = [0] * len(self.workers)
+        reported_at = time.monotonic()
+        while not self.is_stopping:
+            time.sleep(1)
+            self.restart_crashed()
+            if time.monotonic() - reported_at >= self.report_interval:
+                handled = self.report(handled, time.monotonic() - reported_at)
+                reported_at = time.monotonic()
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        logger.info(f"Stopping {len(self.processes)} workers..")
+        for process in self.processes.values():
+            if process.is_alive() and process.pid:
+                os.kill(process.pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.STOP_TIMEOUT_SECONDS
+        for process in self.processes.values():
+            process.join(timeout=max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"Worker [pid {process.pid}] did not stop in time, killing")
+                process.kill()
+                process.join()
+
+
+def parse_queues(value: Optional[str]) -> List[str | int]:
+    """Comma separated queue names or Kafka partitions"""
+    items = [i.strip() for i in (value or "").split(",") if i.strip()]
+    return [int(i) if i.isdigit() else i for i in items]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run consumers in worker processes")
+    parser.add_argument("--exchanger", default=settings.DEFAULT_EXCHANGER, help="Exchange name, Topic")
+    parser.add_argument(
+        "--queues", default=settings.DEFAULT_QUEUE, help="Queue names, Partitions, comma separated"
+    )
+    parser.add_argument("--workers", type=int, default=settings.CONSUMER_SUPERVISOR_WORKERS or os.cpu_count() or 1)
+    parser.add_argument(
+        "--report-interval", type=int, default=settings.CONSUMER_SUPERVISOR_REPORT_INTERVAL_SECONDS
+    )
+    args = parser.parse_args()
+    ConsumerSupervisor(
+        queues=parse_queues(args.queues),
+        exchanger_name=args.exchanger,
+        workers=args.workers,
+        report_interval=args.report_interval,
+    ).run()
@@ -4,8 +4,11 @@ from fastapi import FastAPI
 from loguru import logger
 from starlette.middleware.cors import CORSMiddleware
 
+from src.app.application.container import container as app_svc_container
 from src.app.interfaces.api.routers import api_router
 from src.app.infrastructure.common.log_utils import logging_setup
+from src.app.infrastructure.extensions.redis_ext.client_cache import close_client_side_caches
+from src.app.infrastructure.messaging.mq_client import mq_client
 from src.app.config.settings import settings
 
 
@@ -42,14 +45,21 @@ def on_startup_app_handler(
     application: FastAPI,
 ) -> Callable:  # type: ignore
     async def start_app() -> None:
-        pass
+        await app_svc_container.rate_limit_service.load_scripts()
+        await app_svc_container.auth_service.calibrate_password_hashing()
+        await app_svc_container.session_service.start()
+        await app_svc_container.common_service.start()
 
     return start_app
 
 
 def on_shutdown_handler(application: FastAPI) -> Callable:  # type: ignore
     async def stop_app() -> None:
-        pass
+        await app_svc_container.common_service.stop()
+        await app_svc_container.session_service.stop()
+        await close_client_side_caches()
+        await mq_client.close()
+        app_svc_container.auth_service.shutdown()
         # TODO call required functions on stop_app
 
     return stop_app
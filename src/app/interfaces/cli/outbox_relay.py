@@ -0,0 +1,26 @@
+import asyncio
+import signal
+
+from loguru import logger
+
+from src.app.application.container import container as app_svc_container
+from src.app.infrastructure.messaging.mq_client import mq_client
+
+
+async def run_relay() -> None:
+    """Publishes outbox messages until SIGINT/SIGTERM, an interrupted batch is released for the next run"""
+    relay_task = asyncio.create_task(app_svc_container.outbox_service.run_relay())
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, relay_task.cancel)
+    logger.info("Outbox relay started..")
+    try:
+        await relay_task
+    except asyncio.CancelledError:
+        logger.info("Outbox relay stopped")
+    finally:
+        await mq_client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_relay())
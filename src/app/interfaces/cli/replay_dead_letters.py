@@ -0,0 +1,27 @@
+import argparse
+import asyncio
+
+from loguru import logger
+
+from src.app.config.settings import settings
+from src.app.infrastructure.messaging.mq_client import mq_client
+
+
+async def replay_dead_letters(exchanger_name: str, queue_name: str | int, limit: int) -> None:
+    """Moves dead-lettered messages back to the queue they failed on"""
+    try:
+        replayed = await mq_client.replay_dead_letters(
+            exchanger_name=exchanger_name, queue_name=queue_name, limit=limit
+        )
+        logger.info(f"Replayed {replayed} dead letters of {exchanger_name}|{queue_name}")
+    finally:
+        await mq_client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay dead-lettered messages")
+    parser.add_argument("--exchanger", default=settings.DEFAULT_EXCHANGER, help="Exchange name, Topic")
+    parser.add_argument("--queue", default=settings.DEFAULT_QUEUE, help="Queue name, Partition")
+    parser.add_argument("--limit", type=int, default=10000, help="Max messages to replay")
+    args = parser.parse_args()
+    asyncio.run(replay_dead_letters(exchanger_name=args.exchanger, queue_name=args.queue, limit=args.limit))
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: auth.proto
+# Protobuf Python Version: 6.31.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+
+_runtime_version.ValidateProtobufRuntimeVersion(_runtime_version.Domain.PUBLIC, 6, 31, 1, "", "auth.proto")
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
+    b'\n\nauth.proto\x12\x0cgrpc.pb.auth" \n\x0f\x43reateTokensReq\x12\r\n\x05uuids\x18\x01 \x03(\t":\n\tTokenPair\x12\x0c\n\x04uuid\x18\x01 \x01(\t\x12\x0e\n\x06\x61\x63\x63\x65ss\x18\x02 \x01(\t\x12\x0f\n\x07refresh\x18\x03 \x01(\t":\n\x10\x43reateTokensResp\x12&\n\x05items\x18\x01 \x03(\x0b\x32\x17.grpc.pb.auth.TokenPair"5\n\x0fVerifyTokensReq\x12\x0e\n\x06tokens\x18\x01 \x03(\t\x12\x12\n\ntoken_type\x18\x02 \x01(\t"I\n\rVerifiedToken\x12\x10\n\x08is_valid\x18\x01 \x01(\x08\x12\x0c\n\x04uuid\x18\x02 \x01(\t\x12\x0b\n\x03sid\x18\x03 \x01(\t\x12\x0b\n\x03\x65xp\x18\x04 \x01(\x03">\n\x10VerifyTokensResp\x12*\n\x05items\x18\x01 \x03(\x0b\x32\x1b.grpc.pb.auth.VerifiedToken2\xaf\x01\n\x0b\x41uthService\x12O\n\x0c\x43reateTokens\x12\x1d.grpc.pb.auth.CreateTokensReq\x1a\x1e.grpc.pb.auth.CreateTokensResp"\x00\x12O\n\x0cVerifyTokens\x12\x1d.grpc.pb.auth.VerifyTokensReq\x1a\x1e.grpc.pb.auth.VerifyTokensResp"\x00\x62\x06proto3'
+)
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, "auth_pb2", _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+    DESCRIPTOR._loaded_options = None
+    _globals["_CREATETOKENSREQ"]._serialized_start = 28
+    _globals["_CREATETOKENSREQ"]._serialized_end = 60
+    _globals["_TOKENPAIR"]._serialized_start = 62
+    _globals["_TOKENPAIR"]._serialized_end = 120
+    _globals["_CREATETOKENSRESP"]._serialized_start = 122
+    _globals["_CREATETOKENSRESP"]._serialized_end = 180
+    _globals["_VERIFYTOKENSREQ"]._serialized_start = 182
+    _globals["_VERIFYTOKENSREQ"]._serialized_end = 235
+    _globals["_VERIFIEDTOKEN"]._serialized_start = 237
+    _globals["_VERIFIEDTOKEN"]._serialized_end = 310
+    _globals["_VERIFYTOKENSRESP"]._serialized_start = 312
+    _globals["_VERIFYTOKENSRESP"]._serialized_end = 374
+    _globals["_AUTHSERVICE"]._serialized_start = 377
+    _globals["_AUTHSERVICE"]._serialized_end = 552
+# @@protoc_insertion_point(module_scope)
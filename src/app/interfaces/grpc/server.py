@@ -5,8 +5,12 @@ import asyncio
 from concurrent import futures
 from loguru import logger
 from src.app.config.settings import settings, LaunchMode
+from src.app.application.container import container as services_container
+from src.app.infrastructure.messaging.mq_client import mq_client
+from src.app.interfaces.grpc.pb.auth import auth_pb2_grpc
 from src.app.interfaces.grpc.pb.debug import debug_pb2_grpc
 from src.app.interfaces.grpc.pb.example import example_pb2_grpc
+from src.app.interfaces.grpc.services.auth_service import AuthService
 from src.app.interfaces.grpc.services.debug_service import DebugService
 from src.app.interfaces.grpc.services.example_service import ExampleService
 
@@ -19,12 +23,18 @@ async def serve() -> None:
     server = grpc.aio.server(
         migration_thread_pool=futures.ThreadPoolExecutor(max_workers=max_workers), interceptors=interceptors
     )
+    auth_pb2_grpc.add_AuthServiceServicer_to_server(AuthService(), server)
     debug_pb2_grpc.add_DebugServiceServicer_to_server(DebugService(), server)
     example_pb2_grpc.add_ExampleServiceServicer_to_server(ExampleService(), server)
     server.add_insecure_port(settings.GRPC_URL)
     await server.start()
+    await services_container.common_service.start()
     logger.info(f"GRPC server started {settings.GRPC_URL} on {max_workers} workers")
-    await server.wait_for_termination()
+    try:
+        await server.wait_for_termination()
+    finally:
+        await services_container.common_service.stop()
+        await mq_client.close()
 
 
 if __name__ == "__main__":
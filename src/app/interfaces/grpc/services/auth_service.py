@@ -0,0 +1,51 @@
+import secrets
+
+import grpc
+
+from src.app.config.settings import settings
+from src.app.application.container import container as services_container
+from src.app.domain.common.exceptions import ValidationError
+from src.app.interfaces.grpc.pb.auth import auth_pb2 as pb2
+from src.app.interfaces.grpc.pb.auth.auth_pb2_grpc import AuthServiceServicer
+
+
+class AuthService(AuthServiceServicer):
+    """Batch token issuance and verification for internal services, `x-api-key` metadata required."""
+
+    async def _check_api_key(self, context) -> None:  # type: ignore
+        metadata = dict(context.invocation_metadata() or ())
+        api_key = metadata.get("x-api-key", "")
+        expected = settings.AUTH_SERVICE_API_KEY
+        if not expected or not api_key or not secrets.compare_digest(api_key, expected):
+            await context.abort(grpc.StatusCode.UNAUTHENTICATED, "Invalid API key")
+
+    async def CreateTokens(self, request, context) -> pb2.CreateTokensResp:  # type: ignore
+        await self._check_api_key(context)
+        uuids = list(request.uuids)
+        try:
+            token_pairs = await services_container.auth_service.create_tokens_batch(uuids=uuids)
+        except ValidationError as ex:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, ex.message)
+        items = [
+            pb2.TokenPair(uuid=uuid, access=token_pair.access_token, refresh=token_pair.refresh_token)  # type: ignore
+            for uuid, token_pair in zip(uuids, token_pairs)
+        ]
+        return pb2.CreateTokensResp(items=items)  # type: ignore
+
+    async def VerifyTokens(self, request, context) -> pb2.VerifyTokensResp:  # type: ignore
+        await self._check_api_key(context)
+        try:
+            decoded_items = await services_container.auth_service.verify_tokens_batch(
+                tokens=list(request.tokens), token_type=request.token_type or "access"
+            )
+        except ValidationError as ex:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, ex.message)
+        items = [
+            (
+                pb2.VerifiedToken(is_valid=True, uuid=i.uuid, sid=i.sid, exp=int(i.exp or 0))  # type: ignore
+                if i
+                else pb2.VerifiedToken(is_valid=False)  # type: ignore
+            )
+            for i in decoded_items
+        ]
+        return pb2.VerifyTokensResp(items=items)  # type: ignore
@@ -26,6 +26,6 @@ class DebugService(DebugServiceServicer):
         return pb2.MessageResp(status=True, message="OK")  # type: ignore
 
     async def HealthCheck(self, request, context) -> pb2.HealthCheckResp:  # type: ignore
-        is_healthy = await services_container.common_service.is_healthy()
+        is_healthy = await services_container.common_service.get_status()
         status = "SERVING" if is_healthy else "NOT_SERVING"
         return pb2.HealthCheckResp(status=status)  # type: ignore
@@ -0,0 +1,77 @@
+from asyncio import AbstractEventLoop
+from unittest.mock import patch
+
+import pytest
+
+from src.app.application.container import container as service_container
+from src.app.config.settings import settings
+from src.app.domain.auth.container import container as domain_auth_container
+from src.app.domain.common.exceptions import ValidationError
+from src.app.domain.common.utils.common import generate_str
+
+
+def test_auth_tokens_batch(e_loop: AbstractEventLoop) -> None:
+    auth_service = service_container.auth_service
+    uuids = [generate_str(16) for _ in range(20)]
+
+    token_pairs = e_loop.run_until_complete(auth_service.create_tokens_batch(uuids))
+    tokens = [i.access_token for i in token_pairs] + ["invalid", token_pairs[0].refresh_token]
+    decoded_items = e_loop.run_until_complete(auth_service.verify_tokens_batch(tokens))
+
+    assert len(decoded_items) == len(tokens)
+    assert [i.uuid if i else None for i in decoded_items] == uuids + [None, None]
+
+    refresh_tokens = [i.refresh_token for i in token_pairs]
+    decoded_items = e_loop.run_until_complete(
+        auth_service.verify_tokens_batch(refresh_tokens, token_type="refresh")
+    )
+    assert [i.uuid if i else None for i in decoded_items] == uuids
+
+
+@pytest.mark.skipif(not settings.AUTH_SESSIONS_ENABLED, reason="Auth sessions disabled")
+def test_auth_tokens_batch_revoked(e_loop: AbstractEventLoop) -> None:
+    auth_service = service_container.auth_service
+    uuids = [generate_str(16) for _ in range(3)]
+
+    token_pairs = e_loop.run_until_complete(auth_service.create_tokens_batch(uuids))
+    e_loop.run_until_complete(auth_service.logout(token_pairs[1].access_token))
+    decoded_items = e_loop.run_until_complete(
+        auth_service.verify_tokens_batch([i.access_token for i in token_pairs])
+    )
+
+    assert [i is not None for i in decoded_items] == [True, False, True]
+
+
+def test_auth_tokens_batch_validation(e_loop: AbstractEventLoop) -> None:
+    auth_service = service_container.auth_service
+
+    with patch.object(settings, "AUTH_BATCH_MAX_SIZE", 2):
+        with pytest.raises(ValidationError):
+            e_loop.run_until_complete(auth_service.create_tokens_batch(["1", "2", "3"]))
+        with pytest.raises(ValidationError):
+            e_loop.run_until_complete(auth_service.verify_tokens_batch(["1", "2", "3"]))
+    with pytest.raises(ValidationError):
+        e_loop.run_until_complete(auth_service.verify_tokens_batch(["1"], token_type="unknown"))
+
+
+@pytest.mark.skipif(not settings.AUTH_SESSIONS_ENABLED, reason="Auth sessions disabled")
+def test_auth_tokens_batch_refresh_rotated(e_loop: AbstractEventLoop) -> None:
+    auth_service = service_container.auth_service
+    session_service = service_container.session_service
+    jwt_service = domain_auth_container.jwt_service
+    uuids = [generate_str(16) for _ in range(3)]
+
+    token_pairs = e_loop.run_until_complete(auth_service.create_tokens_batch(uuids))
+    decoded = jwt_service.verify_refresh_token(token_pairs[0].refresh_token)
+    sid = jwt_service.get_session_sid(decoded)
+    rotated = jwt_service.create_token_pair(uuids[0], sid=sid)
+    e_loop.run_until_complete(
+        session_service.rotate(uuids[0], sid=sid, refresh_sid=decoded.sid, new_refresh_sid=rotated.refresh_sid)
+    )
+    e_loop.run_until_complete(auth_service.logout(token_pairs[2].access_token))
+
+    refresh_tokens = [i.refresh_token for i in token_pairs] + [rotated.refresh_token]
+    decoded_items = e_loop.run_until_complete(
+        auth_service.verify_tokens_batch(refresh_tokens, token_type="refresh")
+    )
+    assert [i.uuid if i else None for i in decoded_items] == [None, uuids[1], None, uuids[0]]
@@ -0,0 +1,36 @@
+from asyncio import AbstractEventLoop
+from unittest.mock import patch
+
+from src.app.application.container import container as app_services_container
+from src.app.config.settings import settings
+from src.app.domain.auth.container import container as domain_auth_container
+from src.app.infrastructure.repositories.container import container as repo_container
+
+
+def test_calibrate_password_hashing_adopts_shared_rounds(e_loop: AbstractEventLoop) -> None:
+    app_auth_service = app_services_container.auth_service
+    auth_service = domain_auth_container.auth_service
+    redis_repository = repo_container.common_redis_repository
+
+    def calibrate(rounds: int) -> int:
+        with patch.object(auth_service, "calibrate", return_value=rounds):
+            return e_loop.run_until_complete(app_auth_service.calibrate_password_hashing())
+
+    with (
+        patch.object(auth_service, "rounds", 12),
+        patch.object(settings, "PASSWORD_HASHING_TARGET_MS", 60 * 1000),
+    ):
+        key = app_auth_service.get_password_hashing_rounds_key()
+        e_loop.run_until_complete(redis_repository.delete([key]))
+        first = calibrate(rounds=5)
+        second = calibrate(rounds=6)  # another process measured a different cost
+        second_rounds = auth_service.rounds
+        with patch.object(settings, "PASSWORD_HASHING_TARGET_MS", 30 * 1000):
+            changed_key = app_auth_service.get_password_hashing_rounds_key()
+            e_loop.run_until_complete(redis_repository.delete([changed_key]))
+            changed = calibrate(rounds=4)  # a changed target isn't pinned by the shared cost
+        e_loop.run_until_complete(redis_repository.delete([key, changed_key]))
+
+    assert first == 5
+    assert second == second_rounds == 5
+    assert changed == 4
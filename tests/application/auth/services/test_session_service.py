@@ -0,0 +1,67 @@
+from asyncio import AbstractEventLoop
+
+import pytest
+
+from src.app.application.container import container as service_container
+from src.app.config.settings import settings
+from src.app.domain.auth.container import container as domain_auth_container
+from src.app.domain.common.exceptions import AuthenticationError
+from src.app.domain.common.utils.common import generate_str
+
+pytestmark = pytest.mark.skipif(not settings.AUTH_SESSIONS_ENABLED, reason="Auth sessions disabled")
+
+
+def test_session_refresh_rotation(e_loop: AbstractEventLoop) -> None:
+    session_service = service_container.session_service
+    jwt_service = domain_auth_container.jwt_service
+    uuid = generate_str(16)
+
+    token_pair = jwt_service.create_token_pair(uuid)
+    e_loop.run_until_complete(session_service.create(uuid, sid=token_pair.sid, refresh_sid=token_pair.refresh_sid))
+
+    rotated = jwt_service.create_token_pair(uuid, sid=token_pair.sid)
+    e_loop.run_until_complete(
+        session_service.rotate(
+            uuid, sid=token_pair.sid, refresh_sid=token_pair.refresh_sid, new_refresh_sid=rotated.refresh_sid
+        )
+    )
+    assert rotated.sid == token_pair.sid
+    assert e_loop.run_until_complete(session_service.is_revoked(uuid, sid=token_pair.sid)) is False
+
+    # Replaying the already rotated refresh token revokes the whole session
+    with pytest.raises(AuthenticationError):
+        e_loop.run_until_complete(
+            session_service.rotate(
+                uuid, sid=token_pair.sid, refresh_sid=token_pair.refresh_sid, new_refresh_sid=generate_str(8)
+            )
+        )
+    assert e_loop.run_until_complete(session_service.is_revoked(uuid, sid=token_pair.sid)) is True
+    with pytest.raises(AuthenticationError):
+        e_loop.run_until_complete(
+            session_service.rotate(
+                uuid, sid=token_pair.sid, refresh_sid=rotated.refresh_sid, new_refresh_sid=generate_str(8)
+            )
+        )
+
+
+def test_session_revoke_all(e_loop: AbstractEventLoop) -> None:
+    session_service = service_container.session_service
+    jwt_service = domain_auth_container.jwt_service
+    uuid = generate_str(16)
+
+    token_pairs = [jwt_service.create_token_pair(uuid) for _ in range(3)]
+    for token_pair in token_pairs:
+        e_loop.run_until_complete(
+            session_service.create(uuid, sid=token_pair.sid, refresh_sid=token_pair.refresh_sid)
+        )
+    e_loop.run_until_complete(session_service.refresh_revocation_filter())
+    assert session_service.revocation_filter is not None
+
+    e_loop.run_until_complete(session_service.revoke_all(uuid))
+    e_loop.run_until_complete(session_service.refresh_revocation_filter())
+
+    for token_pair in token_pairs:
+        assert f"{uuid}:{token_pair.sid}" in session_service.revocation_filter
+        assert e_loop.run_until_complete(session_service.is_revoked(uuid, sid=token_pair.sid)) is True
+        with pytest.raises(AuthenticationError):
+            e_loop.run_until_complete(service_container.auth_service.verify_access_token(token_pair.access_token))
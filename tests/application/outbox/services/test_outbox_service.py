@@ -0,0 +1,142 @@
+from asyncio import AbstractEventLoop
+from typing import Any, Generator, List, Optional
+from unittest.mock import patch
+
+import pytest
+
+from src.app.application.container import container as service_container
+from src.app.application.dto.user import UserShortDTO
+from src.app.config.settings import settings
+from src.app.domain.common.utils.common import generate_str
+
+
+class FakeMQClient:
+    def __init__(self, is_failing: bool = False, rejected_queues: Optional[List[str]] = None) -> None:
+        self.is_failing = is_failing
+        self.rejected_queues = rejected_queues or []
+        self.produced: List[dict] = []
+
+    async def is_healthy(self) -> bool:
+        return not self.is_failing
+
+    async def produce_messages(self, exchanger_name: str, queue_name: str | int, messages: List[dict]) -> None:
+        if self.is_failing:
+            raise ConnectionError("Broker is down")
+        if queue_name in self.rejected_queues:
+            raise ValueError("Exchange type mismatch")
+        self.produced.append({"exchanger_name": exchanger_name, "queue_name": queue_name, "messages": messages})
+
+
+@pytest.fixture(scope="function")
+def outbox(e_loop: AbstractEventLoop) -> Generator:
+    repository = service_container.outbox_service.repository
+    e_loop.run_until_complete(repository.remove(filter_data={}))
+    yield repository
+    e_loop.run_until_complete(repository.remove(filter_data={}))
+
+
+def add_messages(
+    e_loop: AbstractEventLoop, outbox: Any, count: int, queue_name: Optional[str] = None
+) -> List[str]:
+    events = [f"test_event_{generate_str(8)}" for _ in range(count)]
+
+    async def add() -> None:
+        async with outbox.transaction() as session:
+            await service_container.outbox_service.add_many(
+                session, items=[(i, {"n": i}) for i in events], queue_name=queue_name
+            )
+
+    e_loop.run_until_complete(add())
+    return events
+
+
+def test_outbox_relay_publishes_and_marks_sent(e_loop: AbstractEventLoop, outbox: Any) -> None:
+    events = add_messages(e_loop, outbox, count=3)
+    mq_client = FakeMQClient()
+
+    with patch("src.app.application.services.outbox_service.mq_client", mq_client):
+        published = e_loop.run_until_complete(service_container.outbox_service.relay_batch())
+        published_again = e_loop.run_until_complete(service_container.outbox_service.relay_batch())
+
+    assert (published, published_again) == (3, 0)
+    assert len(mq_client.produced) == 1
+    assert [i["event"] for i in mq_client.produced[0]["messages"]] == events
+    assert e_loop.run_until_complete(outbox.count(filter_data={"sent_at__e": None})) == 0
+
+
+def test_outbox_relay_failure_releases_batch(e_loop: AbstractEventLoop, outbox: Any) -> None:
+    add_messages(e_loop, outbox, count=2)
+
+    with patch("src.app.application.services.outbox_service.mq_client", FakeMQClient(is_failing=True)):
+        published = e_loop.run_until_complete(service_container.outbox_service.relay_batch())
+
+    items = e_loop.run_until_complete(outbox.get_list(filter_data={}))
+    assert published == 0
+    assert len(items) == 2
+    # broker outages don't count towards parking
+    assert all(i.sent_at is None and i.failed_at is None and i.attempts == 0 for i in items)
+
+
+def test_outbox_relay_parks_poison_messages(e_loop: AbstractEventLoop, outbox: Any) -> None:
+    poison_events = add_messages(e_loop, outbox, count=1, queue_name="poison")
+    events = add_messages(e_loop, outbox, count=2)
+    mq_client = FakeMQClient(rejected_queues=["poison"])
+
+    with patch("src.app.application.services.outbox_service.mq_client", mq_client):
+        published = [
+            e_loop.run_until_complete(service_container.outbox_service.relay_batch())
+            for _ in range(settings.OUTBOX_RELAY_MAX_ATTEMPTS + 1)
+        ]
+    new_events = add_messages(e_loop, outbox, count=1)
+    with patch("src.app.application.services.outbox_service.mq_client", mq_client):
+        published.append(e_loop.run_until_complete(service_container.outbox_service.relay_batch(limit=1)))
+
+    assert published == [2] + [0] * settings.OUTBOX_RELAY_MAX_ATTEMPTS + [1]
+    # healthy messages are published once, next to the failing ones
+    assert [i["event"] for batch in mq_client.produced for i in batch["messages"]] == events + new_events
+    poison = e_loop.run_until_complete(outbox.get_first(filter_data={"event": poison_events[0]}))
+    assert poison.sent_at is None and poison.failed_at is not None
+    assert poison.attempts == settings.OUTBOX_RELAY_MAX_ATTEMPTS
+
+
+def test_outbox_claims_are_disjoint(e_loop: AbstractEventLoop, outbox: Any) -> None:
+    add_messages(e_loop, outbox, count=4)
+
+    async def claim_twice() -> tuple:
+        async with outbox.claim(limit=3) as first:
+            async with outbox.claim(limit=10) as second:
+                return [i["id"] for i in first.messages], [i["id"] for i in second.messages]
+
+    first_ids, second_ids = e_loop.run_until_complete(claim_twice())
+
+    assert len(first_ids) == 3
+    assert len(second_ids) == 1
+    assert not set(first_ids) & set(second_ids)
+
+
+def test_outbox_written_with_change(e_loop: AbstractEventLoop, outbox: Any) -> None:
+    users_repository = service_container.users_service.repository
+    email = f"outbox_{generate_str(6)}@gmail.com".lower()
+
+    async def create_user(is_failing: bool) -> None:
+        async with users_repository.transaction() as session:
+            user = await users_repository.create(
+                {"email": email}, is_return_require=True, out_dataclass=UserShortDTO, session=session
+            )
+            await service_container.outbox_service.add(
+                session, event="user_created", data={"uuid": str(user.uuid)}
+            )
+            if is_failing:
+                raise ValueError("Change failed")
+
+    with pytest.raises(ValueError):
+        e_loop.run_until_complete(create_user(is_failing=True))
+    assert e_loop.run_until_complete(outbox.count(filter_data={"event": "user_created"})) == 0
+    assert e_loop.run_until_complete(users_repository.count(filter_data={"email": email})) == 0
+
+    e_loop.run_until_complete(create_user(is_failing=False))
+    user = e_loop.run_until_complete(users_repository.get_first(filter_data={"email": email}))
+    items = e_loop.run_until_complete(outbox.get_list(filter_data={"event": "user_created"}))
+    e_loop.run_until_complete(users_repository.remove(filter_data={"email": email}))
+
+    assert [i.data for i in items] == [{"uuid": str(user.uuid)}]
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from asyncio import AbstractEventLoop
 from typing import Generator, Tuple, Any
 from unittest.mock import patch
@@ -5,6 +7,7 @@ from unittest.mock import patch
 import pytest
 
 from src.app.application.container import container as service_container
+from src.app.config.settings import settings
 
 
 @pytest.fixture
@@ -121,6 +124,51 @@ def test_common_service_is_healthy_with_redis_exception(
     assert result is expected_val
 
 
+def test_common_service_checks_dependencies_concurrently_within_timeout(
+    e_loop: AbstractEventLoop, mock_health_services: Tuple[Any, Any, Any]
+) -> None:
+    mock_psql, mock_redis, mock_mq = mock_health_services
+
+    async def slow_check() -> bool:
+        await asyncio.sleep(10)
+        return True
+
+    async def check() -> bool:
+        await asyncio.sleep(0.1)
+        return True
+
+    mock_psql.side_effect = slow_check
+    mock_redis.side_effect = check
+    mock_mq.side_effect = check
+
+    started = time.monotonic()
+    with patch.object(settings, "HEALTH_CHECK_TIMEOUT_SECONDS", 0.2):
+        result = e_loop.run_until_complete(service_container.common_service.check_dependencies())
+
+    assert result == {"psql": False, "redis": True, "message_broker": True}
+    assert time.monotonic() - started < 0.5
+
+
+def test_common_service_status_is_cached_until_stale(
+    e_loop: AbstractEventLoop, mock_health_services: Tuple[Any, Any, Any]
+) -> None:
+    mock_psql, mock_redis, mock_mq = mock_health_services
+    mock_psql.return_value, mock_redis.return_value, mock_mq.return_value = True, True, True
+    common_service = service_container.common_service
+
+    with patch.object(common_service, "status", (time.monotonic(), False)):
+        cached = e_loop.run_until_complete(common_service.get_status())
+    with patch.object(
+        common_service, "status", (time.monotonic() - settings.HEALTH_CHECK_STALENESS_SECONDS - 1, False)
+    ):
+        refreshed = e_loop.run_until_complete(common_service.get_status())
+
+    assert common_service.is_alive() is True
+    assert cached is False
+    assert refreshed is True
+    assert mock_psql.await_count == 1
+
+
 def test_common_service_is_healthy_real_infrastructure(e_loop: AbstractEventLoop) -> None:
     result = e_loop.run_until_complete(service_container.common_service.is_healthy())
 
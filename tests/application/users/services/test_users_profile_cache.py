@@ -0,0 +1,73 @@
+from asyncio import AbstractEventLoop
+from typing import Any
+
+import pytest
+
+from src.app.application.container import container as service_container
+from src.app.config.settings import settings
+from src.app.infrastructure.repositories.container import container as repo_container
+from tests.fixtures.constants import USERS
+
+
+def test_users_get_profile(e_loop: AbstractEventLoop, users: Any) -> None:
+    users_service = service_container.users_service
+    user_raw = USERS[0]
+
+    profile = e_loop.run_until_complete(users_service.get_profile(uuid=user_raw["uuid"]))
+
+    assert profile == {key: user_raw[key] for key in users_service.PROFILE_FIELDS}
+    assert e_loop.run_until_complete(users_service.get_profile(uuid=user_raw["uuid"])) == profile
+
+
+def test_users_get_profile_not_found(e_loop: AbstractEventLoop, users: Any) -> None:
+    users_service = service_container.users_service
+    user_raw = USERS[0]
+
+    e_loop.run_until_complete(users_service.remove(filter_data={"uuid": user_raw["uuid"]}))
+
+    assert e_loop.run_until_complete(users_service.get_profile(uuid=user_raw["uuid"])) is None
+
+
+def test_users_get_profile_invalidated_on_update(e_loop: AbstractEventLoop, users: Any) -> None:
+    if settings.USERS_PROFILE_CACHE_TTL_SECONDS <= 0:
+        pytest.skip("Profile cache disabled")
+
+    users_service = service_container.users_service
+    profile_repository = repo_container.users_profile_repository
+    user_raw = USERS[1]
+
+    e_loop.run_until_complete(users_service.get_profile(uuid=user_raw["uuid"]))
+    cached, version = e_loop.run_until_complete(profile_repository.get_snapshot(user_raw["uuid"]))
+    assert cached is not None and cached["email"] == user_raw["email"]
+
+    e_loop.run_until_complete(
+        users_service.update(filter_data={"email": user_raw["email"]}, data={"first_name": "updated_name"})
+    )
+    cached, new_version = e_loop.run_until_complete(profile_repository.get_snapshot(user_raw["uuid"]))
+    assert cached is None
+    assert new_version == version + 1
+
+    profile = e_loop.run_until_complete(users_service.get_profile(uuid=user_raw["uuid"]))
+    assert profile is not None and profile["first_name"] == "updated_name"
+
+    # fixtures recreate the same users, drop the snapshot built from the updated row
+    e_loop.run_until_complete(users_service.remove(filter_data={"uuid": user_raw["uuid"]}))
+
+
+def test_users_get_profile_kept_on_non_profile_update(e_loop: AbstractEventLoop, users: Any) -> None:
+    if settings.USERS_PROFILE_CACHE_TTL_SECONDS <= 0:
+        pytest.skip("Profile cache disabled")
+
+    users_service = service_container.users_service
+    profile_repository = repo_container.users_profile_repository
+    user_raw = USERS[2]
+
+    profile = e_loop.run_until_complete(users_service.get_profile(uuid=user_raw["uuid"]))
+    _, version = e_loop.run_until_complete(profile_repository.get_snapshot(user_raw["uuid"]))
+
+    e_loop.run_until_complete(
+        users_service.update(filter_data={"email": user_raw["email"]}, data={"city": "Paris"})
+    )
+    cached, new_version = e_loop.run_until_complete(profile_repository.get_snapshot(user_raw["uuid"]))
+    assert cached == profile
+    assert new_version == version
@@ -0,0 +1,46 @@
+import time
+
+import pytest
+from jose import jwt
+
+from src.app.domain.auth.services.jwt_codec import HS256Codec, JWTCodecError
+
+SECRET = "test-secret-key"
+
+
+def get_payload(exp_delta: int = 60) -> dict:
+    return {"user": {"uuid": "user-uuid", "sid": "abc123"}, "type": "access", "exp": int(time.time()) + exp_delta}
+
+
+def test_hs256_codec_matches_jose() -> None:
+    codec = HS256Codec(SECRET)
+    payload = get_payload()
+
+    token = codec.encode(payload)
+
+    assert token == jwt.encode(payload, SECRET, algorithm="HS256")
+    assert codec.decode(token) == payload
+    assert codec.decode(jwt.encode(payload, SECRET, algorithm="HS256")) == payload
+
+
+def test_hs256_codec_rejects_invalid() -> None:
+    codec = HS256Codec(SECRET)
+    token = codec.encode(get_payload())
+
+    with pytest.raises(JWTCodecError):
+        codec.decode(token[:-2] + ("A" if token[-2] != "A" else "B") + token[-1])
+    with pytest.raises(JWTCodecError):
+        codec.decode(HS256Codec("other-secret").encode(get_payload()))
+    with pytest.raises(JWTCodecError):
+        codec.decode(codec.encode(get_payload(exp_delta=-10)))
+    with pytest.raises(JWTCodecError):
+        codec.decode("not-a-token")
+
+
+def test_hs256_codec_falls_back() -> None:
+    codec = HS256Codec(SECRET)
+
+    assert codec.decode(jwt.encode(get_payload(), SECRET, algorithm="HS512")) is None
+    assert codec.decode(codec.encode({**get_payload(), "nbf": int(time.time())})) is None
+    assert codec.decode(codec.encode({**get_payload(), "exp": "soon"})) is None
+    assert codec.decode(codec.encode({"user": {}, "type": "access"})) is None
@@ -0,0 +1,51 @@
+import hashlib
+import time
+
+import pytest
+
+from src.app.domain.auth.container import container as domain_auth_container
+from src.app.domain.auth.value_objects import TokenType
+from src.app.domain.common.exceptions import AuthenticationError
+from src.app.domain.common.utils.common import generate_str
+
+
+def test_verify_access_token_cached() -> None:
+    jwt_service = domain_auth_container.jwt_service
+    if jwt_service.access_token_cache is None:
+        pytest.skip("Access token cache disabled")
+
+    uuid = generate_str(16)
+    token_pair = jwt_service.create_token_pair(uuid)
+    stats_before = jwt_service.get_access_token_cache_stats()
+
+    first = jwt_service.verify_access_token(token_pair.access_token)
+    second = jwt_service.verify_access_token(token_pair.access_token)
+    stats_after = jwt_service.get_access_token_cache_stats()
+
+    assert first == second
+    assert first.uuid == uuid
+    assert stats_after["misses"] == stats_before["misses"] + 1
+    assert stats_after["hits"] == stats_before["hits"] + 1
+
+
+def test_verify_access_token_cache_skips_invalid() -> None:
+    jwt_service = domain_auth_container.jwt_service
+    if jwt_service.access_token_cache is None:
+        pytest.skip("Access token cache disabled")
+
+    uuid = generate_str(16)
+    token_pair = jwt_service.create_token_pair(uuid)
+    expired_token = jwt_service._encode({"uuid": uuid, "sid": "sid"}, TokenType.ACCESS, int(time.time()) - 10)
+    invalid_tokens = [token_pair.access_token[:-2], token_pair.refresh_token, expired_token]
+    stats_before = jwt_service.get_access_token_cache_stats()
+
+    for token in invalid_tokens * 2:  # a second verification misses the cache again
+        with pytest.raises(AuthenticationError):
+            jwt_service.verify_access_token(token)
+    stats_after = jwt_service.get_access_token_cache_stats()
+
+    assert stats_after["size"] == stats_before["size"]
+    assert stats_after["hits"] == stats_before["hits"]
+    assert stats_after["misses"] == stats_before["misses"] + len(invalid_tokens) * 2
+    for token in invalid_tokens:
+        assert hashlib.sha256(token.encode("utf-8")).digest() not in jwt_service.access_token_cache
@@ -0,0 +1,57 @@
+from asyncio import AbstractEventLoop
+from unittest.mock import patch
+
+from src.app.config.settings import settings
+from src.app.domain.auth.container import container as domain_auth_container
+
+PASSWORD = "Test#Passw0rd"
+
+
+def test_password_hashing_uses_configured_rounds() -> None:
+    auth_service = domain_auth_container.auth_service
+    with patch.object(auth_service, "rounds", 4):
+        hashed = auth_service.get_password_hashed(PASSWORD)
+
+        assert auth_service.get_hash_rounds(hashed) == 4
+        assert auth_service.needs_rehash(hashed) is False
+        assert auth_service.verify_password(PASSWORD, hashed) is True
+
+    with patch.object(auth_service, "rounds", 5):
+        assert auth_service.needs_rehash(hashed) is True
+
+    with patch.object(auth_service, "rounds", 3):
+        assert auth_service.needs_rehash(hashed) is True  # the cost is lowered too
+
+
+def test_password_hashing_async(e_loop: AbstractEventLoop) -> None:
+    auth_service = domain_auth_container.auth_service
+    with patch.object(auth_service, "rounds", 4):
+        hashed = e_loop.run_until_complete(auth_service.get_password_hashed_async(PASSWORD))
+
+        assert e_loop.run_until_complete(auth_service.verify_password_async(PASSWORD, hashed)) is True
+        assert e_loop.run_until_complete(auth_service.verify_password_async(PASSWORD + "x", hashed)) is False
+
+
+def test_password_hashing_calibrate() -> None:
+    auth_service = domain_auth_container.auth_service
+    with (
+        patch.object(auth_service, "rounds", 12),
+        patch.object(settings, "PASSWORD_HASHING_MIN_ROUNDS", 4),
+        patch.object(settings, "PASSWORD_HASHING_MAX_ROUNDS", 6),
+    ):
+        with patch.object(settings, "PASSWORD_HASHING_TARGET_MS", 0):
+            assert auth_service.calibrate() == 12
+
+        with patch.object(settings, "PASSWORD_HASHING_TARGET_MS", 60 * 1000):
+            assert auth_service.calibrate() == 6
+
+        with patch.object(settings, "PASSWORD_HASHING_TARGET_MS", 1):
+            assert auth_service.calibrate() == 4
+
+
+def test_password_hash_rounds_invalid_value() -> None:
+    auth_service = domain_auth_container.auth_service
+
+    assert auth_service.get_hash_rounds("") is None
+    assert auth_service.get_hash_rounds("not-a-bcrypt-hash") is None
+    assert auth_service.needs_rehash("not-a-bcrypt-hash") is False
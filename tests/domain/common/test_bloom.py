@@ -0,0 +1,26 @@
+import pytest
+
+from src.app.domain.common.utils.bloom import BloomFilter
+from src.app.domain.common.utils.common import generate_str
+
+
+def test_bloom_filter_no_false_negatives() -> None:
+    items = [generate_str(12) for _ in range(1000)]
+    bloom_filter = BloomFilter.from_items(items, capacity=1000, error_rate=0.01)
+
+    assert len(bloom_filter) == len(items)
+    assert all(item in bloom_filter for item in items)
+
+
+def test_bloom_filter_false_positive_rate() -> None:
+    bloom_filter = BloomFilter.from_items([f"member:{i}" for i in range(1000)], capacity=1000, error_rate=0.01)
+
+    false_positives = sum(f"other:{i}" in bloom_filter for i in range(10000))
+
+    assert false_positives < 10000 * 0.01 * 3
+
+
+@pytest.mark.parametrize("capacity, error_rate", [(0, 0.01), (10, 0), (10, 1)])
+def test_bloom_filter_invalid_params(capacity: int, error_rate: float) -> None:
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=capacity, error_rate=error_rate)
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+from asyncio import AbstractEventLoop
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.app.domain.common.exceptions import ServiceUnavailableError
+from src.app.domain.common.utils.executors import BoundedExecutor
+from src.app.interfaces.api.error_handlers import exception_handler_service_unavailable_error
+
+
+def test_bounded_executor_rejects_when_saturated(e_loop: AbstractEventLoop) -> None:
+    executor = BoundedExecutor(name="test", max_workers=1, queue_size=1)
+    release = threading.Event()
+
+    async def run() -> Any:
+        running = [asyncio.ensure_future(executor.run(release.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        pending = executor.pending
+        with pytest.raises(ServiceUnavailableError) as ex_info:
+            await executor.run(release.wait, 5)
+        release.set()
+        await asyncio.gather(*running)
+        return pending, ex_info.value
+
+    try:
+        pending, error = e_loop.run_until_complete(run())
+    finally:
+        release.set()
+        executor.shutdown()
+    response = e_loop.run_until_complete(exception_handler_service_unavailable_error(MagicMock(), error))
+
+    assert pending == 2
+    assert executor.stats() == {"pending": 0, "capacity": 2, "rejected": 1}
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_bounded_executor_releases_slots_after_success_and_failure(e_loop: AbstractEventLoop) -> None:
+    executor = BoundedExecutor(name="test", max_workers=1, queue_size=0)
+
+    def fail() -> None:
+        raise ValueError("failed")
+
+    try:
+        result = e_loop.run_until_complete(executor.run(sum, [1, 2]))
+        with pytest.raises(ValueError):
+            e_loop.run_until_complete(executor.run(fail))
+        result_after_failure = e_loop.run_until_complete(executor.run(sum, [3, 4]))
+    finally:
+        executor.shutdown()
+
+    assert (result, result_after_failure) == (3, 7)
+    assert executor.pending == 0
+    assert executor.rejected == 0
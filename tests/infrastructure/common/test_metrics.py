@@ -0,0 +1,51 @@
+import asyncio
+from asyncio import AbstractEventLoop
+
+from src.app.domain.common.utils.common import generate_str
+from src.app.infrastructure.common.metrics import MetricsRegistry, metrics_registry, start_metrics_server
+
+
+def test_metrics_registry_renders_prometheus_text() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("messages_total", "Handled messages", ("event",))
+    gauge = registry.gauge("backlog", "Waiting\nmessages", ("queue",))
+    histogram = registry.histogram("handling_seconds", "Handling time", buckets=(0.1, 1))
+    counter.inc(2, event='say "meow"')
+    gauge.set(7, queue="default")
+    histogram.observe(0.5)
+
+    assert registry.render().splitlines() == [
+        "# HELP messages_total Handled messages",
+        "# TYPE messages_total counter",
+        'messages_total{event="say \\"meow\\""} 2',
+        "# HELP backlog Waiting\\nmessages",
+        "# TYPE backlog gauge",
+        'backlog{queue="default"} 7',
+        "# HELP handling_seconds Handling time",
+        "# TYPE handling_seconds histogram",
+        'handling_seconds_bucket{le="0.1"} 0',
+        'handling_seconds_bucket{le="1"} 1',
+        'handling_seconds_bucket{le="+Inf"} 1',
+        "handling_seconds_sum 0.5",
+        "handling_seconds_count 1",
+    ]
+
+
+def test_metrics_server_serves_registry(e_loop: AbstractEventLoop) -> None:
+    name = f"test_{generate_str(8).lower()}"
+    metrics_registry.gauge(name, "Test gauge").set(3)
+
+    async def scrape() -> bytes:
+        server = await start_metrics_server(0, host="127.0.0.1")
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        response = await reader.read()
+        writer.close()
+        server.close()
+        return response
+
+    response = e_loop.run_until_complete(scrape())
+
+    assert response.startswith(b"HTTP/1.1 200 OK")
+    assert f"\n{name} 3\n".encode() in response
@@ -0,0 +1,88 @@
+import asyncio
+from asyncio import AbstractEventLoop
+from typing import Any, List
+
+from src.app.infrastructure.messaging.mq_client import MQClientProxy
+from src.app.infrastructure.messaging.retries import RetryPolicy
+
+
+async def consume_until(mq_client: MQClientProxy, handled: List[dict], count: int, **kwargs: Any) -> None:
+    async def aggregator(data: dict, handlers_by_event: dict) -> None:
+        handled.append(data)
+        if data["data"].get("is_failing"):
+            raise ValueError("Handler failed")
+
+    handlers_by_event = {"e": {"retry_policy": RetryPolicy(max_attempts=1)}}
+    task = asyncio.create_task(
+        mq_client.consume(
+            queues=["queue"],
+            exchanger_name="exchanger",
+            aggregator=aggregator,
+            handlers_by_event=handlers_by_event,
+            **kwargs,
+        )
+    )
+    for _ in range(100):
+        if len(handled) >= count:
+            break
+        await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+def test_inmemory_broker_groups_and_dead_letters(e_loop: AbstractEventLoop) -> None:
+    producer = MQClientProxy(message_broker_type="inmemory", message_broker_url="memory://test")
+    consumer = MQClientProxy(message_broker_type="inmemory", message_broker_url="memory://test")
+    messages = [{"event": "e", "data": {"i": 1}}, {"event": "e", "data": {"i": 2, "is_failing": True}}]
+    e_loop.run_until_complete(
+        producer.produce_messages(exchanger_name="exchanger", queue_name="queue", messages=messages)
+    )
+
+    handled: List[dict] = []
+    e_loop.run_until_complete(consume_until(consumer, handled, count=2, workers=4))
+    assert [i["data"]["i"] for i in handled] == [1, 2]
+    assert all(i["message_id"] for i in handled)
+
+    replayed = e_loop.run_until_complete(
+        consumer.replay_dead_letters(exchanger_name="exchanger", queue_name="queue", limit=10)
+    )
+    replayed_handled: List[dict] = []
+    e_loop.run_until_complete(consume_until(consumer, replayed_handled, count=1))
+    assert replayed == 1
+    assert replayed_handled == [{**messages[1], "message_id": handled[1]["message_id"]}]
+
+
+def test_inmemory_broker_consumer_groups_get_every_message(e_loop: AbstractEventLoop) -> None:
+    mq_client = MQClientProxy(message_broker_type="inmemory", message_broker_url="memory://test_groups")
+    handled_by_group: dict = {"first": [], "second": []}
+
+    async def run() -> None:
+        consumers = [
+            asyncio.create_task(consume_until(mq_client, handled, count=3, group_id=group_id))
+            for group_id, handled in handled_by_group.items()
+        ]
+        await asyncio.sleep(0.01)  # groups subscribe
+        messages = [{"event": "e", "data": {"i": i}} for i in range(3)]
+        await mq_client.produce_messages(exchanger_name="exchanger", queue_name="queue", messages=messages)
+        await asyncio.gather(*consumers)
+
+    e_loop.run_until_complete(run())
+
+    assert [i["data"]["i"] for i in handled_by_group["first"]] == [0, 1, 2]
+    assert [i["data"]["i"] for i in handled_by_group["second"]] == [0, 1, 2]
+
+
+def test_inmemory_broker_backlog(e_loop: AbstractEventLoop) -> None:
+    mq_client = MQClientProxy(message_broker_type="inmemory", message_broker_url="memory://test_backlog")
+    client: Any = mq_client._client
+    client.get_partition("exchanger", "queue").get_group_queue(client.get_group_id("exchanger", "queue"))
+    messages = [{"event": "e", "data": {"i": i}} for i in range(3)]
+    e_loop.run_until_complete(
+        mq_client.produce_messages(exchanger_name="exchanger", queue_name="queue", messages=messages)
+    )
+
+    backlog = e_loop.run_until_complete(
+        mq_client.get_backlog(exchanger_name="exchanger", queues=["queue", "other"])
+    )
+
+    assert backlog == {"queue": 3, "other": 0}
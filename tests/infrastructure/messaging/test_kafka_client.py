@@ -1,8 +1,16 @@
+import asyncio
+import json
+import time
 from asyncio import AbstractEventLoop
+from typing import List, Optional, Set
+from unittest.mock import patch
 
 import pytest
+from aiokafka import ConsumerRecord, TopicPartition
 
+from src.app.infrastructure.messaging.clients.kafka_client import KafkaClient
 from src.app.infrastructure.messaging.mq_client import MQClientProxy
+from src.app.infrastructure.messaging.retries import ORIGIN_PARTITION_FIELD, RETRY_AT_FIELD
 
 MESSAGE_BROKER_URLS = ["x_test_kafka_service:29092"]
 
@@ -26,3 +34,143 @@ def test_mq_is_not_healthy_kafka(e_loop: AbstractEventLoop, broker_url: str) ->
     is_healthy = e_loop.run_until_complete(mq_client.is_healthy())
 
     assert is_healthy is not True
+
+
+class FakeProducer:
+    instances: list = []
+
+    def __init__(self, **kwargs: dict) -> None:
+        self.kwargs = kwargs
+        self.started = 0
+        self.stopped = 0
+        self.sent: list = []
+        FakeProducer.instances.append(self)
+
+    async def start(self) -> None:
+        self.started += 1
+
+    async def stop(self) -> None:
+        self.stopped += 1
+
+    async def send(self, **kwargs: dict) -> asyncio.Future:
+        self.sent.append(kwargs)
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(None)
+        return future
+
+
+def test_mq_produce_messages_kafka_reuses_producer(e_loop: AbstractEventLoop) -> None:
+    FakeProducer.instances = []
+    mq_client = MQClientProxy(message_broker_type="kafka", message_broker_url="x_test_kafka_service:29092")
+
+    with patch("src.app.infrastructure.messaging.clients.kafka_client.AIOKafkaProducer", FakeProducer):
+        for _ in range(2):
+            e_loop.run_until_complete(
+                mq_client.produce_messages(exchanger_name="topic", queue_name=0, messages=[{"a": 1}, {"b": 2}])
+            )
+        e_loop.run_until_complete(mq_client.close())
+
+    assert len(FakeProducer.instances) == 1
+    producer = FakeProducer.instances[0]
+    assert (producer.started, producer.stopped) == (1, 1)
+    assert len(producer.sent) == 4
+    assert isinstance(producer.sent[0]["timestamp_ms"], int)
+    assert producer.sent[0]["timestamp_ms"] > 10**12
+
+
+RETRY_TP = TopicPartition("topic.retry.1000", 0)
+
+
+def get_retry_record(offset: int, value: bytes) -> ConsumerRecord:
+    return ConsumerRecord(
+        topic=RETRY_TP.topic,
+        partition=RETRY_TP.partition,
+        offset=offset,
+        timestamp=0,
+        timestamp_type=0,
+        key=None,
+        value=value,
+        checksum=None,
+        serialized_key_size=0,
+        serialized_value_size=len(value),
+        headers=(),
+    )
+
+
+class FakeRetryConsumer:
+    def __init__(self, records: List[ConsumerRecord]) -> None:
+        self.records = records
+        self.position = 0
+        self.committed = 0
+        self.paused: Set[TopicPartition] = set()
+
+    async def start(self) -> None:
+        return None
+
+    async def stop(self) -> None:
+        return None
+
+    async def getmany(self, timeout_ms: int = 0) -> dict:
+        if RETRY_TP in self.paused or self.position >= len(self.records):
+            await asyncio.sleep(0.01)
+            return {}
+        batch = self.records[self.position :]
+        self.position = len(self.records)
+        return {RETRY_TP: batch}
+
+    async def commit(self, offsets: dict) -> None:
+        self.committed = offsets[RETRY_TP]
+
+    async def seek_to_committed(self) -> None:
+        self.position = self.committed
+
+    def seek(self, tp: TopicPartition, offset: int) -> None:
+        self.position = offset
+
+    def pause(self, *partitions: TopicPartition) -> None:
+        self.paused.update(partitions)
+
+    def resume(self, *partitions: TopicPartition) -> None:
+        self.paused.difference_update(partitions)
+
+
+def test_kafka_retry_forwarder_survives_failures(e_loop: AbstractEventLoop) -> None:
+    client = KafkaClient(message_broker_url="x_test_kafka_service:29092")
+    retry_at_ms = int(time.time() * 1000) + 300
+    consumer = FakeRetryConsumer(
+        [
+            get_retry_record(0, b"not json"),
+            get_retry_record(
+                1, json.dumps({"event": "due", RETRY_AT_FIELD: 0, ORIGIN_PARTITION_FIELD: 1}).encode()
+            ),
+            get_retry_record(2, json.dumps({"event": "later", RETRY_AT_FIELD: retry_at_ms}).encode()),
+        ]
+    )
+    sent: List[tuple] = []
+    failures = [ConnectionError("Broker blip")]
+
+    async def send(topic: str, partition: Optional[int], values: List[bytes]) -> None:
+        if failures:
+            raise failures.pop()
+        sent.append((topic, partition, [json.loads(i) for i in values], time.time() * 1000))
+
+    async def forward() -> None:
+        task = asyncio.create_task(client._KafkaClient__forward_retries("topic", 1000))  # type: ignore
+        while len(sent) < 3 and not task.done():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    with (
+        patch.object(client, "_KafkaClient__get_service_consumer", lambda *args, **kwargs: consumer),
+        patch.object(client, "_KafkaClient__send", send),
+        patch.object(KafkaClient, "_KafkaClient__failed_publish_backoff_seconds", 0),
+    ):
+        e_loop.run_until_complete(forward())
+
+    dead, due, later = sent
+    assert dead[:2] == ("topic.dlq", None) and dead[2][0]["raw"] == "not json"
+    assert due[:3] == ("topic", 1, [{"event": "due"}])
+    assert later[:3] == ("topic", None, [{"event": "later"}])
+    assert later[3] >= retry_at_ms
+    assert consumer.committed == 3
@@ -0,0 +1,107 @@
+import asyncio
+from asyncio import AbstractEventLoop
+from typing import List
+
+from aiokafka import ConsumerRecord, TopicPartition
+
+from src.app.infrastructure.messaging.clients.kafka_consumer_engine import (
+    KafkaConsumerEngine,
+    PartitionOffsetTracker,
+)
+
+TP = TopicPartition("topic", 0)
+
+
+def get_record(offset: int, key: bytes | None = None) -> ConsumerRecord:
+    return ConsumerRecord(
+        topic=TP.topic,
+        partition=TP.partition,
+        offset=offset,
+        timestamp=0,
+        timestamp_type=0,
+        key=key,
+        value=b"{}",
+        checksum=None,
+        serialized_key_size=0,
+        serialized_value_size=2,
+        headers=(),
+    )
+
+
+class FakeConsumer:
+    def __init__(self, records: List[ConsumerRecord]) -> None:
+        self.records = records
+        self.commits: List[dict] = []
+        self.paused_count = 0
+
+    def assignment(self) -> set:
+        return {TP}
+
+    def pause(self, *partitions: TopicPartition) -> None:
+        self.paused_count += 1
+
+    def resume(self, *partitions: TopicPartition) -> None:
+        pass
+
+    async def getmany(self, timeout_ms: int = 0, max_records: int | None = None) -> dict:
+        if not self.records:
+            await asyncio.sleep(timeout_ms / 1000)
+            return {}
+        batch, self.records = self.records[:max_records], self.records[max_records:]
+        return {TP: batch}
+
+    async def commit(self, offsets: dict) -> None:
+        self.commits.append(offsets)
+
+
+def test_partition_offset_tracker_commits_contiguous() -> None:
+    tracker = PartitionOffsetTracker()
+    for offset in (10, 11, 12):
+        tracker.track(offset)
+
+    tracker.done(11)
+    assert tracker.get_commit_offset() is None
+
+    tracker.done(10)
+    assert tracker.get_commit_offset() == 12
+    tracker.committed = 12
+    assert tracker.get_commit_offset() is None
+
+    tracker.done(12)
+    assert tracker.get_commit_offset() == 13
+    assert len(tracker) == 0
+
+
+def test_kafka_consumer_engine_orders_by_key(e_loop: AbstractEventLoop) -> None:
+    keys = [b"a", b"b", b"a", b"b", b"a", b"b"]
+    consumer = FakeConsumer([get_record(offset, key) for offset, key in enumerate(keys)])
+    handled: List[tuple] = []
+
+    async def handler(message: ConsumerRecord) -> None:
+        # Earlier messages are slower, only lane ordering keeps them in sequence
+        await asyncio.sleep(0.01 * (len(keys) - message.offset))
+        handled.append((message.key, message.offset))
+
+    async def run() -> KafkaConsumerEngine:
+        engine = KafkaConsumerEngine(
+            consumer=consumer,  # type: ignore
+            handler=handler,
+            max_in_flight=4,
+            ordering=KafkaConsumerEngine.ORDERING_KEY,
+            commit_interval_ms=0,
+            fetch_timeout_ms=10,
+        )
+        task = asyncio.create_task(engine.run())
+        while len(handled) < len(keys):
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return engine
+
+    engine = e_loop.run_until_complete(run())
+
+    assert [offset for key, offset in handled if key == b"a"] == [0, 2, 4]
+    assert [offset for key, offset in handled if key == b"b"] == [1, 3, 5]
+    assert consumer.commits[-1] == {TP: len(keys)}
+    assert consumer.paused_count > 0
+    assert engine.in_flight == 0
@@ -0,0 +1,37 @@
+import asyncio
+from asyncio import AbstractEventLoop
+from typing import List
+
+import pytest
+
+from src.app.infrastructure.messaging.batching import MessageBatcher
+
+
+def test_message_batcher_flushes_by_size_and_timeout(e_loop: AbstractEventLoop) -> None:
+    batches: List[List[dict]] = []
+
+    async def flush_handler(items: List[dict]) -> None:
+        batches.append(items)
+
+    async def run() -> None:
+        batcher = MessageBatcher(flush_handler=flush_handler, batch_size=3, batch_timeout_ms=20)
+        await asyncio.gather(*[batcher.submit({"i": i}) for i in range(5)])
+
+    e_loop.run_until_complete(run())
+
+    assert batches == [[{"i": 0}, {"i": 1}, {"i": 2}], [{"i": 3}, {"i": 4}]]
+
+
+def test_message_batcher_failed_batch_raises(e_loop: AbstractEventLoop) -> None:
+    async def flush_handler(items: List[dict]) -> None:
+        raise RuntimeError("sink is down")
+
+    async def run() -> list:
+        batcher = MessageBatcher(flush_handler=flush_handler, batch_size=2, batch_timeout_ms=20)
+        return await asyncio.gather(*[batcher.submit({"i": i}) for i in range(2)], return_exceptions=True)
+
+    results = e_loop.run_until_complete(run())
+
+    assert all(isinstance(i, RuntimeError) for i in results)
+    with pytest.raises(ValueError):
+        MessageBatcher(flush_handler=flush_handler, batch_size=0, batch_timeout_ms=20)
@@ -0,0 +1,125 @@
+import asyncio
+import uuid
+from asyncio import AbstractEventLoop
+from typing import Any, List
+
+import pytest
+
+from src.app.infrastructure.messaging.deduplication import MessageDeduplicator
+from src.app.infrastructure.repositories.container import container as repo_container
+
+
+class CountingStore:
+    """Delegates to a real store counting round trips"""
+
+    def __init__(self, store: Any) -> None:
+        self.store = store
+        self.claims = 0
+        self.completions = 0
+
+    async def claim(self, message_ids: List[str], ttl_seconds: int) -> List[str]:
+        self.claims += 1
+        return await self.store.claim(message_ids, ttl_seconds=ttl_seconds)
+
+    async def complete(self, message_ids: List[str], ttl_seconds: int) -> None:
+        self.completions += 1
+        await self.store.complete(message_ids, ttl_seconds=ttl_seconds)
+
+    async def release(self, message_ids: List[str]) -> None:
+        await self.store.release(message_ids)
+
+    async def purge(self) -> None:
+        await self.store.purge()
+
+
+@pytest.mark.parametrize(
+    "store", [repo_container.consumed_messages_redis_repository, repo_container.consumed_messages_psql_repository]
+)
+def test_deduplicator_skips_redelivered_batch_messages(e_loop: AbstractEventLoop, store: Any) -> None:
+    counting_store = CountingStore(store)
+    deduplicator = MessageDeduplicator(store=counting_store, ttl_seconds=60, processing_ttl_seconds=60)
+    handled: List[List[dict]] = []
+
+    async def batch_aggregator(messages: List[dict], handlers_by_event: dict) -> None:
+        handled.append(messages)
+
+    aggregator = deduplicator.wrap_batch_aggregator(batch_aggregator)
+    ids = [uuid.uuid4().hex for _ in range(3)]
+    first = [{"event": "e", "data": {"i": i}, "message_id": message_id} for i, message_id in enumerate(ids)]
+    e_loop.run_until_complete(aggregator(first + [first[0], {"event": "no_id"}], {}))
+    redelivered = [first[2], {"event": "e", "data": {}, "message_id": uuid.uuid4().hex}]
+    e_loop.run_until_complete(aggregator(redelivered, {}))
+
+    assert counting_store.claims == 2
+    assert handled[0] == first + [{"event": "no_id"}]
+    assert handled[1] == [redelivered[1]]
+    e_loop.run_until_complete(store.release(ids + [redelivered[1]["message_id"]]))
+
+
+def test_deduplicator_releases_claims_of_failed_messages(e_loop: AbstractEventLoop) -> None:
+    deduplicator = MessageDeduplicator(
+        store=repo_container.consumed_messages_redis_repository, ttl_seconds=60, processing_ttl_seconds=60
+    )
+    calls: List[dict] = []
+
+    async def aggregator(data: dict, handlers_by_event: dict) -> None:
+        calls.append(data)
+        if len(calls) == 1:
+            raise ValueError("Handler failed")
+
+    deduplicated = deduplicator.wrap_aggregator(aggregator)
+    message_id = uuid.uuid4().hex
+    message = {"event": "e", "data": {}, "message_id": message_id}
+    with pytest.raises(ValueError):
+        e_loop.run_until_complete(deduplicated(message, {}))
+    e_loop.run_until_complete(deduplicated(message, {}))
+    e_loop.run_until_complete(deduplicated(message, {}))
+
+    assert len(calls) == 2
+    e_loop.run_until_complete(deduplicator.store.release([message_id]))
+
+
+@pytest.mark.parametrize(
+    "store", [repo_container.consumed_messages_redis_repository, repo_container.consumed_messages_psql_repository]
+)
+def test_deduplicator_handles_redelivery_of_abandoned_claims(e_loop: AbstractEventLoop, store: Any) -> None:
+    deduplicator = MessageDeduplicator(store=store, ttl_seconds=60, processing_ttl_seconds=1)
+    handled: List[dict] = []
+
+    async def aggregator(data: dict, handlers_by_event: dict) -> None:
+        handled.append(data)
+
+    deduplicated = deduplicator.wrap_aggregator(aggregator)
+    abandoned = {"event": "e", "data": {}, "message_id": uuid.uuid4().hex}
+    consumed = {"event": "e", "data": {}, "message_id": uuid.uuid4().hex}
+    # claimed by a consumer that died before handling it
+    fresh, _ = e_loop.run_until_complete(deduplicator.claim([abandoned]))
+    assert fresh == [abandoned]
+    e_loop.run_until_complete(deduplicated(consumed, {}))
+
+    e_loop.run_until_complete(deduplicated(abandoned, {}))
+    assert handled == [consumed]
+
+    e_loop.run_until_complete(asyncio.sleep(1.5))
+    e_loop.run_until_complete(deduplicated(abandoned, {}))
+    e_loop.run_until_complete(deduplicated(consumed, {}))
+    assert handled == [consumed, abandoned]
+    e_loop.run_until_complete(store.release([abandoned["message_id"], consumed["message_id"]]))
+
+
+def test_deduplicator_single_round_trip_without_processing_ttl(e_loop: AbstractEventLoop) -> None:
+    counting_store = CountingStore(repo_container.consumed_messages_redis_repository)
+    deduplicator = MessageDeduplicator(store=counting_store, ttl_seconds=60, processing_ttl_seconds=0)
+    handled: List[dict] = []
+
+    async def aggregator(data: dict, handlers_by_event: dict) -> None:
+        handled.append(data)
+
+    deduplicated = deduplicator.wrap_aggregator(aggregator)
+    message = {"event": "e", "data": {}, "message_id": uuid.uuid4().hex}
+    e_loop.run_until_complete(deduplicated(message, {}))
+    e_loop.run_until_complete(deduplicated(message, {}))
+
+    assert handled == [message]
+    assert (counting_store.claims, counting_store.completions) == (2, 0)
+    e_loop.run_until_complete(counting_store.store.release([message["message_id"]]))
@@ -1,8 +1,11 @@
 from asyncio import AbstractEventLoop
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator
 
 import pytest
 
 from src.app.config.settings import settings
+from src.app.infrastructure.messaging.clients.rabbitmq_client import RabbitQueueClientClient
 from src.app.infrastructure.messaging.mq_client import MQClientProxy
 
 MESSAGE_BROKER_URLS = [settings.MESSAGE_BROKER_URL]
@@ -27,3 +30,45 @@ def test_mq_is_not_healthy_rabbit_mq(e_loop: AbstractEventLoop, broker_url: str)
     is_healthy = e_loop.run_until_complete(mq_client.is_healthy())
 
     assert is_healthy is not True
+
+
+class FakeExchange:
+    def __init__(self) -> None:
+        self.published: list = []
+
+    async def publish(self, message: Any, routing_key: str) -> None:
+        self.published.append((routing_key, message.body))
+
+
+class FakeChannel:
+    def __init__(self) -> None:
+        self.exchange = FakeExchange()
+        self.declared = 0
+
+    async def declare_exchange(self, name: str, exchange_type: Any) -> FakeExchange:
+        self.declared += 1
+        return self.exchange
+
+
+class FakeChannelPool:
+    def __init__(self, channel: FakeChannel) -> None:
+        self.channel = channel
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncGenerator:
+        yield self.channel
+
+
+def test_mq_produce_messages_rabbit_mq_declares_exchange_once(e_loop: AbstractEventLoop) -> None:
+    client = RabbitQueueClientClient("amqp://dev:dev@x_test_rabbit_service:5672")
+    channel = FakeChannel()
+    client._RabbitQueueClientClient__channel_pool = FakeChannelPool(channel)  # type: ignore
+
+    for _ in range(2):
+        e_loop.run_until_complete(
+            client.produce_messages(messages=[{"a": 1}, {"b": 2}], queue_name="queue", exchanger_name="exchange")
+        )
+
+    assert channel.declared == 1
+    assert channel.exchange.published[:2] == [("queue", b'{"a": 1}'), ("queue", b'{"b": 2}')]
+    assert len(channel.exchange.published) == 4
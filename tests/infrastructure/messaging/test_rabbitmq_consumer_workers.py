@@ -0,0 +1,69 @@
+import asyncio
+from asyncio import AbstractEventLoop
+from typing import Any, List
+
+from src.app.infrastructure.messaging.clients.rabbitmq_consumer_workers import (
+    RabbitConsumerWorkers,
+    handler_latency_histogram,
+    in_flight_gauge,
+)
+
+
+class FakeMessage:
+    def __init__(self, routing_key: str, number: int) -> None:
+        self.routing_key = routing_key
+        self.number = number
+
+
+def test_rabbit_consumer_workers_order_by_routing_key(e_loop: AbstractEventLoop) -> None:
+    queue_name = "test_workers_ordering"
+    handled: List[tuple] = []
+    running = 0
+    max_running = 0
+
+    async def handler(message: Any) -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        # Earlier messages are slower, only lane ordering keeps them in sequence
+        await asyncio.sleep(0.002 * (10 - message.number))
+        handled.append((message.routing_key, message.number))
+        running -= 1
+
+    async def run() -> None:
+        workers = RabbitConsumerWorkers(
+            queue_name=queue_name, handler=handler, workers=3, ordering=RabbitConsumerWorkers.ORDERING_ROUTING_KEY
+        )
+        workers.start()
+        for number in range(10):
+            await workers.submit(FakeMessage(routing_key=f"key{number % 3}", number=number))  # type: ignore
+        await workers.drain()
+
+    e_loop.run_until_complete(run())
+
+    assert len(handled) == 10
+    for key in ("key0", "key1", "key2"):
+        numbers = [number for key_, number in handled if key_ == key]
+        assert numbers == sorted(numbers)
+    assert max_running <= 3
+    assert in_flight_gauge.get(queue=queue_name) == 0
+    assert handler_latency_histogram.get(queue=queue_name)[2] == 10
+
+
+def test_rabbit_consumer_workers_drain_finishes_in_flight(e_loop: AbstractEventLoop) -> None:
+    handled: List[int] = []
+
+    async def handler(message: Any) -> None:
+        await asyncio.sleep(0.01)
+        handled.append(message.number)
+
+    async def run() -> None:
+        workers = RabbitConsumerWorkers(queue_name="test_workers_drain", handler=handler, workers=2)
+        workers.start()
+        for number in range(5):
+            await workers.submit(FakeMessage(routing_key="", number=number))  # type: ignore
+        await workers.drain()
+
+    e_loop.run_until_complete(run())
+
+    assert sorted(handled) == [0, 1, 2, 3, 4]
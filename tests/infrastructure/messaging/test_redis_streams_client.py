@@ -0,0 +1,107 @@
+import asyncio
+from asyncio import AbstractEventLoop
+from typing import Any, List
+from unittest.mock import patch
+
+from src.app.config.settings import settings
+from src.app.domain.common.utils.common import generate_str
+from src.app.infrastructure.messaging.mq_client import MQClientProxy
+from src.app.infrastructure.messaging.retries import RetryPolicy
+
+
+async def consume_until(mq_client: MQClientProxy, exchanger_name: str, handled: List[dict], count: int) -> None:
+    async def aggregator(data: dict, handlers_by_event: dict) -> None:
+        handled.append(data)
+        if data["data"].get("is_failing"):
+            raise ValueError("Handler failed")
+
+    policy = RetryPolicy(max_attempts=2, initial_delay_ms=1, multiplier=1, max_delay_ms=1)
+    task = asyncio.create_task(
+        mq_client.consume(
+            queues=["queue"],
+            exchanger_name=exchanger_name,
+            aggregator=aggregator,
+            handlers_by_event={"e": {"retry_policy": policy}},
+        )
+    )
+    for _ in range(200):
+        if len(handled) >= count:
+            break
+        await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+def test_redis_streams_consume_retry_dead_letter_and_replay(e_loop: AbstractEventLoop) -> None:
+    mq_client = MQClientProxy(message_broker_type="redis_streams", message_broker_url=settings.REDIS_URL)
+    client: Any = mq_client._client
+    exchanger_name = f"test_{generate_str(8)}"
+    stream_name = client.get_stream_name(exchanger_name, "queue")
+    messages = [{"event": "e", "data": {"i": 1}}, {"event": "e", "data": {"i": 2, "is_failing": True}}]
+
+    handled: List[dict] = []
+    with patch.object(settings, "REDIS_STREAMS_BLOCK_MS", 10):
+        e_loop.run_until_complete(
+            mq_client.produce_messages(exchanger_name=exchanger_name, queue_name="queue", messages=messages)
+        )
+        e_loop.run_until_complete(consume_until(mq_client, exchanger_name, handled, count=3))
+        replayed = e_loop.run_until_complete(
+            mq_client.replay_dead_letters(exchanger_name=exchanger_name, queue_name="queue", limit=10)
+        )
+        pending = e_loop.run_until_complete(client.client.xpending(stream_name, f"GROUP_#_{exchanger_name}"))
+        stream = e_loop.run_until_complete(client.client.xrange(stream_name))
+
+    assert [(i["data"]["i"], i.get("attempt")) for i in handled] == [(1, None), (2, None), (2, 1)]
+    assert replayed == 1
+    assert pending["pending"] == 0
+    assert len(stream) == 4  # produced, retried and replayed
+    e_loop.run_until_complete(client.client.delete(stream_name, f"{stream_name}.dlq", f"{stream_name}.retry"))
+
+
+def test_redis_streams_claims_stale_pending_entries(e_loop: AbstractEventLoop) -> None:
+    mq_client = MQClientProxy(message_broker_type="redis_streams", message_broker_url=settings.REDIS_URL)
+    client: Any = mq_client._client
+    exchanger_name = f"test_{generate_str(8)}"
+    stream_name = client.get_stream_name(exchanger_name, "queue")
+    group_id = f"GROUP_#_{exchanger_name}"
+
+    e_loop.run_until_complete(
+        mq_client.produce_messages(
+            exchanger_name=exchanger_name, queue_name="queue", messages=[{"event": "e", "data": {"i": 1}}]
+        )
+    )
+    # A consumer that died after reading
+    e_loop.run_until_complete(client.client.xgroup_create(stream_name, group_id, id="0"))
+    e_loop.run_until_complete(client.client.xreadgroup(group_id, "gone", {stream_name: ">"}, count=10))
+
+    handled: List[dict] = []
+    with (
+        patch.object(settings, "REDIS_STREAMS_CLAIM_IDLE_MS", 0),
+        patch.object(settings, "REDIS_STREAMS_BLOCK_MS", 10),
+    ):
+        e_loop.run_until_complete(consume_until(mq_client, exchanger_name, handled, count=1))
+        pending = e_loop.run_until_complete(client.client.xpending(stream_name, group_id))
+
+    assert [i["data"]["i"] for i in handled] == [1]
+    assert pending["pending"] == 0
+    e_loop.run_until_complete(client.client.delete(stream_name))
+
+
+def test_redis_streams_backlog(e_loop: AbstractEventLoop) -> None:
+    mq_client = MQClientProxy(message_broker_type="redis_streams", message_broker_url=settings.REDIS_URL)
+    client: Any = mq_client._client
+    exchanger_name = f"test_{generate_str(8)}"
+    stream_name = client.get_stream_name(exchanger_name, "queue")
+    group_id = client.get_group_id(exchanger_name)
+    messages = [{"event": "e", "data": {"i": i}} for i in range(3)]
+
+    async def read_one() -> None:
+        await client.client.xgroup_create(stream_name, group_id, id="0", mkstream=True)
+        await mq_client.produce_messages(exchanger_name=exchanger_name, queue_name="queue", messages=messages)
+        await client.client.xreadgroup(group_id, "test", {stream_name: ">"}, count=1)
+
+    e_loop.run_until_complete(read_one())
+    backlog = e_loop.run_until_complete(mq_client.get_backlog(exchanger_name=exchanger_name, queues=["queue"]))
+
+    assert backlog == {"queue": 3}  # two not delivered, one delivered and not acked
+    e_loop.run_until_complete(client.client.delete(stream_name))
@@ -0,0 +1,109 @@
+import json
+from asyncio import AbstractEventLoop
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, List, Optional
+
+from src.app.infrastructure.messaging.clients.rabbitmq_client import RabbitQueueClientClient
+from src.app.infrastructure.messaging.retries import (
+    RetryPolicy,
+    get_replay_body,
+    get_retry_delays_ms,
+    route_failed,
+)
+
+
+def test_retry_policy_backoff_and_routing() -> None:
+    policy = RetryPolicy(max_attempts=4, initial_delay_ms=100, multiplier=3, max_delay_ms=500)
+    handlers_by_event = {"fast": {"handler": None, "retry_policy": policy}}
+
+    assert [policy.get_delay_ms(i) for i in range(1, 5)] == [100, 300, 500, 500]
+    assert set(policy.get_delays_ms()) <= set(get_retry_delays_ms(handlers_by_event))
+
+    messages = [{"event": "fast", "data": {}, "attempt": 2}, {"event": "fast", "data": {}, "attempt": 3}]
+    failed = route_failed(messages, ValueError("boom"), handlers_by_event)
+
+    assert failed.delayed == {500: [{"event": "fast", "data": {}, "attempt": 3, "last_error": "ValueError: boom"}]}
+    assert failed.dead == [{"event": "fast", "data": {}, "attempt": 4, "last_error": "ValueError: boom"}]
+    assert json.loads(get_replay_body(failed.dead[0])) == {"event": "fast", "data": {}}
+    assert get_replay_body({"raw": "not json", "last_error": "ValueError"}) == b"not json"
+
+
+class FakeExchange:
+    def __init__(self) -> None:
+        self.published: list = []
+
+    async def publish(self, message: Any, routing_key: str) -> None:
+        self.published.append((routing_key, json.loads(message.body)))
+
+
+class FakeIncomingMessage:
+    def __init__(self, body: dict, queue: "FakeQueue") -> None:
+        self.body = json.dumps(body).encode()
+        self.queue = queue
+
+    async def ack(self) -> None:
+        self.queue.acked += 1
+
+
+class FakeQueue:
+    def __init__(self, name: str, arguments: Optional[dict]) -> None:
+        self.name = name
+        self.arguments = arguments
+        self.messages: List[FakeIncomingMessage] = []
+        self.acked = 0
+
+    async def get(self, no_ack: bool, fail: bool) -> Optional[FakeIncomingMessage]:
+        return self.messages.pop(0) if self.messages else None
+
+
+class FakeChannel:
+    def __init__(self) -> None:
+        self.default_exchange = FakeExchange()
+        self.exchange = FakeExchange()
+        self.queues: dict = {}
+
+    async def declare_exchange(self, name: str, exchange_type: Any) -> FakeExchange:
+        return self.exchange
+
+    async def declare_queue(self, name: str, durable: bool, auto_delete: bool, arguments: Any) -> FakeQueue:
+        return self.queues.setdefault(name, FakeQueue(name, arguments))
+
+
+class FakeChannelPool:
+    def __init__(self, channel: FakeChannel) -> None:
+        self.channel = channel
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncGenerator:
+        yield self.channel
+
+
+def test_rabbit_mq_failed_messages_are_delayed_dead_lettered_and_replayed(e_loop: AbstractEventLoop) -> None:
+    client = RabbitQueueClientClient("amqp://dev:dev@x_test_rabbit_service:5672")
+    channel = FakeChannel()
+    client._RabbitQueueClientClient__channel_pool = FakeChannelPool(channel)  # type: ignore
+    policy = RetryPolicy(max_attempts=2, initial_delay_ms=1000, multiplier=2, max_delay_ms=1000)
+    handlers_by_event = {"e": {"retry_policy": policy}}
+    messages: List[dict] = [{"event": "e", "data": {"i": 1}}, {"event": "e", "data": {"i": 2}, "attempt": 1}]
+    failed = route_failed(messages, ValueError("boom"), handlers_by_event)
+
+    publish_failed = getattr(client, "_RabbitQueueClientClient__publish_failed")
+    e_loop.run_until_complete(publish_failed("exchange", "queue", failed))
+
+    retry_queue = channel.queues["queue.retry.1000"]
+    assert retry_queue.arguments == {
+        "x-message-ttl": 1000,
+        "x-dead-letter-exchange": "exchange",
+        "x-dead-letter-routing-key": "queue",
+    }
+    assert [i[0] for i in channel.default_exchange.published] == ["queue.retry.1000", "queue.dlq"]
+
+    dead_letter_queue = channel.queues["queue.dlq"]
+    dead_letter_queue.messages = [
+        FakeIncomingMessage(body, dead_letter_queue) for _, body in channel.default_exchange.published[1:]
+    ]
+    replayed = e_loop.run_until_complete(client.replay_dead_letters("exchange", "queue", limit=10))
+
+    assert replayed == 1
+    assert dead_letter_queue.acked == 1
+    assert channel.exchange.published == [("queue", {"event": "e", "data": {"i": 2}})]
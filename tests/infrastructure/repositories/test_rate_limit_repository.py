@@ -0,0 +1,41 @@
+import uuid
+from asyncio import AbstractEventLoop
+
+from src.app.domain.common.utils.common import generate_str
+from src.app.infrastructure.repositories.container import container as repo_container
+
+
+def test_rate_limit_token_bucket(e_loop: AbstractEventLoop) -> None:
+    repository = repo_container.rate_limit_repository
+    identity = generate_str(10)
+    capacity = 3
+
+    results = [
+        e_loop.run_until_complete(
+            repository.hit_token_bucket(scope="test", identity=identity, capacity=capacity, refill_per_second=0.1)
+        )
+        for _ in range(capacity + 1)
+    ]
+
+    assert [i.is_allowed for i in results] == [True] * capacity + [False]
+    assert results[capacity - 1].remaining == 0
+    assert results[-1].retry_after_ms > 0
+
+
+def test_rate_limit_sliding_window(e_loop: AbstractEventLoop) -> None:
+    repository = repo_container.rate_limit_repository
+    identity = generate_str(10)
+    limit = 2
+
+    e_loop.run_until_complete(repository.load_scripts())
+    results = [
+        e_loop.run_until_complete(
+            repository.hit_sliding_window(
+                scope="test", identity=identity, limit=limit, window_seconds=60, request_id=uuid.uuid4().hex
+            )
+        )
+        for _ in range(limit + 1)
+    ]
+
+    assert [i.is_allowed for i in results] == [True] * limit + [False]
+    assert 0 < results[-1].retry_after_ms <= 60 * 1000
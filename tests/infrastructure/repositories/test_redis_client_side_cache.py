@@ -0,0 +1,86 @@
+import asyncio
+import json
+from asyncio import AbstractEventLoop
+from typing import Callable, Generator
+
+import pytest
+from unittest.mock import patch
+
+from src.app.config.settings import settings
+from src.app.domain.common.utils.common import generate_str
+from src.app.infrastructure.repositories.base.base_redis_repository import BaseRedisRepository
+
+TRACKED_PREFIX = "test:tracked:"
+
+
+class TrackedRedisRepository(BaseRedisRepository):
+    CLIENT_SIDE_CACHE_PREFIXES = (TRACKED_PREFIX,)
+
+
+@pytest.fixture
+def client_side_cache_enabled() -> Generator:
+    with patch.object(settings, "REDIS_CLIENT_CACHE_ENABLED", True):
+        yield
+
+
+async def _wait_for(predicate: Callable[[], bool], timeout: float = 3.0) -> bool:
+    waited = 0.0
+    while not predicate() and waited < timeout:
+        await asyncio.sleep(0.05)
+        waited += 0.05
+    return predicate()
+
+
+def test_client_side_cache_disabled_by_default(e_loop: AbstractEventLoop) -> None:
+    assert BaseRedisRepository.get_client_side_cache() is None
+
+
+def test_client_side_cache_hits_and_invalidation(
+    e_loop: AbstractEventLoop, client_side_cache_enabled: None
+) -> None:
+    key = TRACKED_PREFIX + generate_str(8)
+
+    async def run() -> None:
+        local_cache = TrackedRedisRepository.get_client_side_cache()
+        assert local_cache is not None
+        assert await _wait_for(lambda: local_cache.is_ready) is True
+
+        invalidations_before = local_cache.invalidations
+        await TrackedRedisRepository.set(key=key, value={"v": 1}, expire_in_seconds=60)
+        # Own writes are broadcast too, wait for it so the next read is not discarded
+        assert await _wait_for(lambda: local_cache.invalidations > invalidations_before) is True
+        hits_before = local_cache.stats()["hits"]
+
+        assert await TrackedRedisRepository.get(key) == {"v": 1}
+        assert await TrackedRedisRepository.get(key) == {"v": 1}
+        assert local_cache.stats()["hits"] == hits_before + 1
+
+        # Write bypassing the repository, the server must invalidate the local copy
+        await TrackedRedisRepository.get_client().set(key, json.dumps({"v": 2}))
+        assert await _wait_for(lambda: key not in local_cache._cache) is True
+        assert await TrackedRedisRepository.get(key) == {"v": 2}
+
+        await TrackedRedisRepository.delete([key])
+        await local_cache.close()
+
+    e_loop.run_until_complete(run())
+
+
+def test_client_side_cache_skips_untracked_keys(
+    e_loop: AbstractEventLoop, client_side_cache_enabled: None
+) -> None:
+    key = "test:untracked:" + generate_str(8)
+
+    async def run() -> None:
+        local_cache = TrackedRedisRepository.get_client_side_cache()
+        assert local_cache is not None
+        assert await _wait_for(lambda: local_cache.is_ready) is True
+
+        await TrackedRedisRepository.set(key=key, value={"v": 1}, expire_in_seconds=60)
+        assert await TrackedRedisRepository.get(key) == {"v": 1}
+        assert key not in local_cache._cache
+
+        await TrackedRedisRepository.delete([key])
+        await local_cache.close()
+
+    e_loop.run_until_complete(run())
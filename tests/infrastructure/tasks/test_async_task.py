@@ -0,0 +1,55 @@
+import asyncio
+from asyncio import AbstractEventLoop
+from types import SimpleNamespace
+from typing import List
+from unittest.mock import patch
+
+from src.app.infrastructure.tasks.async_task import AsyncTask, close_pools, close_worker_loop, get_worker_loop
+from src.app.interfaces.cli.celery_app import celery_app
+
+MODULE = "src.app.infrastructure.tasks.async_task"
+
+
+@celery_app.task(base=AsyncTask)
+async def get_loop_id(value: int) -> tuple:
+    await asyncio.sleep(0)
+    return id(asyncio.get_running_loop()), value
+
+
+def test_async_task_runs_in_worker_loop(e_loop: AbstractEventLoop) -> None:
+    try:
+        first = get_loop_id(1)
+        second = get_loop_id.apply(kwargs={"value": 2}).get()
+        worker_loop = get_worker_loop()
+    finally:
+        # pools of the session stay open for the other tests
+        close_worker_loop()
+        asyncio.set_event_loop(e_loop)
+
+    assert first == (id(worker_loop), 1)
+    assert second == (id(worker_loop), 2)
+    assert worker_loop.is_closed()
+
+
+def test_close_pools_closes_every_pool(e_loop: AbstractEventLoop) -> None:
+    closed: List[str] = []
+
+    def get_closer(name: str, is_failing: bool = False) -> object:
+        async def close() -> None:
+            if is_failing:
+                raise ConnectionError("Already closed")
+            closed.append(name)
+
+        return close
+
+    with (
+        patch(f"{MODULE}.mq_client", SimpleNamespace(close=get_closer("mq", is_failing=True))),
+        patch(
+            f"{MODULE}.redis_client",
+            SimpleNamespace(connection_pool=SimpleNamespace(disconnect=get_closer("redis"))),
+        ),
+        patch(f"{MODULE}.default_engine", SimpleNamespace(dispose=get_closer("psql"))),
+    ):
+        e_loop.run_until_complete(close_pools())
+
+    assert closed == ["redis", "psql"]
@@ -0,0 +1,72 @@
+import asyncio
+from asyncio import AbstractEventLoop
+from typing import Any, List
+
+import pytest
+
+from src.app.domain.common.utils.common import generate_str
+from src.app.interfaces.cli.consume import (
+    UNKNOWN_EVENT,
+    event_latency_histogram,
+    messages_counter,
+    queue_processing_aggregator,
+)
+
+
+def test_queue_processing_aggregator_runs_async_handlers_within_limit(e_loop: AbstractEventLoop) -> None:
+    event = generate_str(10)
+    running: List[int] = [0, 0]  # now, max
+    handled: List[Any] = []
+
+    async def handler(value: int) -> None:
+        running[0] += 1
+        running[1] = max(running)
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        handled.append(value)
+
+    handlers_by_event = {event: {"handler": handler, "max_concurrency": 2}}
+    messages = [{"event": event, "data": {"value": i}} for i in range(6)]
+    e_loop.run_until_complete(
+        asyncio.gather(*[queue_processing_aggregator(data, handlers_by_event) for data in messages])
+    )
+
+    assert sorted(handled) == list(range(6))
+    assert running[1] == 2
+
+
+def test_queue_processing_aggregator_fails_timed_out_handlers(e_loop: AbstractEventLoop) -> None:
+    event = generate_str(10)
+
+    async def handler() -> None:
+        await asyncio.sleep(1)
+
+    handlers_by_event = {event: {"handler": handler, "timeout_seconds": 0.01}}
+    with pytest.raises(TimeoutError):
+        e_loop.run_until_complete(queue_processing_aggregator({"event": event, "data": {}}, handlers_by_event))
+
+
+def test_queue_processing_aggregator_counts_messages_by_event(e_loop: AbstractEventLoop) -> None:
+    event = generate_str(10)
+
+    async def handler(is_failing: bool) -> None:
+        if is_failing:
+            raise ValueError("Handler failed")
+
+    handlers_by_event = {event: {"handler": handler}}
+    unknown_before = messages_counter.get(event=UNKNOWN_EVENT, status="handled")
+    e_loop.run_until_complete(
+        queue_processing_aggregator({"event": event, "data": {"is_failing": False}}, handlers_by_event)
+    )
+    with pytest.raises(ValueError):
+        e_loop.run_until_complete(
+            queue_processing_aggregator({"event": event, "data": {"is_failing": True}}, handlers_by_event)
+        )
+    e_loop.run_until_complete(
+        queue_processing_aggregator({"event": generate_str(10), "data": {}}, handlers_by_event)
+    )
+
+    assert messages_counter.get(event=event, status="handled") == 1
+    assert messages_counter.get(event=event, status="failed") == 1
+    assert messages_counter.get(event=UNKNOWN_EVENT, status="handled") == unknown_before + 1
+    assert event_latency_histogram.get(event=event)[2] == 2
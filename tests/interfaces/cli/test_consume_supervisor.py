@@ -0,0 +1,59 @@
+import asyncio
+import os
+import signal
+from asyncio import AbstractEventLoop
+from typing import Any, List
+from unittest.mock import patch
+
+from src.app.interfaces.cli.consume import count_handled, run_until_signal
+from src.app.interfaces.cli.consume_supervisor import assign_queues, parse_queues, run_worker, spawn_context
+
+
+def test_assign_queues_to_workers() -> None:
+    assert assign_queues([0, 1, 2, 3, 4], workers=2, is_exclusive=True) == [[0, 2, 4], [1, 3]]
+    assert assign_queues([0, 1], workers=4, is_exclusive=True) == [[0], [1]]
+    assert assign_queues(["a", "b"], workers=3, is_exclusive=False) == [["a", "b"]] * 3
+    assert parse_queues("0, 1,queue") == [0, 1, "queue"]
+
+
+def test_count_handled_reports_messages(e_loop: AbstractEventLoop) -> None:
+    counts: List[int] = []
+
+    async def batch_aggregator(messages: List[dict], handlers_by_event: dict) -> None:
+        return None
+
+    aggregator = count_handled(batch_aggregator, counts.append, is_batch=True)
+    e_loop.run_until_complete(aggregator([{}, {}, {}], {}))
+
+    assert counts == [3]
+
+
+def test_run_worker_reports_handled_at_once() -> None:
+    handled: Any = spawn_context.Value("Q", 0)
+
+    def run_consumer(on_handled: Any, **kwargs: Any) -> None:
+        on_handled(3)
+        on_handled(1)
+        assert handled.value == 4  # no later message is needed to flush the counts
+
+    with patch("src.app.interfaces.cli.consume.run_consumer", run_consumer):
+        run_worker(queues=["queue"], exchanger_name="exchanger", handled=handled, metrics_port=0)
+    assert handled.value == 4
+
+
+def test_run_until_signal_drains_despite_repeated_signals(e_loop: AbstractEventLoop) -> None:
+    drained: List[bool] = []
+
+    async def consume() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.2)  # in-flight messages
+            drained.append(True)
+            raise
+
+    e_loop.call_later(0.05, os.kill, os.getpid(), signal.SIGINT)
+    e_loop.call_later(0.1, os.kill, os.getpid(), signal.SIGTERM)
+    run_until_signal(e_loop, consume())
+
+    assert drained == [True]